@@ -0,0 +1,250 @@
+import asyncio
+import socket
+import threading
+from loguru import logger
+from backend.communication.communication_interface import CommunicationInterface
+
+
+class _EventLoopThread:
+    """所有异步网口共享的事件循环线程
+
+    不论打开多少个 AsyncNetworkPort，都只在一个后台线程中运行一个事件循环。
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name='AsyncNetworkLoop', daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def get(cls):
+        """获取共享事件循环线程（首次调用时创建）"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def run(self, coro, timeout=None):
+        """在共享事件循环中执行协程并等待结果（不可在事件循环线程中调用）"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+
+class _BoardProtocol(asyncio.BufferedProtocol):
+    """直接将套接字数据接收到 AsyncNetworkPort 的复用缓冲区中（recv_into）"""
+
+    def __init__(self, port):
+        self._port = port
+
+    def get_buffer(self, sizehint):
+        return self._port._recv_view
+
+    def buffer_updated(self, nbytes):
+        self._port._on_data(nbytes)
+
+    def connection_lost(self, exc):
+        self._port._on_connection_lost(exc)
+
+
+class AsyncNetworkPort(CommunicationInterface):
+    """基于asyncio的网口通信实现
+
+    同时提供与 NetworkPort 相同的同步接口（open/send/receive）和异步接口
+    （open_async/send_async/receive_async）。所有实例共享一个事件循环线程，
+    接收数据通过 BufferedProtocol 直接写入预分配缓冲区，避免每次接收分配新对象。
+    """
+
+    def __init__(self, host, port, timeout=1, tcp_nodelay=True, rcvbuf=None, recv_buffer_size=65536):
+        """初始化
+
+        Args:
+            host: 板卡IP地址
+            port: 板卡端口
+            timeout: 连接和默认接收超时时间(秒)
+            tcp_nodelay: 是否关闭Nagle算法，小帧指令低延迟发送
+            rcvbuf: 套接字接收缓冲区大小(SO_RCVBUF，字节)，None表示系统默认
+            recv_buffer_size: 复用接收缓冲区大小(字节)，也是单次 receive 返回的最大字节数
+        """
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.tcp_nodelay = tcp_nodelay
+        self.rcvbuf = rcvbuf
+
+        self._loop_thread = None
+        self._transport = None
+        self._recv_buf = bytearray(recv_buffer_size)
+        self._recv_view = memoryview(self._recv_buf)
+        # 已接收未取走的数据；同步接口用条件变量等待，异步接口等待 Future
+        self._rx = bytearray()
+        self._rx_cond = threading.Condition()
+        self._rx_waiter = None
+        self._closed = True
+
+    @property
+    def loop(self):
+        """共享事件循环"""
+        return self._loop_thread.loop if self._loop_thread else None
+
+    def run_coroutine(self, coro, timeout=None):
+        """在共享事件循环中执行协程并等待结果，供同步代码调用异步接口
+
+        Args:
+            coro: 协程对象
+            timeout: 超时时间(秒)
+
+        Returns:
+            协程的返回值
+        """
+        if self._loop_thread is None:
+            self._loop_thread = _EventLoopThread.get()
+        return self._loop_thread.run(coro, timeout)
+
+    # ========== 同步接口 ==========
+    def open(self):
+        """打开网口连接"""
+        self._loop_thread = _EventLoopThread.get()
+        try:
+            self._loop_thread.run(self.open_async(), timeout=self.timeout + 1)
+        except Exception as e:
+            logger.error(f'Failed to connect to {self.host}:{self.port}: {e}')
+            raise
+
+    def close(self):
+        """关闭网口连接"""
+        if self._transport:
+            self._loop_thread.run(self.close_async(), timeout=self.timeout + 1)
+
+    def send(self, data: bytes):
+        """发送数据"""
+        if self._closed:
+            logger.error('Network connection not established')
+            raise ConnectionError('Network connection not established')
+
+        # transport.write 不会阻塞，交给事件循环线程执行即可
+        self.loop.call_soon_threadsafe(self._transport.write, bytes(data))
+        logger.debug(f'Sent {len(data)} bytes over network: {data.hex()}')
+
+    def receive(self, timeout=None):
+        """接收数据
+
+        Args:
+            timeout: 超时时间(秒)，None 使用默认超时
+
+        Returns:
+            bytes: 已接收的全部数据，超时返回空数据
+        """
+        if timeout is None:
+            timeout = self.timeout
+
+        with self._rx_cond:
+            if not self._rx_cond.wait_for(lambda: self._rx or self._closed, timeout):
+                return b''
+            if not self._rx and self._closed:
+                logger.error('Network connection not established')
+                raise ConnectionError('Network connection not established')
+            data = bytes(self._rx)
+            self._rx.clear()
+
+        logger.debug(f'Received {len(data)} bytes over network: {data.hex()}')
+        return data
+
+    def is_open(self):
+        """检查连接是否打开"""
+        return not self._closed
+
+    # ========== 异步接口 ==========
+    async def open_async(self):
+        """在事件循环中打开网口连接"""
+        loop = asyncio.get_running_loop()
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        if self.rcvbuf:
+            # 需在连接前设置，才能参与TCP窗口协商
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.rcvbuf)
+        if self.tcp_nodelay:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        try:
+            await asyncio.wait_for(loop.sock_connect(sock, (self.host, self.port)), self.timeout)
+            self._transport, _ = await loop.create_connection(lambda: _BoardProtocol(self), sock=sock)
+        except Exception:
+            sock.close()
+            raise
+
+        with self._rx_cond:
+            self._rx.clear()
+            self._closed = False
+        logger.info(f'Connected to network {self.host}:{self.port} (asyncio)')
+
+    async def close_async(self):
+        """在事件循环中关闭网口连接"""
+        if self._transport:
+            self._transport.close()
+            self._transport = None
+            self._on_connection_lost(None)
+            logger.info(f'Network connection to {self.host}:{self.port} closed')
+
+    async def send_async(self, data: bytes):
+        """在事件循环中发送数据"""
+        if self._closed:
+            raise ConnectionError('Network connection not established')
+        self._transport.write(data)
+
+    async def receive_async(self, timeout=None):
+        """在事件循环中接收数据
+
+        Args:
+            timeout: 超时时间(秒)，None 使用默认超时
+
+        Returns:
+            bytes: 已接收的全部数据，超时返回空数据
+        """
+        if timeout is None:
+            timeout = self.timeout
+
+        if not self._rx and not self._closed:
+            # 直接等待一个 Future 并用 call_later 超时，比 wait_for 少一次任务调度
+            loop = asyncio.get_running_loop()
+            self._rx_waiter = loop.create_future()
+            timer = loop.call_later(timeout, self._wake_rx_waiter)
+            try:
+                await self._rx_waiter
+            finally:
+                timer.cancel()
+                self._rx_waiter = None
+            if not self._rx and not self._closed:
+                return b''
+
+        with self._rx_cond:
+            if not self._rx and self._closed:
+                raise ConnectionError('Network connection not established')
+            data = bytes(self._rx)
+            self._rx.clear()
+        return data
+
+    # ========== 协议回调（事件循环线程） ==========
+    def _on_data(self, nbytes):
+        with self._rx_cond:
+            self._rx += self._recv_view[:nbytes]
+            self._rx_cond.notify_all()
+        self._wake_rx_waiter()
+
+    def _on_connection_lost(self, exc):
+        if exc:
+            logger.error(f'Network connection to {self.host}:{self.port} lost: {exc}')
+        with self._rx_cond:
+            self._closed = True
+            self._rx_cond.notify_all()
+        self._wake_rx_waiter()
+
+    def _wake_rx_waiter(self):
+        if self._rx_waiter is not None and not self._rx_waiter.done():
+            self._rx_waiter.set_result(None)
@@ -0,0 +1,324 @@
+import numpy as np
+
+
+class Field:
+    """指令帧中的一个整数字段"""
+
+    __slots__ = ('name', 'offset', 'width', 'byteorder', 'signed', 'scale')
+
+    def __init__(self, name, offset, width=1, byteorder='big', signed=False, scale=1):
+        """初始化
+
+        Args:
+            name: 字段名
+            offset: 字段在帧中的字节偏移
+            width: 字节数
+            byteorder: 字节序，big 或 little
+            signed: 是否为有符号数（二进制补码）
+            scale: 写入的原始值 = round(数值 * scale)，用于以工程单位给出数值
+        """
+        if byteorder not in ('big', 'little'):
+            raise ValueError(f'{name}: byteorder must be big or little')
+        if not 1 <= width <= 8:
+            raise ValueError(f'{name}: width must be 1 to 8 bytes')
+        self.name = name
+        self.offset = offset
+        self.width = width
+        self.byteorder = byteorder
+        self.signed = signed
+        self.scale = scale
+
+    @classmethod
+    def from_config(cls, name, config):
+        """由配置字典（offset、width、byteorder、signed、scale）创建"""
+        return cls(name, int(config['offset']), int(config.get('width', 1)), config.get('byteorder', 'big'),
+                   bool(config.get('signed', False)), config.get('scale', 1))
+
+    def raw(self, values):
+        """将一组数值转换为原始整数，超出字段范围时抛出 ValueError"""
+        values = np.asarray(values)
+        if self.scale != 1 or values.dtype.kind == 'f':
+            values = np.rint(values * self.scale)
+        raw = values.astype(np.int64)
+
+        bits = 8 * self.width
+        low, high = (-(1 << (bits - 1)), (1 << (bits - 1)) - 1) if self.signed else (0, (1 << bits) - 1)
+        if raw.size and (raw.min() < low or raw.max() > min(high, np.iinfo(np.int64).max)):
+            raise ValueError(f'{self.name}: value out of range [{low}, {high}]')
+        return raw
+
+    def write(self, frames, raw):
+        """将原始整数写入每一帧的字段位置
+
+        Args:
+            frames: 形状为 (帧数, 帧长) 的 uint8 数组
+            raw: 形状为 (帧数,) 的原始整数
+        """
+        raw = raw.astype(np.uint64)  # 负数按二进制补码写入
+        for k in range(self.width):
+            shift = 8 * (self.width - 1 - k if self.byteorder == 'big' else k)
+            frames[:, self.offset + k] = (raw >> np.uint64(shift)) & np.uint64(0xFF)
+
+
+class LengthField(Field):
+    """长度字段：值为 [start, end) 区间的字节数加 adjust，模板帧长固定，因此只在模板创建时计算一次"""
+
+    __slots__ = ('start', 'end', 'adjust')
+
+    def __init__(self, offset, width=2, byteorder='big', start=0, end=None, adjust=0):
+        super().__init__('length', offset, width, byteorder)
+        self.start = start
+        self.end = end
+        self.adjust = adjust
+
+    @classmethod
+    def from_config(cls, config):
+        """由配置字典（offset、width、byteorder、start、end、adjust）创建"""
+        return cls(int(config['offset']), int(config.get('width', 2)), config.get('byteorder', 'big'),
+                   int(config.get('start', 0)), config.get('end'), int(config.get('adjust', 0)))
+
+    def value(self, frame_length):
+        end = frame_length if self.end is None else self.end
+        return end - self.start + self.adjust
+
+
+class ChecksumField(Field):
+    """校验和字段：对 [start, end) 区间计算，帧内容变化后自动重新计算
+
+    end 默认为校验和字段的偏移，即计算区间到校验和字段之前为止；
+    区间包含校验和字段自身时，字段按 0 参与计算，结果与模板中的占位值无关
+
+    算法：xor8（逐字节异或）、sum8 / sum16（逐字节累加取低8/16位）、
+    crc16（CRC-16/CCITT-FALSE，多项式 0x1021，初值 0xFFFF）
+    """
+
+    __slots__ = ('algorithm', 'start', 'end')
+
+    ALGORITHMS = ('xor8', 'sum8', 'sum16', 'crc16')
+    _CRC16_TABLE = None
+
+    def __init__(self, offset, width=1, byteorder='big', algorithm='xor8', start=0, end=None):
+        if algorithm not in self.ALGORITHMS:
+            raise ValueError(f'Unsupported checksum algorithm: {algorithm}')
+        super().__init__('checksum', offset, width, byteorder)
+        self.algorithm = algorithm
+        self.start = start
+        self.end = offset if end is None else end
+
+    @classmethod
+    def from_config(cls, config):
+        """由配置字典（offset、width、byteorder、algorithm、start、end）创建"""
+        return cls(int(config['offset']), int(config.get('width', 1)), config.get('byteorder', 'big'),
+                   config.get('algorithm', 'xor8'), int(config.get('start', 0)), config.get('end'))
+
+    def compute(self, frames):
+        """按帧计算校验和，对整批帧向量化完成（crc16 按字节列迭代，每列对全部帧同时计算）
+
+        Args:
+            frames: 形状为 (帧数, 帧长) 的 uint8 数组
+
+        Returns:
+            numpy.ndarray: 每帧的校验和
+        """
+        region = frames[:, self.start:self.end]
+        if self.start < self.offset + self.width and self.offset < self.end:
+            region = region.copy()
+            low = max(self.offset, self.start) - self.start
+            high = min(self.offset + self.width, self.end) - self.start
+            region[:, low:high] = 0
+        if self.algorithm == 'xor8':
+            return np.bitwise_xor.reduce(region, axis=1).astype(np.int64)
+        if self.algorithm in ('sum8', 'sum16'):
+            mask = 0xFF if self.algorithm == 'sum8' else 0xFFFF
+            return region.sum(axis=1, dtype=np.int64) & mask
+
+        table = self._crc16_table()
+        crc = np.full(len(frames), 0xFFFF, dtype=np.int64)
+        for column in region.T:
+            crc = ((crc << 8) & 0xFFFF) ^ table[((crc >> 8) ^ column) & 0xFF]
+        return crc
+
+    @classmethod
+    def _crc16_table(cls):
+        if cls._CRC16_TABLE is None:
+            table = np.zeros(256, dtype=np.int64)
+            for i in range(256):
+                crc = i << 8
+                for _ in range(8):
+                    crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else crc << 1
+                table[i] = crc & 0xFFFF
+            cls._CRC16_TABLE = table
+        return cls._CRC16_TABLE
+
+
+class CommandTemplate:
+    """指令帧模板：在固定的模板帧上按字段名写入数值，长度和校验和字段自动重新计算
+
+    多帧一次生成时（build_batch）字段写入和校验和计算都对 (帧数, 帧长) 数组向量化完成。
+    """
+
+    def __init__(self, data, fields=(), length=None, checksum=None):
+        """初始化
+
+        Args:
+            data: 模板帧（bytes），字段位置的内容会被覆盖
+            fields: Field 列表
+            length: LengthField，None 表示没有长度字段
+            checksum: ChecksumField，None 表示没有校验和字段
+        """
+        self.base = np.frombuffer(bytes(data), dtype=np.uint8).copy()
+        self.fields = {field.name: field for field in fields}
+        self.checksum = checksum
+        for field in list(self.fields.values()) + [f for f in (length, checksum) if f is not None]:
+            if field.offset + field.width > len(self.base):
+                raise ValueError(f'{field.name}: field at {field.offset}+{field.width} exceeds frame length')
+
+        if length is not None:
+            frames = self.base[np.newaxis]
+            length.write(frames, length.raw([length.value(len(self.base))]))
+        self.length = length
+
+    @classmethod
+    def from_config(cls, config):
+        """由配置字典创建
+
+        Args:
+            config: 包含 hex_data(模板帧)，可选 fields(字段名 -> 字段配置)、length、checksum
+        """
+        data = bytes.fromhex(config['hex_data'].replace(' ', ''))
+        fields = [Field.from_config(name, spec) for name, spec in (config.get('fields') or {}).items()]
+        length = LengthField.from_config(config['length']) if config.get('length') else None
+        checksum = ChecksumField.from_config(config['checksum']) if config.get('checksum') else None
+        return cls(data, fields, length, checksum)
+
+    @property
+    def frame_length(self):
+        return len(self.base)
+
+    def build(self, **values):
+        """生成一帧
+
+        Args:
+            values: 字段名 -> 数值，未给出的字段保持模板帧中的内容
+
+        Returns:
+            bytes: 指令帧
+        """
+        return self.build_batch(**{name: [value] for name, value in values.items()})[0].tobytes()
+
+    def build_batch(self, **values):
+        """一次生成多帧
+
+        Args:
+            values: 字段名 -> 每帧数值的数组，各数组长度相同
+
+        Returns:
+            numpy.ndarray: 形状为 (帧数, 帧长) 的 uint8 数组，每行为一帧
+        """
+        unknown = set(values) - set(self.fields)
+        if unknown:
+            raise KeyError(f'Unknown fields: {", ".join(sorted(unknown))}')
+        counts = {len(np.atleast_1d(v)) for v in values.values()}
+        if len(counts) > 1:
+            raise ValueError('All field value arrays must have the same length')
+        count = counts.pop() if counts else 1
+
+        frames = np.tile(self.base, (count, 1))
+        for name, value in values.items():
+            field = self.fields[name]
+            field.write(frames, field.raw(np.atleast_1d(value)))
+        if self.checksum is not None:
+            self.checksum.write(frames, self.checksum.compute(frames))
+        return frames
+
+    def sweep(self, description='{index}', chunk_size=256, **axes):
+        """生成参数扫描，见 CommandSweep"""
+        return CommandSweep(self, axes, description, chunk_size)
+
+
+class SweepAxis:
+    """扫描轴：等间隔数值 start, start+step, ...（不超过 stop，含 stop），或数值列表
+
+    等间隔轴不展开，按序号计算数值，内存占用与点数无关。
+    """
+
+    def __init__(self, start=None, stop=None, step=1, values=None):
+        if values is not None:
+            self._values = np.asarray(values)
+            self._count = len(self._values)
+        else:
+            if step == 0:
+                raise ValueError('Sweep step must not be zero')
+            self._values = None
+            self.start, self.step = start, step
+            self._count = max(0, int(np.floor((stop - start) / step + 1e-9)) + 1)
+
+    @classmethod
+    def from_config(cls, config):
+        """由配置创建：数值列表，或包含 start、stop、step 的字典"""
+        if isinstance(config, dict):
+            return cls(config['start'], config['stop'], config.get('step', 1))
+        return cls(values=config)
+
+    def __len__(self):
+        return self._count
+
+    def take(self, indices):
+        """按序号取数值"""
+        if self._values is not None:
+            return self._values[indices]
+        return self.start + indices * self.step
+
+
+class CommandSweep:
+    """参数扫描：对各扫描轴的笛卡尔积（最后一个轴变化最快）惰性生成指令
+
+    迭代时每次按 chunk_size 个点向量化生成一批帧，再逐条产出指令字典，
+    内存占用与扫描点数无关，指令发送器取走多少才生成多少。
+    """
+
+    def __init__(self, template, axes, description='{index}', chunk_size=256):
+        """初始化
+
+        Args:
+            template: CommandTemplate
+            axes: 字段名 -> SweepAxis（或 SweepAxis.from_config 接受的配置）
+            description: 指令描述的格式字符串，可引用 index 和各字段名，如 "电压 {voltage}"
+            chunk_size: 每批生成的帧数
+        """
+        self.template = template
+        self.axes = {name: axis if isinstance(axis, SweepAxis) else SweepAxis.from_config(axis)
+                     for name, axis in axes.items()}
+        self.description = description
+        self.chunk_size = max(1, int(chunk_size))
+        self._shape = tuple(len(axis) for axis in self.axes.values())
+
+    @classmethod
+    def from_config(cls, config):
+        """由配置字典创建：模板配置（见 CommandTemplate.from_config）加 description 和 sweep(字段名 -> 扫描轴)"""
+        return cls(CommandTemplate.from_config(config), config.get('sweep') or {},
+                   config.get('description', '{index}'), config.get('chunk_size', 256))
+
+    def __len__(self):
+        return int(np.prod(self._shape)) if self._shape else 1
+
+    def __iter__(self):
+        total = len(self)
+        names = list(self.axes)
+        for start in range(0, total, self.chunk_size):
+            flat = np.arange(start, min(start + self.chunk_size, total))
+            indices = np.unravel_index(flat, self._shape) if self._shape else ()
+            values = {name: self.axes[name].take(index) for name, index in zip(names, indices)}
+            frames = self.template.build_batch(**values) if values else self.template.build_batch()
+            columns = {name: value.tolist() for name, value in values.items()}
+
+            for row, frame in enumerate(frames):
+                data = frame.tobytes()
+                point = {name: column[row] for name, column in columns.items()}
+                yield {
+                    'description': self.description.format(index=start + row, **point),
+                    'data': data,
+                    'hex_str': data.hex().upper(),
+                    'status': 'pending',
+                    'sweep': point
+                }
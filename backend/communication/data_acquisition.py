@@ -1,7 +1,13 @@
-from PyQt5.QtCore import QObject, pyqtSignal, QThread, QTimer
+from PyQt5.QtCore import QObject, pyqtSignal, QThread, QTimer, QMetaObject, Qt
 from loguru import logger
+import threading
+import time
+import numpy as np
 from backend.communication.packet_parser import PacketParser
 from backend.communication.communication_interface import CommunicationInterface
+from backend.communication.link_arbiter import LinkArbiter
+from backend.communication.telemetry_scheduler import TelemetryScheduler
+from backend.communication.ring_buffer import RecordRing
 
 
 class DataAcquisition(QObject):
@@ -11,20 +17,72 @@ class DataAcquisition(QObject):
     temperature_updated = pyqtSignal(float)
     current_updated = pyqtSignal(float)
     power_updated = pyqtSignal(float)
+    telemetry_updated = pyqtSignal(dict)
+    channel_updated = pyqtSignal(str, object, float)  # 通道名, 数值, 时间戳
+    telemetry_batch = pyqtSignal(object)  # 从环形缓冲区成批取出的采样（TELEMETRY_RECORD 数组）
     error_occurred = pyqtSignal(str)
     
-    def __init__(self, communication_interface: CommunicationInterface):
+    # 批量采集的遥测量：(字段名, 命令ID)
+    TELEMETRY_CHANNELS = (
+        ('temperature', PacketParser.CMD_GET_TEMPERATURE),
+        ('current', PacketParser.CMD_GET_CURRENT),
+        ('power', PacketParser.CMD_GET_POWER),
+    )
+    
+    # 遥测环形缓冲区的记录格式：时间戳、通道序号（channels 中的位置）、数值
+    TELEMETRY_RECORD = np.dtype([('timestamp', 'f8'), ('channel', 'u2'), ('value', 'f8')])
+    
+    def __init__(self, communication_interface: CommunicationInterface, batched=False, response_timeout=2.0,
+                 channels=None, ring_capacity=0, ring_drain_interval=100):
+        """初始化
+        
+        Args:
+            communication_interface: 通信接口
+            batched: 自动采集是否使用批量模式（三条查询连续发出，并发等待响应）
+            response_timeout: 单次查询的响应超时时间(秒)
+            channels: 按通道独立频率轮询的 TelemetryChannel 列表，非空时自动采集使用
+                      TelemetryScheduler 代替固定间隔的定时器
+            ring_capacity: 按通道调度时遥测采样环形缓冲区的记录容量，0表示不使用
+            ring_drain_interval: 环形缓冲区的批量读取间隔(毫秒)
+        """
         super().__init__()
         self._communication = communication_interface
         self._parser = PacketParser()
         self._timer = None
         self._is_running = False
-        self._buffer = b''
+        self._batched = batched
+        self._response_timeout = response_timeout
+        # 链路仲裁器独占链路读操作，遥测轮询与测试指令共享同一链路
+        self._arbiter = LinkArbiter(communication_interface)
+        self._scheduler = None
+        self._telemetry_ring = None
+        self._channel_index = {}
+        self._channel_names = []
+        self._ring_out = None
+        self._ring_timer = None
+        self._ring_drain_interval = ring_drain_interval
+        # 采样回调可能在仲裁器读线程、调度线程或发送线程中执行，写入环形缓冲区时加锁保证只有一个生产者
+        self._ring_lock = threading.Lock()
+        if channels and ring_capacity:
+            # 高频遥测采样写入环形缓冲区，由采集线程的定时器成批取出后以一个信号发出，
+            # 热路径上没有逐条的信号和队列；读取使用预分配的输出数组
+            self._telemetry_ring = RecordRing(ring_capacity, self.TELEMETRY_RECORD)
+            self._channel_names = [channel.name for channel in channels]
+            self._channel_index = {name: i for i, name in enumerate(self._channel_names)}
+            self._ring_out = np.empty(ring_capacity, dtype=self.TELEMETRY_RECORD)
+        if channels:
+            self._scheduler = TelemetryScheduler(
+                self._arbiter, channels,
+                response_timeout=response_timeout,
+                on_sample=self._on_channel_sample,
+                on_error=self._on_channel_error
+            )
     
     def connect(self):
         """建立连接"""
         try:
             self._communication.open()
+            self._arbiter.start()
             logger.info('Data acquisition connected')
         except Exception as e:
             logger.error(f'Failed to connect: {e}')
@@ -36,6 +94,9 @@ class DataAcquisition(QObject):
         try:
             if self._timer:
                 self._timer.stop()
+            if self._scheduler:
+                self._scheduler.stop()
+            self._arbiter.stop()
             self._communication.close()
             self._is_running = False
             logger.info('Data acquisition disconnected')
@@ -48,13 +109,23 @@ class DataAcquisition(QObject):
         """开始自动采集
         
         Args:
-            interval: 采集间隔(毫秒)
+            interval: 采集间隔(毫秒)，按通道调度时不使用
         """
         if not self._communication.is_open():
             logger.error('Cannot start acquisition: communication not open')
             self.error_occurred.emit('通信未建立，无法开始采集')
             return
         
+        if self._scheduler:
+            if self._telemetry_ring is not None:
+                if self._ring_timer is None:
+                    self._ring_timer = QTimer()
+                    self._ring_timer.timeout.connect(self._drain_telemetry_ring)
+                self._ring_timer.start(self._ring_drain_interval)
+            self._scheduler.start()
+            self._is_running = True
+            return
+        
         if self._timer is None:
             self._timer = QTimer()
             self._timer.timeout.connect(self._acquire_all_data)
@@ -67,6 +138,11 @@ class DataAcquisition(QObject):
         """停止自动采集"""
         if self._timer:
             self._timer.stop()
+        if self._scheduler:
+            self._scheduler.stop()
+        if self._ring_timer:
+            self._stop_ring_timer()
+            self._drain_telemetry_ring()
         self._is_running = False
         logger.info('Stopped auto acquisition')
     
@@ -82,6 +158,74 @@ class DataAcquisition(QObject):
         """手动获取功率数据"""
         return self._get_data(PacketParser.CMD_GET_POWER)
     
+    def get_link_arbiter(self):
+        """获取链路仲裁器，其他模块通过它与板卡通信"""
+        return self._arbiter
+    
+    def get_scheduling_stats(self):
+        """获取按通道调度的统计信息（调度抖动、错过截止时间次数等），未使用通道调度时返回None"""
+        return self._scheduler.get_stats() if self._scheduler else None
+    
+    def get_telemetry_ring(self):
+        """获取遥测采样环形缓冲区（记录格式见 TELEMETRY_RECORD），未启用时返回None"""
+        return self._telemetry_ring
+    
+    def _on_channel_sample(self, name, value, timestamp):
+        """通道采样回调（在仲裁器读线程、调度线程或发送线程中执行）
+        
+        启用环形缓冲区时采样只写入缓冲区（持有 _ring_lock，是环形缓冲区唯一的生产者），
+        信号由 _drain_telemetry_ring 按批发出
+        """
+        if self._telemetry_ring is not None and isinstance(value, float):
+            with self._ring_lock:
+                self._telemetry_ring.write_record((timestamp, self._channel_index[name], value))
+            return
+        if name == 'temperature':
+            self.temperature_updated.emit(value)
+        elif name == 'current':
+            self.current_updated.emit(value)
+        elif name == 'power':
+            self.power_updated.emit(value)
+        self.channel_updated.emit(name, value, timestamp)
+    
+    def _stop_ring_timer(self):
+        """在定时器所属的采集线程中停止环形缓冲区读取定时器
+        
+        从其他线程停止时以阻塞的排队调用交给采集线程执行，返回时定时器回调已全部结束，
+        之后调用方进行的最后一次读取不会与定时器回调同时进行
+        """
+        thread = self._ring_timer.thread()
+        if thread is QThread.currentThread() or not thread.isRunning():
+            self._ring_timer.stop()
+        else:
+            QMetaObject.invokeMethod(self._ring_timer, 'stop', Qt.BlockingQueuedConnection)
+    
+    def _drain_telemetry_ring(self):
+        """成批取出环形缓冲区中的采样（采集线程的定时器回调，是环形缓冲区唯一的消费者）
+        
+        整批采样以一个 telemetry_batch 信号发出，各通道只以本批最新的采样发出一次数值信号
+        """
+        records = self._telemetry_ring.read(out=self._ring_out)
+        if not len(records):
+            return
+        self.telemetry_batch.emit(records.copy())
+        
+        channels = records['channel']
+        for index in np.unique(channels):
+            timestamp, _, value = records[np.flatnonzero(channels == index)[-1]].item()
+            name = self._channel_names[index]
+            if name == 'temperature':
+                self.temperature_updated.emit(value)
+            elif name == 'current':
+                self.current_updated.emit(value)
+            elif name == 'power':
+                self.power_updated.emit(value)
+            self.channel_updated.emit(name, value, timestamp)
+    
+    def _on_channel_error(self, name, error):
+        """通道采样失败回调"""
+        self.error_occurred.emit(f'获取数据失败: {name}: {error}')
+    
     def _get_data(self, command_id: int):
         """发送命令并获取数据
         
@@ -97,61 +241,92 @@ class DataAcquisition(QObject):
             return None
         
         try:
-            # 生成命令帧
-            packet = self._parser.create_command_packet(command_id)
-            
-            # 发送命令
-            self._communication.send(packet)
-            
-            # 接收响应
-            response = self._communication.receive(timeout=2.0)
-            
-            if not response:
-                logger.error('No response received')
-                self.error_occurred.emit('无响应数据')
-                return None
+            # 发送命令并等待响应
+            future = self._request(command_id)
             
-            # 解析响应
-            parsed_frame = self._parser.parse_received_data(response)
-            
-            if not parsed_frame or parsed_frame['command_id'] != command_id:
-                logger.error('Invalid response received')
-                self.error_occurred.emit('无效的响应数据')
+            try:
+                parsed_frame = future.result()
+            except TimeoutError:
+                logger.error('No valid response received')
+                self.error_occurred.emit('无有效响应数据')
                 return None
             
-            # 根据命令ID解析具体数据
-            if command_id == PacketParser.CMD_GET_TEMPERATURE:
-                return self._parser.parse_temperature_data(parsed_frame['data'])
-            elif command_id == PacketParser.CMD_GET_CURRENT:
-                return self._parser.parse_current_data(parsed_frame['data'])
-            elif command_id == PacketParser.CMD_GET_POWER:
-                return self._parser.parse_power_data(parsed_frame['data'])
-            else:
-                logger.error(f'Unsupported command: {command_id}')
-                self.error_occurred.emit(f'不支持的命令: {command_id}')
-                return None
+            return self._decode(command_id, parsed_frame)
                 
         except Exception as e:
             logger.error(f'Error getting data: {e}')
             self.error_occurred.emit(f'获取数据失败: {str(e)}')
             return None
     
+    def _request(self, command_id: int):
+        """发送查询命令，返回等待响应帧的Future"""
+        packet = self._parser.create_command_packet(command_id)
+        return self._arbiter.request(packet, LinkArbiter.telemetry_key(command_id), timeout=self._response_timeout)
+    
+    def _decode(self, command_id: int, parsed_frame):
+        """根据命令ID解析具体数据"""
+        if command_id not in PacketParser.TELEMETRY_DATA_LENGTHS:
+            logger.error(f'Unsupported command: {command_id}')
+            self.error_occurred.emit(f'不支持的命令: {command_id}')
+            return None
+        return self._parser.parse_telemetry_data(command_id, parsed_frame['data'])
+    
+    def acquire_batch(self):
+        """批量采集温度、电流和功率
+        
+        三条查询命令连续发出，不等待上一条的响应，响应由链路仲裁器并发收集，
+        一次采集的耗时约为一个往返时间，单个慢响应也不会推迟其他查询的发送。
+        
+        Returns:
+            dict: 遥测记录，包含timestamp及temperature、current、power字段，
+                  查询失败的字段为None；通信未建立时返回None
+        """
+        if not self._communication.is_open():
+            logger.error('Cannot get data: communication not open')
+            self.error_occurred.emit('通信未建立，无法获取数据')
+            return None
+        
+        timestamp = time.time()
+        futures = []
+        for name, command_id in self.TELEMETRY_CHANNELS:
+            futures.append((name, command_id, self._request(command_id)))
+        
+        record = {'timestamp': timestamp}
+        failed = []
+        for name, command_id, future in futures:
+            try:
+                record[name] = self._decode(command_id, future.result())
+            except Exception as e:
+                logger.error(f'Error getting {name}: {e}')
+                record[name] = None
+                failed.append(name)
+        
+        if failed:
+            self.error_occurred.emit(f'获取数据失败: {", ".join(failed)}')
+        
+        return record
+    
     def _acquire_all_data(self):
         """采集所有数据"""
-        # 获取温度
-        temperature = self.get_temperature()
+        if self._batched:
+            record = self.acquire_batch()
+            if record is None:
+                return
+            temperature, current, power = record['temperature'], record['current'], record['power']
+        else:
+            # 依次获取温度、电流、功率
+            temperature = self.get_temperature()
+            current = self.get_current()
+            power = self.get_power()
+            record = {'timestamp': time.time(), 'temperature': temperature, 'current': current, 'power': power}
+        
         if temperature is not None:
             self.temperature_updated.emit(temperature)
-        
-        # 获取电流
-        current = self.get_current()
         if current is not None:
             self.current_updated.emit(current)
-        
-        # 获取功率
-        power = self.get_power()
         if power is not None:
             self.power_updated.emit(power)
+        self.telemetry_updated.emit(record)
 
 
 class DataAcquisitionWorker(QThread):
@@ -160,21 +335,41 @@ class DataAcquisitionWorker(QThread):
     temperature_updated = pyqtSignal(float)
     current_updated = pyqtSignal(float)
     power_updated = pyqtSignal(float)
+    telemetry_updated = pyqtSignal(dict)
+    channel_updated = pyqtSignal(str, object, float)
+    telemetry_batch = pyqtSignal(object)
     error_occurred = pyqtSignal(str)
     
-    def __init__(self, communication_interface: CommunicationInterface):
+    def __init__(self, communication_interface: CommunicationInterface, batched=False, interval=1000, channels=None,
+                 ring_capacity=0, ring_drain_interval=100):
+        """初始化
+        
+        Args:
+            communication_interface: 通信接口
+            batched: 是否使用批量采集模式
+            interval: 自动采集间隔(毫秒)
+            channels: 按通道独立频率轮询的 TelemetryChannel 列表
+            ring_capacity: 遥测采样环形缓冲区的记录容量，0表示不使用
+            ring_drain_interval: 环形缓冲区的批量读取间隔(毫秒)
+        """
         super().__init__()
-        self._data_acquisition = DataAcquisition(communication_interface)
+        self._interval = interval
+        self._data_acquisition = DataAcquisition(communication_interface, batched=batched, channels=channels,
+                                                 ring_capacity=ring_capacity,
+                                                 ring_drain_interval=ring_drain_interval)
         self._data_acquisition.temperature_updated.connect(self.temperature_updated)
         self._data_acquisition.current_updated.connect(self.current_updated)
         self._data_acquisition.power_updated.connect(self.power_updated)
+        self._data_acquisition.telemetry_updated.connect(self.telemetry_updated)
+        self._data_acquisition.channel_updated.connect(self.channel_updated)
+        self._data_acquisition.telemetry_batch.connect(self.telemetry_batch)
         self._data_acquisition.error_occurred.connect(self.error_occurred)
     
     def run(self):
         """线程运行函数"""
         try:
             self._data_acquisition.connect()
-            self._data_acquisition.start_auto_acquisition()
+            self._data_acquisition.start_auto_acquisition(self._interval)
             self.exec_()  # 启动事件循环
         except Exception as e:
             logger.error(f'Data acquisition thread error: {e}')
@@ -201,3 +396,15 @@ class DataAcquisitionWorker(QThread):
     def get_power(self):
         """获取功率数据"""
         return self._data_acquisition.get_power()
+    
+    def get_link_arbiter(self):
+        """获取链路仲裁器"""
+        return self._data_acquisition.get_link_arbiter()
+    
+    def get_scheduling_stats(self):
+        """获取按通道调度的统计信息"""
+        return self._data_acquisition.get_scheduling_stats()
+    
+    def get_telemetry_ring(self):
+        """获取遥测采样环形缓冲区"""
+        return self._data_acquisition.get_telemetry_ring()
@@ -0,0 +1,265 @@
+from functools import reduce
+from operator import xor
+from loguru import logger
+
+
+class FrameReassembler:
+    """流式帧重组器：在预分配的环形缓冲区中增量拼接字节流，输出所有完整帧
+
+    支持两种帧格式：
+    - 遥测帧：[AA][命令ID][长度低][长度高][数据...][校验和][55]
+    - 指令响应帧：[AA 55 55 AA][88 88][长度(大端)][帧ID(4)][状态码(2)][命令码(2)]...，
+      长度字段为同步字之后的字节数（示例帧 00 10 对应总长 20 字节）
+
+    每个链路持有一个实例，接收到的任意长度数据块通过 feed() 送入，
+    跨块拆分的帧会保留在缓冲区中等待后续数据，已消费的字节不会被重复扫描。
+    """
+
+    FORMAT_TELEMETRY = 'telemetry'
+    FORMAT_RESPONSE = 'response'
+
+    START_BYTE = 0xAA
+    END_BYTE = 0x55
+    RESPONSE_SYNC = b'\xAA\x55\x55\xAA'
+
+    TELEMETRY_HEADER_LEN = 4   # 起始+命令+长度低+长度高
+    TELEMETRY_OVERHEAD = 6     # 头部4字节+校验和+结束字节
+    RESPONSE_HEADER_LEN = 8    # 同步字4字节+帧头2字节+长度2字节
+    RESPONSE_MIN_LEN = 12      # 至少包含帧ID
+    TELEMETRY_MAX_DATA_LEN = 64  # 未指定各命令数据长度时遥测帧允许的最大数据长度
+
+    def __init__(self, capacity=65536, max_frame_len=4096, telemetry_lengths=None):
+        """初始化
+
+        Args:
+            capacity: 环形缓冲区容量(字节)
+            max_frame_len: 允许的最大帧长度，超过视为错误帧头并重新同步
+            telemetry_lengths: 遥测命令ID -> 允许的数据长度集合，命令ID或数据长度不符的帧头立即丢弃并重新同步，
+                               None 表示不限命令ID，数据长度不超过 TELEMETRY_MAX_DATA_LEN
+        """
+        if max_frame_len > capacity:
+            raise ValueError('max_frame_len must not exceed capacity')
+
+        self._capacity = capacity
+        self._max_frame_len = max_frame_len
+        self._telemetry_lengths = (None if telemetry_lengths is None
+                                   else {command_id: frozenset(lengths) for command_id, lengths in telemetry_lengths.items()})
+        self._buf = bytearray(capacity)
+        self._head = 0     # 缓冲区中第一个未消费字节的位置
+        self._count = 0    # 缓冲区中未消费的字节数
+        self._need = 1     # 下一次解码至少需要的字节数，不足时跳过解码
+
+        # 统计信息
+        self.frames_decoded = 0
+        self.dropped_bytes = 0
+        self.checksum_errors = 0
+
+    def __len__(self):
+        return self._count
+
+    def reset(self):
+        """清空缓冲区（重新建立连接时调用）"""
+        self._head = 0
+        self._count = 0
+        self._need = 1
+
+    def feed(self, data: bytes):
+        """送入一段接收数据并返回其中所有完整帧
+
+        Args:
+            data: 接收到的字节数据，长度任意
+
+        Returns:
+            list: 完整帧列表，每个元素为字典，包含 format、raw 字段，
+                  遥测帧另含 command_id、data，响应帧另含 frame_id、command_code
+        """
+        frames = []
+        view = memoryview(data)
+
+        while view:
+            free = self._capacity - self._count
+            if free == 0:
+                # 缓冲区已满且无法解出完整帧，丢弃最旧的字节以保证继续接收
+                self._discard(1)
+                free = 1
+
+            n = min(free, len(view))
+            self._write(view[:n])
+            view = view[n:]
+
+            if self._count >= self._need:
+                self._decode(frames)
+
+        return frames
+
+    def _write(self, chunk):
+        """将数据写入环形缓冲区尾部"""
+        tail = (self._head + self._count) % self._capacity
+        first = min(len(chunk), self._capacity - tail)
+        self._buf[tail:tail + first] = chunk[:first]
+        if first < len(chunk):
+            self._buf[:len(chunk) - first] = chunk[first:]
+        self._count += len(chunk)
+
+    def _discard(self, n):
+        """丢弃缓冲区头部的 n 个字节"""
+        self._head = (self._head + n) % self._capacity
+        self._count -= n
+        self.dropped_bytes += n
+
+    def _consume(self, n):
+        """取出缓冲区头部的 n 个字节"""
+        start = self._head
+        end = start + n
+        if end <= self._capacity:
+            frame = bytes(self._buf[start:end])
+        else:
+            frame = bytes(self._buf[start:]) + bytes(self._buf[:end - self._capacity])
+        self._head = end % self._capacity
+        self._count -= n
+        return frame
+
+    def _peek(self, offset):
+        """读取缓冲区中偏移 offset 处的字节"""
+        return self._buf[(self._head + offset) % self._capacity]
+
+    def _peek_u16(self, offset, big_endian):
+        """读取缓冲区中偏移 offset 处的16位整数"""
+        lo, hi = self._peek(offset), self._peek(offset + 1)
+        return (lo << 8) | hi if big_endian else lo | (hi << 8)
+
+    def _find_start(self):
+        """查找下一个起始字节，返回相对头部的偏移，找不到返回-1"""
+        start = self._head
+        end = start + self._count
+        if end <= self._capacity:
+            idx = self._buf.find(self.START_BYTE, start, end)
+            return idx - start if idx != -1 else -1
+
+        idx = self._buf.find(self.START_BYTE, start, self._capacity)
+        if idx != -1:
+            return idx - start
+        idx = self._buf.find(self.START_BYTE, 0, end - self._capacity)
+        return idx + self._capacity - start if idx != -1 else -1
+
+    def _is_response_sync(self):
+        """判断缓冲区头部是否为指令响应帧同步字"""
+        return all(self._peek(i) == b for i, b in enumerate(self.RESPONSE_SYNC))
+
+    def _decode(self, frames):
+        """从缓冲区中解出所有完整帧"""
+        while self._count:
+            # 同步到起始字节
+            if self._peek(0) != self.START_BYTE:
+                idx = self._find_start()
+                self._discard(self._count if idx == -1 else idx)
+                continue
+
+            if self._count < 2:
+                self._need = 2
+                return
+
+            if self._peek(1) == self.END_BYTE:
+                frame = self._decode_response()
+            else:
+                frame = self._decode_telemetry()
+
+            if frame is None:
+                # 数据不足，等待后续数据
+                return
+            if frame is not False:
+                frames.append(frame)
+                self.frames_decoded += 1
+
+        self._need = 1
+
+    def _decode_response(self):
+        """解析指令响应帧
+
+        Returns:
+            dict: 完整帧；None 表示数据不足；False 表示帧头无效已丢弃
+        """
+        if self._count < self.RESPONSE_HEADER_LEN:
+            self._need = self.RESPONSE_HEADER_LEN
+            return None
+
+        if not self._is_response_sync():
+            self._discard(1)
+            return False
+
+        total = len(self.RESPONSE_SYNC) + self._peek_u16(6, big_endian=True)
+        if total < self.RESPONSE_MIN_LEN or total > self._max_frame_len:
+            logger.warning(f'Invalid response frame length: {total}, resyncing')
+            self._discard(1)
+            return False
+
+        if self._count < total:
+            self._need = total
+            return None
+
+        raw = self._consume(total)
+        self._need = 1
+        return {
+            'format': self.FORMAT_RESPONSE,
+            'frame_id': raw[8:12],
+            'command_code': raw[14:16] if total >= 16 else None,
+            'raw': raw
+        }
+
+    def _decode_telemetry(self):
+        """解析遥测帧
+
+        杂散的起始字节后跟一个很大的长度字段时，不能等到凑够该长度才发现帧头无效，
+        否则其后的有效帧要等到 max_frame_len 字节才能解出；命令ID和数据长度在帧头到达时即检查。
+
+        Returns:
+            dict: 完整帧；None 表示数据不足；False 表示帧头无效或校验失败已丢弃
+        """
+        lengths = None
+        if self._telemetry_lengths is not None:
+            lengths = self._telemetry_lengths.get(self._peek(1))
+            if lengths is None:
+                self._discard(1)
+                return False
+
+        if self._count < self.TELEMETRY_HEADER_LEN:
+            self._need = self.TELEMETRY_HEADER_LEN
+            return None
+
+        data_len = self._peek_u16(2, big_endian=False)
+        valid = data_len in lengths if lengths is not None else data_len <= self.TELEMETRY_MAX_DATA_LEN
+        if not valid:
+            logger.warning(f'Invalid telemetry frame length: {data_len}, resyncing')
+            self._discard(1)
+            return False
+
+        total = self.TELEMETRY_OVERHEAD + data_len
+        if total > self._max_frame_len:
+            logger.warning(f'Invalid telemetry frame length: {total}, resyncing')
+            self._discard(1)
+            return False
+
+        if self._count < total:
+            self._need = total
+            return None
+
+        if self._peek(total - 1) != self.END_BYTE:
+            self._discard(1)
+            return False
+
+        raw = self._consume(total)
+        self._need = 1
+
+        checksum = reduce(xor, raw[1:-2], 0)
+        if checksum != raw[-2]:
+            logger.error(f'Checksum mismatch. Calculated: {checksum:02X}, Received: {raw[-2]:02X}')
+            self.checksum_errors += 1
+            self.dropped_bytes += total
+            return False
+
+        return {
+            'format': self.FORMAT_TELEMETRY,
+            'command_id': raw[1],
+            'data': raw[4:-2],
+            'raw': raw
+        }
@@ -0,0 +1,222 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from loguru import logger
+from backend.communication.packet_parser import PacketParser
+from backend.communication.communication_interface import CommunicationInterface
+
+
+class LinkArbiter:
+    """链路仲裁器：独占一条通信链路的全部读操作，并将收到的帧分发给等待的请求方
+
+    所有请求方（遥测轮询、测试指令发送等）通过 request() 发送数据并获得一个 Future，
+    后台读线程持续接收数据、解析帧，按匹配键（遥测帧为命令ID，指令响应帧为帧ID+命令码）
+    将帧交给最早登记的等待者。同一链路上的多个请求方因此可以并发使用链路而互不抢占响应。
+    """
+
+    def __init__(self, communication_interface: CommunicationInterface, poll_timeout=0.05,
+                 on_unsolicited=None):
+        """初始化
+
+        Args:
+            communication_interface: 被仲裁的通信接口
+            poll_timeout: 读线程单次接收的超时时间(秒)，决定超时检查和停止的响应速度
+            on_unsolicited: 收到无人等待的帧时的回调函数，参数为帧字典
+        """
+        self._communication = communication_interface
+        self._poll_timeout = poll_timeout
+        self.on_unsolicited = on_unsolicited
+
+        self._parser = PacketParser()
+        self._send_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._waiters = {}  # 匹配键 -> deque[(截止时间, Future)]
+        self._running = False
+        self._started = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def telemetry_key(command_id: int):
+        """遥测帧的匹配键"""
+        return PacketParser.FRAME_TELEMETRY, command_id
+
+    @staticmethod
+    def response_key(frame: bytes):
+        """指令帧及其响应帧的匹配键"""
+        return (PacketParser.FRAME_RESPONSE,) + PacketParser.response_key(frame)
+
+    @staticmethod
+    def frame_key(frame: dict):
+        """由解析后的帧计算匹配键"""
+        if frame['format'] == PacketParser.FRAME_TELEMETRY:
+            return LinkArbiter.telemetry_key(frame['command_id'])
+        return PacketParser.FRAME_RESPONSE, frame['frame_id'], frame['command_code']
+
+    @property
+    def communication(self):
+        """被仲裁的通信接口"""
+        return self._communication
+
+    def start(self):
+        """启动读线程（通信接口需已打开）"""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+        self._parser.reset_stream()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._started.set()
+        logger.info('Link arbiter started')
+
+    def stop(self):
+        """停止读线程，并使所有未完成的请求失败"""
+        # 与 request() 的检查和登记在同一把锁下清除运行标志，停止后不会再有等待者登记而永远等不到结果
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+        self._started.clear()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+        self._fail_all(ConnectionError('Link arbiter stopped'))
+        logger.info('Link arbiter stopped')
+
+    def is_running(self):
+        """读线程是否在运行"""
+        return self._running
+
+    def wait_started(self, timeout=None):
+        """等待读线程启动（链路打开）
+
+        Args:
+            timeout: 超时时间(秒)
+
+        Returns:
+            bool: 是否已启动
+        """
+        return self._started.wait(timeout)
+
+    def request(self, data: bytes, key, timeout=None):
+        """发送数据并登记等待匹配的响应帧
+
+        等待者在发送之前登记，避免响应先于登记到达而被丢弃。
+
+        Args:
+            data: 要发送的字节数据
+            key: 期望响应的匹配键，见 telemetry_key / response_key
+            timeout: 响应超时时间(秒)，超时后 Future 以 TimeoutError 结束；None 表示不超时
+
+        Returns:
+            Future: 结果为解析后的响应帧字典
+        """
+        future = Future()
+        future.set_running_or_notify_cancel()
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        with self._lock:
+            running = self._running
+            if running:
+                self._waiters.setdefault(key, deque()).append((deadline, future))
+        if not running:
+            future.set_exception(ConnectionError('Link arbiter not running'))
+            return future
+
+        try:
+            with self._send_lock:
+                self._communication.send(data)
+        except Exception as e:
+            self._remove_waiter(key, future)
+            if not future.done():
+                future.set_exception(e)
+
+        return future
+
+    def send(self, data: bytes):
+        """发送数据，不等待响应"""
+        with self._send_lock:
+            self._communication.send(data)
+
+    def _run(self):
+        """读线程主循环"""
+        while self._running:
+            try:
+                chunk = self._communication.receive(timeout=self._poll_timeout)
+                if chunk:
+                    for frame in self._parser.feed(chunk):
+                        self._dispatch(frame)
+                self._expire_waiters()
+            except Exception as e:
+                logger.error(f'Link arbiter receive error: {e}')
+                if not self._communication.is_open():
+                    break
+                time.sleep(self._poll_timeout)
+
+        # 链路关闭后读线程退出，之后的请求立即失败，不再登记
+        with self._lock:
+            self._running = False
+        self._started.clear()
+        self._fail_all(ConnectionError('Link closed'))
+
+    def _dispatch(self, frame):
+        """将帧交给最早登记的匹配等待者"""
+        key = self.frame_key(frame)
+        future = None
+
+        with self._lock:
+            waiters = self._waiters.get(key)
+            if waiters:
+                _, future = waiters.popleft()
+                if not waiters:
+                    del self._waiters[key]
+
+        if future is not None:
+            future.set_result(frame)
+        elif self.on_unsolicited:
+            self.on_unsolicited(frame)
+        else:
+            logger.debug(f'Unsolicited frame dropped: {frame["raw"].hex()}')
+
+    def _expire_waiters(self):
+        """使超时的等待者失败"""
+        now = time.monotonic()
+        expired = []
+
+        with self._lock:
+            for key in list(self._waiters):
+                waiters = self._waiters[key]
+                kept = deque(w for w in waiters if w[0] is None or w[0] > now)
+                if len(kept) != len(waiters):
+                    expired.extend(w[1] for w in waiters if w[0] is not None and w[0] <= now)
+                    if kept:
+                        self._waiters[key] = kept
+                    else:
+                        del self._waiters[key]
+
+        for future in expired:
+            future.set_exception(TimeoutError('Response timeout'))
+
+    def _remove_waiter(self, key, future):
+        """移除指定的等待者"""
+        with self._lock:
+            waiters = self._waiters.get(key)
+            if not waiters:
+                return
+            for waiter in waiters:
+                if waiter[1] is future:
+                    waiters.remove(waiter)
+                    break
+            if not waiters:
+                del self._waiters[key]
+
+    def _fail_all(self, error):
+        """使所有等待者失败"""
+        with self._lock:
+            waiters = [w[1] for q in self._waiters.values() for w in q]
+            self._waiters.clear()
+
+        for future in waiters:
+            if not future.done():
+                future.set_exception(error)
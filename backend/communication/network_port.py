@@ -16,6 +16,8 @@ class NetworkPort(CommunicationInterface):
         """打开网口连接"""
         try:
             self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            # 关闭Nagle算法，连续发出的小指令帧不必等待前一帧的确认
+            self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             self._socket.settimeout(self.timeout)
             self._socket.connect((self.host, self.port))
             logger.info(f'Connected to network {self.host}:{self.port}')
@@ -25,8 +27,9 @@ class NetworkPort(CommunicationInterface):
     
     def close(self):
         """关闭网口连接"""
-        if self._socket:
-            self._socket.close()
+        sock, self._socket = self._socket, None
+        if sock:
+            sock.close()
             logger.info(f'Network connection to {self.host}:{self.port} closed')
     
     def send(self, data: bytes):
@@ -43,18 +46,34 @@ class NetworkPort(CommunicationInterface):
             raise ConnectionError('Network connection not established')
     
     def receive(self, timeout=None):
-        """接收数据"""
-        if self._socket:
+        """接收数据
+        
+        Raises:
+            ConnectionError: 连接未建立或已被对端关闭
+        """
+        sock = self._socket
+        if sock:
             try:
-                original_timeout = self._socket.gettimeout()
+                original_timeout = sock.gettimeout()
                 if timeout is not None:
-                    self._socket.settimeout(timeout)
+                    sock.settimeout(timeout)
                 
-                data = self._socket.recv(1024)  # 最大读取1024字节
-                
-                if timeout is not None:
-                    self._socket.settimeout(original_timeout)
+                try:
+                    data = sock.recv(1024)  # 最大读取1024字节
+                    closed = not data
+                except socket.timeout:
+                    # 与串口行为一致，超时返回空数据
+                    data = b''
+                    closed = False
+                finally:
+                    if timeout is not None:
+                        sock.settimeout(original_timeout)
                 
+                if closed:
+                    # recv 返回空数据表示对端已关闭连接，与 AsyncNetworkPort 一致抛出 ConnectionError，
+                    # 并标记为未打开，链路仲裁器据此退出读循环并使等待中的请求立即失败
+                    self.close()
+                    raise ConnectionError(f'Connection closed by {self.host}:{self.port}')
                 if data:
                     logger.debug(f'Received {len(data)} bytes over network: {data.hex()}')
                 return data
@@ -1,4 +1,5 @@
 from loguru import logger
+from backend.communication.frame_reassembler import FrameReassembler
 
 
 class PacketParser:
@@ -13,8 +14,37 @@ class PacketParser:
     CMD_GET_CURRENT = 0x02
     CMD_GET_POWER = 0x03
     
+    # 遥测帧各命令允许的数据长度：查询指令不带数据，温度响应2字节，电流、功率响应4字节
+    TELEMETRY_DATA_LENGTHS = {
+        CMD_GET_TEMPERATURE: (0, 2),
+        CMD_GET_CURRENT: (0, 4),
+        CMD_GET_POWER: (0, 4),
+    }
+    
+    # 流式解析输出的帧格式
+    FRAME_TELEMETRY = FrameReassembler.FORMAT_TELEMETRY
+    FRAME_RESPONSE = FrameReassembler.FORMAT_RESPONSE
+    
     def __init__(self):
-        pass
+        # 每个解析器对应一条链路，持有一个流式帧重组器
+        self._reassembler = FrameReassembler(telemetry_lengths=self.TELEMETRY_DATA_LENGTHS)
+    
+    @staticmethod
+    def response_key(frame: bytes):
+        """获取指令/响应帧的匹配键
+        
+        指令帧与其响应帧格式相同（AA 55 55 AA 88 88 ...），
+        以帧ID（第8-11字节）和命令码（第14-15字节）作为匹配键。
+        
+        Args:
+            frame: 指令帧或响应帧
+            
+        Returns:
+            tuple: (帧ID, 命令码)，帧长度不足时对应字段为None
+        """
+        frame_id = frame[8:12] if len(frame) >= 12 else None
+        command_code = frame[14:16] if len(frame) >= 16 else None
+        return frame_id, command_code
     
     def create_command_packet(self, command_id: int, data: bytes = b''):
         """生成指令帧
@@ -108,6 +138,44 @@ class PacketParser:
             'data': data
         }
     
+    def feed(self, raw_data: bytes):
+        """增量解析接收到的数据流
+
+        与 parse_received_data 不同，跨多次接收拆分的帧会被缓存拼接，
+        一次接收中包含的多个帧也会全部返回。
+
+        Args:
+            raw_data: 本次接收到的原始数据
+
+        Returns:
+            list: 完整帧列表，格式见 FrameReassembler.feed
+        """
+        return self._reassembler.feed(raw_data)
+
+    def reset_stream(self):
+        """清空流式解析缓冲区"""
+        self._reassembler.reset()
+
+    def parse_telemetry_data(self, command_id: int, data: bytes):
+        """按命令ID解析遥测数据（采集、按通道轮询和抓包回放共用）
+        
+        Args:
+            command_id: 遥测命令ID
+            data: 遥测帧的数据内容
+            
+        Returns:
+            float: 遥测值；数据长度无效或命令不支持时返回None
+        """
+        if command_id == self.CMD_GET_TEMPERATURE:
+            return self.parse_temperature_data(data)
+        elif command_id == self.CMD_GET_CURRENT:
+            return self.parse_current_data(data)
+        elif command_id == self.CMD_GET_POWER:
+            return self.parse_power_data(data)
+        
+        logger.error(f'Unsupported telemetry command: {command_id}')
+        return None
+    
     def parse_temperature_data(self, data: bytes):
         """解析温度数据
         
@@ -0,0 +1,95 @@
+import struct
+import numpy as np
+
+
+class ResponseFrame:
+    """指令响应帧的解码结果
+
+    帧格式：[同步字 AA 55 55 AA][帧类型 88 88][长度 2字节][帧ID 4字节][状态码 2字节][命令码 2字节][数据 ...]，
+    多字节字段均为大端。帧头用预编译的 struct.Struct 一次解出为整数字段，数据部分以 memoryview
+    引用原始帧，不复制；只有在显示或导出时才生成十六进制字符串。
+    """
+
+    SYNC = b'\xAA\x55\x55\xAA'
+    HEADER = struct.Struct('>4s2sHIHH')
+
+    # 批量解码等长响应帧的帧头，见 decode_headers
+    HEADER_FIELDS = (
+        ('sync', '>u4', 0),
+        ('frame_type', '>u2', 4),
+        ('length', '>u2', 6),
+        ('frame_id', '>u4', 8),
+        ('status', '>u2', 12),
+        ('command_code', '>u2', 14),
+    )
+
+    __slots__ = ('raw', 'frame_type', 'length', 'frame_id', 'status', 'command_code', 'payload')
+
+    def __init__(self, raw, frame_type, length, frame_id, status, command_code):
+        self.raw = raw
+        self.frame_type = frame_type
+        self.length = length
+        self.frame_id = frame_id
+        self.status = status
+        self.command_code = command_code
+        self.payload = memoryview(raw)[self.HEADER.size:]
+
+    @classmethod
+    def decode(cls, raw):
+        """解码响应帧
+
+        Args:
+            raw: 完整的响应帧（bytes）
+
+        Returns:
+            ResponseFrame: 解码结果；帧长度不足或同步字错误时返回None
+        """
+        if len(raw) < cls.HEADER.size:
+            return None
+        sync, frame_type, length, frame_id, status, command_code = cls.HEADER.unpack_from(raw)
+        if sync != cls.SYNC:
+            return None
+        return cls(raw, int.from_bytes(frame_type, 'big'), length, frame_id, status, command_code)
+
+    @classmethod
+    def decode_headers(cls, buffer, frame_length):
+        """批量解码连续存放的等长响应帧的帧头
+
+        Args:
+            buffer: 连续存放的多个响应帧
+            frame_length: 每帧长度(字节)
+
+        Returns:
+            numpy.ndarray: 结构化数组，字段见 HEADER_FIELDS，与 buffer 共享内存
+        """
+        dtype = np.dtype({
+            'names': [name for name, _, _ in cls.HEADER_FIELDS],
+            'formats': [fmt for _, fmt, _ in cls.HEADER_FIELDS],
+            'offsets': [offset for _, _, offset in cls.HEADER_FIELDS],
+            'itemsize': frame_length
+        })
+        return np.frombuffer(buffer, dtype=dtype, count=len(buffer) // frame_length)
+
+    @property
+    def is_success(self):
+        """状态码是否为0"""
+        return self.status == 0
+
+    def hex(self):
+        """整帧的十六进制字符串（用于显示和导出）"""
+        return self.raw.hex()
+
+    def to_dict(self):
+        """转换为可显示、可导出的字典，帧ID、状态码、命令码和数据为十六进制字符串"""
+        return {
+            'header': self.raw[:4].hex(),
+            'length': self.length,
+            'frame_id': f'{self.frame_id:08x}',
+            'status': f'{self.status:04x}',
+            'command_code': f'{self.command_code:04x}',
+            'data': self.payload.hex()
+        }
+
+    def __repr__(self):
+        return (f'ResponseFrame(frame_id=0x{self.frame_id:08X}, status=0x{self.status:04X}, '
+                f'command_code=0x{self.command_code:04X}, payload={len(self.payload)} bytes)')
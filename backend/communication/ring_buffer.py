@@ -0,0 +1,169 @@
+import numpy as np
+from backend.processor.shm_pool import SharedArray
+
+
+class RecordRing:
+    """单生产者/单消费者的定长记录环形缓冲区
+
+    记录存放在预分配的 NumPy 结构化数组中（可放在共享内存里供另一个进程读取），
+    生产者和消费者各自只修改自己的计数（已写入/已读取记录数），不需要加锁：
+    生产者先写数据再推进写计数，消费者先读数据再推进读计数。批量读写一次复制一段连续内存，
+    热路径上没有逐条的对象分配和队列锁。缓冲区写满时新记录被丢弃并计入溢出数。
+    """
+
+    # 计数数组中的位置
+    _WRITTEN = 0
+    _READ = 1
+    _OVERRUNS = 2
+
+    def __init__(self, capacity, dtype, shared=False, _handles=None):
+        """初始化
+
+        Args:
+            capacity: 记录容量
+            dtype: 记录的数据类型（结构化 dtype 或基本类型）
+            shared: 是否放在共享内存中，可通过 handle 在其他进程中 attach
+        """
+        self.capacity = int(capacity)
+        self.dtype = np.dtype(dtype)
+        self._shared = []
+
+        if _handles is not None:
+            records, counters = (SharedArray(shape, dtype, name=name) for name, shape, dtype in _handles)
+            self._shared = [records, counters]
+            self._records, self._counters = records.array, counters.array
+        elif shared:
+            records = SharedArray((self.capacity,), self.dtype)
+            counters = SharedArray((3,), np.int64)
+            counters.array[:] = 0
+            self._shared = [records, counters]
+            self._records, self._counters = records.array, counters.array
+        else:
+            self._records = np.zeros(self.capacity, dtype=self.dtype)
+            self._counters = np.zeros(3, dtype=np.int64)
+
+        # 本端计数的本地副本，避免每次访问共享内存中的计数
+        self._written = int(self._counters[self._WRITTEN])
+        self._read = int(self._counters[self._READ])
+
+    @property
+    def handle(self):
+        """共享内存句柄，用于在其他进程中调用 RecordRing.attach()"""
+        if not self._shared:
+            raise ValueError('Ring buffer is not in shared memory')
+        return tuple(shared.handle for shared in self._shared)
+
+    @classmethod
+    def attach(cls, handle):
+        """按句柄打开另一个进程创建的共享内存环形缓冲区"""
+        (_, shape, dtype), _ = handle
+        return cls(shape[0], dtype, _handles=handle)
+
+    def close(self):
+        """关闭共享内存（创建者同时删除共享内存段）"""
+        self._records = self._counters = None
+        for shared in self._shared:
+            shared.close()
+        self._shared = []
+
+    # ---------- 生产者 ----------
+
+    def write(self, records):
+        """批量写入记录（生产者调用）
+
+        Args:
+            records: 记录数组（dtype 与缓冲区一致或可转换）
+
+        Returns:
+            int: 实际写入的记录数，其余记录因缓冲区已满被丢弃
+        """
+        records = np.asarray(records, dtype=self.dtype).reshape(-1)
+        count = len(records)
+        free = self.capacity - (self._written - int(self._counters[self._READ]))
+        n = min(count, free)
+
+        if n:
+            start = self._written % self.capacity
+            first = min(n, self.capacity - start)
+            self._records[start:start + first] = records[:first]
+            if n > first:
+                self._records[:n - first] = records[first:n]
+            self._written += n
+            self._counters[self._WRITTEN] = self._written
+
+        if n < count:
+            self._counters[self._OVERRUNS] += count - n
+        return n
+
+    def write_record(self, record):
+        """写入一条记录（生产者调用）
+
+        Args:
+            record: 记录值，结构化 dtype 时为字段值元组
+
+        Returns:
+            bool: 是否写入成功（缓冲区已满时丢弃并计入溢出数）
+        """
+        if self._written - int(self._counters[self._READ]) >= self.capacity:
+            self._counters[self._OVERRUNS] += 1
+            return False
+        self._records[self._written % self.capacity] = record
+        self._written += 1
+        self._counters[self._WRITTEN] = self._written
+        return True
+
+    # ---------- 消费者 ----------
+
+    def read(self, max_count=None, out=None):
+        """批量读取记录（消费者调用）
+
+        Args:
+            max_count: 最多读取的记录数，默认读取全部可读记录
+            out: 可选的预分配输出数组，读取数量不超过其长度
+
+        Returns:
+            numpy.ndarray: 读取的记录（传入 out 时为 out 的前若干条），无可读记录时长度为0
+        """
+        available = int(self._counters[self._WRITTEN]) - self._read
+        if max_count is not None:
+            available = min(available, max_count)
+        if out is not None:
+            available = min(available, len(out))
+        else:
+            out = np.empty(available, dtype=self.dtype)
+
+        if available:
+            start = self._read % self.capacity
+            first = min(available, self.capacity - start)
+            out[:first] = self._records[start:start + first]
+            if available > first:
+                out[first:available] = self._records[:available - first]
+            self._read += available
+            self._counters[self._READ] = self._read
+        return out[:available]
+
+    # ---------- 状态 ----------
+
+    def __len__(self):
+        """当前可读记录数"""
+        return int(self._counters[self._WRITTEN]) - int(self._counters[self._READ])
+
+    @property
+    def free(self):
+        """剩余可写记录数"""
+        return self.capacity - len(self)
+
+    @property
+    def overruns(self):
+        """因缓冲区已满被丢弃的记录数"""
+        return int(self._counters[self._OVERRUNS])
+
+    def get_stats(self):
+        """统计信息"""
+        return {
+            'capacity': self.capacity,
+            'written': int(self._counters[self._WRITTEN]),
+            'read': int(self._counters[self._READ]),
+            'pending': len(self),
+            'overruns': self.overruns
+        }
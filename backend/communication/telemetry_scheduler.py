@@ -0,0 +1,264 @@
+import heapq
+import threading
+import time
+from collections import deque
+from loguru import logger
+from backend.communication.packet_parser import PacketParser
+from backend.communication.link_arbiter import LinkArbiter
+
+
+class TelemetryChannel:
+    """一路遥测量的轮询配置和调度统计"""
+
+    POLICY_SKIP = 'skip'
+    POLICY_CATCH_UP = 'catch_up'
+
+    def __init__(self, name, command_id, rate, policy=POLICY_SKIP, max_catch_up=4, decoder=None):
+        """初始化
+
+        Args:
+            name: 通道名称
+            command_id: 查询命令ID
+            rate: 轮询频率(Hz)
+            policy: 错过截止时间时的策略
+                    skip：丢弃错过的轮询，对齐到下一个未来的截止时间
+                    catch_up：尽快补发错过的轮询（最多 max_catch_up 次），保持平均采样率
+            max_catch_up: catch_up 策略下最多补发的轮询次数
+            decoder: 响应数据解码函数，参数为帧数据bytes，默认按命令ID选择 PacketParser 的解析函数
+        """
+        if rate <= 0:
+            raise ValueError(f'Invalid rate for channel {name}: {rate}')
+        if policy not in (self.POLICY_SKIP, self.POLICY_CATCH_UP):
+            raise ValueError(f'Invalid policy for channel {name}: {policy}')
+
+        self.name = name
+        self.command_id = command_id
+        self.period = 1.0 / rate
+        self.policy = policy
+        self.max_catch_up = max_catch_up
+        self.decoder = decoder
+
+        self.pending = None  # 在途请求的Future
+        self.deferred = 0  # catch_up 策略下等待在途请求完成后补发的轮询数
+        self.reset_stats()
+
+    def reset_stats(self):
+        """清空统计信息"""
+        self.polls = 0
+        self.completed = 0
+        self.failed = 0
+        self.missed = 0
+        self.jitter_count = 0
+        self.jitter_sum = 0.0
+        self.jitter_max = 0.0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self._jitter_samples = deque(maxlen=1000)
+
+    def record_jitter(self, jitter):
+        """记录一次轮询的发出时间相对截止时间的偏差(秒)"""
+        self.jitter_count += 1
+        self.jitter_sum += jitter
+        self.jitter_max = max(self.jitter_max, jitter)
+        self._jitter_samples.append(jitter)
+
+    def record_latency(self, latency):
+        """记录一次成功轮询的响应延迟(秒)"""
+        self.completed += 1
+        self.latency_sum += latency
+        self.latency_max = max(self.latency_max, latency)
+
+    def stats(self):
+        """统计信息，时间单位为毫秒"""
+        samples = sorted(self._jitter_samples)
+        return {
+            'rate': 1.0 / self.period,
+            'policy': self.policy,
+            'polls': self.polls,
+            'completed': self.completed,
+            'failed': self.failed,
+            'missed': self.missed,
+            'jitter_mean_ms': self.jitter_sum / self.jitter_count * 1e3 if self.jitter_count else 0.0,
+            'jitter_p99_ms': samples[int(len(samples) * 0.99)] * 1e3 if samples else 0.0,
+            'jitter_max_ms': self.jitter_max * 1e3,
+            'latency_mean_ms': self.latency_sum / self.completed * 1e3 if self.completed else 0.0,
+            'latency_max_ms': self.latency_max * 1e3
+        }
+
+
+class TelemetryScheduler:
+    """按截止时间调度的遥测轮询器：每路遥测量独立的轮询频率
+
+    调度线程维护一个按截止时间排序的堆，到期时通过链路仲裁器发出查询（不等待响应），
+    响应在仲裁器读线程中解码后回调 on_sample。同一通道上一次查询仍在途时视为链路饱和，
+    记为错过截止时间，并按通道策略跳过或延后补发。每次轮询的实际发出时间相对截止时间的
+    偏差记为调度抖动。
+    """
+
+    def __init__(self, link_arbiter: LinkArbiter, channels, response_timeout=2.0, on_sample=None, on_error=None):
+        """初始化
+
+        Args:
+            link_arbiter: 链路仲裁器
+            channels: TelemetryChannel 列表
+            response_timeout: 单次查询的响应超时时间(秒)
+            on_sample: 采样回调函数，参数为(通道名, 数值, 时间戳)
+            on_error: 错误回调函数，参数为(通道名, 错误信息)
+        """
+        self._arbiter = link_arbiter
+        self._parser = PacketParser()
+        self._response_timeout = response_timeout
+        self.on_sample = on_sample
+        self.on_error = on_error
+
+        self._channels = {channel.name: channel for channel in channels}
+        # 查询发送失败时完成回调会在 _poll 内同步执行，需要可重入锁
+        self._lock = threading.RLock()
+        self._wakeup = threading.Condition(self._lock)
+        self._heap = []
+        self._running = False
+        self._thread = None
+
+    @classmethod
+    def channels_from_config(cls, config):
+        """由配置创建通道列表
+
+        Args:
+            config: 通道配置列表，每项包含 name、command、rate，可选 policy、max_catch_up
+
+        Returns:
+            list: TelemetryChannel 列表
+        """
+        return [TelemetryChannel(
+            name=item['name'],
+            command_id=item['command'],
+            rate=item['rate'],
+            policy=item.get('policy', TelemetryChannel.POLICY_SKIP),
+            max_catch_up=item.get('max_catch_up', 4)
+        ) for item in config]
+
+    def start(self):
+        """开始轮询"""
+        if self._running:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._running = True
+            self._heap = [(now, i, channel) for i, channel in enumerate(self._channels.values())]
+            heapq.heapify(self._heap)
+            for channel in self._channels.values():
+                channel.pending = None
+                channel.deferred = 0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        logger.info('Telemetry scheduler started: ' + ', '.join(
+            f'{c.name} {1.0 / c.period:g}Hz' for c in self._channels.values()))
+
+    def stop(self):
+        """停止轮询（在途查询的响应仍会被处理）"""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            self._wakeup.notify()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+        logger.info('Telemetry scheduler stopped')
+
+    def is_running(self):
+        """是否正在轮询"""
+        return self._running
+
+    def get_stats(self):
+        """获取各通道的调度统计信息"""
+        with self._lock:
+            return {name: channel.stats() for name, channel in self._channels.items()}
+
+    def reset_stats(self):
+        """清空各通道的调度统计信息"""
+        with self._lock:
+            for channel in self._channels.values():
+                channel.reset_stats()
+
+    def _run(self):
+        """调度线程主循环"""
+        with self._lock:
+            while self._running:
+                deadline, seq, channel = self._heap[0]
+                now = time.monotonic()
+                if deadline > now:
+                    self._wakeup.wait(deadline - now)
+                    continue
+
+                heapq.heapreplace(self._heap, (self._next_deadline(channel, deadline, now), seq, channel))
+                if channel.pending is not None:
+                    # 上一次查询仍在途，链路饱和
+                    channel.missed += 1
+                    if channel.policy == TelemetryChannel.POLICY_CATCH_UP:
+                        channel.deferred = min(channel.deferred + 1, channel.max_catch_up)
+                    continue
+
+                channel.record_jitter(now - deadline)
+                self._poll(channel)
+
+    def _next_deadline(self, channel, deadline, now):
+        """计算通道的下一个截止时间，并统计因调度延迟错过的截止时间"""
+        next_deadline = deadline + channel.period
+        if next_deadline > now:
+            return next_deadline
+
+        late = int((now - next_deadline) / channel.period) + 1
+        if channel.policy == TelemetryChannel.POLICY_CATCH_UP and late <= channel.max_catch_up:
+            # 保留错过的截止时间，后续轮询立即依次发出
+            return next_deadline
+
+        channel.missed += late
+        return next_deadline + late * channel.period
+
+    def _poll(self, channel):
+        """发出一次查询（调用时持有锁）"""
+        channel.polls += 1
+        sent = time.monotonic()
+        packet = self._parser.create_command_packet(channel.command_id)
+        future = self._arbiter.request(packet, LinkArbiter.telemetry_key(channel.command_id),
+                                       timeout=self._response_timeout)
+        channel.pending = future
+        future.add_done_callback(lambda f: self._on_response(channel, sent, f))
+
+    def _on_response(self, channel, sent, future):
+        """查询完成回调（在仲裁器读线程或发送线程中执行）"""
+        timestamp = time.time()
+        value = None
+        error = None
+        try:
+            value = self._decode(channel, future.result()['data'])
+        except Exception as e:
+            error = e
+
+        with self._lock:
+            if channel.pending is future:
+                channel.pending = None
+            if error is None:
+                channel.record_latency(time.monotonic() - sent)
+            else:
+                channel.failed += 1
+            if channel.deferred and self._running:
+                # 补发链路饱和期间错过的轮询
+                channel.deferred -= 1
+                self._poll(channel)
+
+        if error is not None:
+            logger.error(f'Telemetry {channel.name} failed: {error}')
+            if self.on_error:
+                self.on_error(channel.name, str(error))
+        elif self.on_sample:
+            self.on_sample(channel.name, value, timestamp)
+
+    def _decode(self, channel, data):
+        """解码响应数据"""
+        if channel.decoder is not None:
+            return channel.decoder(data)
+        if channel.command_id in PacketParser.TELEMETRY_DATA_LENGTHS:
+            return self._parser.parse_telemetry_data(channel.command_id, data)
+        return bytes(data)
@@ -0,0 +1,188 @@
+import mmap
+import struct
+import threading
+import time
+from loguru import logger
+from backend.communication.communication_interface import CommunicationInterface
+
+
+class CaptureFormat:
+    """链路抓包文件格式
+
+    文件头：[魔数 8字节][开始时间 float64]
+    记录：  [时间戳 float64][方向 uint8][长度 uint32][数据 ...]，均为小端
+    """
+
+    MAGIC = b'SLTCAP01'
+    FILE_HEADER = struct.Struct('<8sd')
+    RECORD_HEADER = struct.Struct('<dBI')
+
+    DIR_TX = 0  # 上位机 -> 板卡
+    DIR_RX = 1  # 板卡 -> 上位机
+
+
+class CaptureWriter:
+    """抓包文件写入器（线程安全）
+
+    每写入 flush_records 条记录或距上次写出超过 flush_interval 秒时将缓冲区写入文件，
+    程序崩溃或被终止时最多丢失最近这一小段数据（CaptureReader 容忍末尾不完整的记录）。
+    """
+
+    def __init__(self, path, buffering=1 << 16, flush_records=64, flush_interval=0.2):
+        """初始化
+
+        Args:
+            path: 抓包文件路径
+            buffering: 文件写缓冲区大小(字节)
+            flush_records: 每写入这么多条记录写出一次缓冲区
+            flush_interval: 距上次写出超过这么多秒时写出缓冲区(秒)
+        """
+        self.path = path
+        self.flush_records = flush_records
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._file = open(path, 'wb', buffering=buffering)
+        self._file.write(CaptureFormat.FILE_HEADER.pack(CaptureFormat.MAGIC, time.time()))
+        self._file.flush()
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+        self.records = 0
+        logger.info(f'Capturing link traffic to {path}')
+
+    def write(self, direction, data, timestamp=None):
+        """写入一条记录
+
+        Args:
+            direction: 方向，CaptureFormat.DIR_TX 或 CaptureFormat.DIR_RX
+            data: 数据
+            timestamp: 时间戳，默认为当前时间
+        """
+        header = CaptureFormat.RECORD_HEADER.pack(
+            time.time() if timestamp is None else timestamp, direction, len(data))
+        with self._lock:
+            self._file.write(header)
+            self._file.write(data)
+            self.records += 1
+            self._unflushed += 1
+            now = time.monotonic()
+            if self._unflushed >= self.flush_records or now - self._last_flush >= self.flush_interval:
+                self._file.flush()
+                self._unflushed = 0
+                self._last_flush = now
+
+    def flush(self):
+        """将缓冲区写入文件"""
+        with self._lock:
+            self._file.flush()
+            self._unflushed = 0
+            self._last_flush = time.monotonic()
+
+    def close(self):
+        """关闭文件"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+                logger.info(f'Capture {self.path} closed, {self.records} records')
+
+
+class CaptureReader:
+    """抓包文件读取器：内存映射文件，记录数据以 memoryview 返回，不复制"""
+
+    def __init__(self, path):
+        """初始化
+
+        Args:
+            path: 抓包文件路径
+        """
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+
+        magic, self.start_time = CaptureFormat.FILE_HEADER.unpack_from(self._mmap, 0)
+        if magic != CaptureFormat.MAGIC:
+            self.close()
+            raise ValueError(f'Not a capture file: {path}')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __iter__(self):
+        return self.records()
+
+    def records(self, direction=None):
+        """遍历记录
+
+        Args:
+            direction: 只返回指定方向的记录，None 表示全部
+
+        Yields:
+            tuple: (时间戳, 方向, 数据memoryview)
+        """
+        unpack_from = CaptureFormat.RECORD_HEADER.unpack_from
+        header_size = CaptureFormat.RECORD_HEADER.size
+        offset = CaptureFormat.FILE_HEADER.size
+        end = len(self._mmap)
+
+        while offset + header_size <= end:
+            timestamp, record_dir, length = unpack_from(self._mmap, offset)
+            offset += header_size
+            if offset + length > end:
+                logger.warning(f'Truncated record at offset {offset - header_size} in {self.path}')
+                return
+            if direction is None or record_dir == direction:
+                yield timestamp, record_dir, self._view[offset:offset + length]
+            offset += length
+
+    def close(self):
+        """关闭文件（需先释放所有返回的 memoryview）"""
+        self._view.release()
+        self._mmap.close()
+        self._file.close()
+
+
+class CapturingPort(CommunicationInterface):
+    """抓包通信接口：包装任意通信接口，记录所有收发数据"""
+
+    def __init__(self, communication_interface: CommunicationInterface, writer: CaptureWriter):
+        """初始化
+
+        Args:
+            communication_interface: 被包装的通信接口
+            writer: 抓包文件写入器
+        """
+        self._inner = communication_interface
+        self._writer = writer
+
+    def open(self):
+        """打开通信通道"""
+        self._inner.open()
+
+    def close(self):
+        """关闭通信通道并关闭抓包文件"""
+        try:
+            self._inner.close()
+        finally:
+            self._writer.close()
+
+    def send(self, data: bytes):
+        """记录并发送数据
+
+        发送前写入记录，保证快速返回的响应（由读线程记录）在抓包文件中排在对应的发送记录之后
+        """
+        self._writer.write(CaptureFormat.DIR_TX, data)
+        self._inner.send(data)
+
+    def receive(self, timeout=None):
+        """接收数据并记录"""
+        data = self._inner.receive(timeout)
+        if data:
+            self._writer.write(CaptureFormat.DIR_RX, data)
+        return data
+
+    def is_open(self):
+        """检查通信通道是否打开"""
+        return self._inner.is_open()
@@ -38,13 +38,56 @@ class ConfigLoader:
                 },
                 'network': {
                     'ip': '192.168.1.100',
-                    'port': 5000
+                    'port': 5000,
+                    'transport': 'blocking',  # blocking或asyncio
+                    'tcp_nodelay': True,
+                    'rcvbuf': 262144
+                },
+                'capture_dir': ''  # 链路抓包文件目录，为空表示不抓包
+            },
+            'acquisition': {
+                'batched': True,  # 温度/电流/功率查询连续发出并发等待响应
+                'interval': 1000,  # 自动采集间隔(毫秒)
+                # 按通道独立频率轮询，每项包含name、command(命令ID)、rate(Hz)、policy(skip或catch_up)，
+                # 为空时使用固定间隔定时器采集
+                'channels': [],
+                'ring_capacity': 65536,  # 按通道调度时遥测采样环形缓冲区的记录容量，0表示不使用
+                'ring_drain_interval': 100  # 环形缓冲区的批量读取间隔(毫秒)，每批以一个信号发出
+            },
+            'processing': {
+                'backend': 'thread',  # 采样数据分析方式：thread(线程池)或process(共享内存进程池)
+                'max_workers': 4  # 工作线程/进程数，process模式下为空表示使用全部CPU核心
+            },
+            'pipeline': {
+                # 测试流水线各队列的容量(capacity，0为不限)和队列满时的处理策略(policy)：
+                # block(阻塞生产者)、drop_oldest(丢弃最早)、drop_newest(丢弃最新)、coalesce(同一指令只保留最新)
+                'queues': {
+                    'command': {'capacity': 1024, 'policy': 'block'},  # 参数扫描按发送进度惰性生成指令
+                    'response': {'capacity': 1024, 'policy': 'block'},
+                    'data': {'capacity': 1024, 'policy': 'block'},
+                    'result': {'capacity': 1024, 'policy': 'block'}
                 }
             },
+            'sites': [],  # 多工位测试的工位列表，每项包含name及type/serial/network通信设置
             'test': {
                 'ping_count': 4,
                 'ping_timeout': 1.0,
-                'command_interval': 0.5
+                'command_interval': 0.5,
+                'connect_timeout': 5.0,
+                'command_window': 1,
+                'response_timeout': 2.0,
+                # 同时运行的最大测试步骤数，互不依赖的步骤并行执行
+                'max_parallel_steps': 4,
+                # 步骤名 -> 超时时间(秒)，如 {'connect': 10, 'commands': 600}
+                'step_timeouts': {},
+                # 失败即停：有步骤或指令未通过后，跳过其余非必需的步骤和指令
+                'fail_fast': False,
+                # 排序模式：file（按定义顺序）或 adaptive（按历史每秒失败概率从高到低）
+                'ordering': 'file',
+                # 必需的步骤名或指令描述：失败即停时仍然执行，自适应排序时保持原位置
+                'mandatory': [],
+                # 测试历史统计文件（各步骤和指令的失败率、耗时），为空表示不记录
+                'history_file': ''
             }
         }
         
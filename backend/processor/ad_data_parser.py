@@ -0,0 +1,183 @@
+import numpy as np
+from loguru import logger
+
+
+class ADDataParser:
+    """AD采样数据解析器：将帧数据中的AD采样块批量解码为NumPy数组
+
+    采样数据按帧顺序交织存放（ch0, ch1, ..., chN-1, ch0, ...），解码结果形状为
+    (采样点数, 通道数)，每列对应一个通道。整个数据块由 np.frombuffer 一次性解码，
+    不逐个采样转换；可传入预先分配的输出数组，连续解码时不产生新的内存分配。
+    """
+
+    # 采样格式 -> (每个采样的字节数, 是否有符号)
+    SAMPLE_FORMATS = {
+        'int16': (2, True),
+        'uint16': (2, False),
+        'int24': (3, True),
+        'uint24': (3, False),
+        'int32': (4, True),
+        'uint32': (4, False),
+    }
+
+    def __init__(self, sample_format='int16', channels=1, byteorder='little', scale=1.0, offset=0.0):
+        """初始化
+
+        Args:
+            sample_format: 采样格式，见 SAMPLE_FORMATS，24位格式为3字节紧凑存放
+            channels: 交织的通道数
+            byteorder: 字节序，'little' 或 'big'
+            scale: 码值到物理量的比例系数，可为标量或每通道一个值的序列
+            offset: 物理量偏移，物理量 = 码值 * scale + offset，可为标量或每通道一个值的序列
+        """
+        if sample_format not in self.SAMPLE_FORMATS:
+            raise ValueError(f'Unsupported sample format: {sample_format}')
+        if byteorder not in ('little', 'big'):
+            raise ValueError(f'Invalid byteorder: {byteorder}')
+        if channels < 1:
+            raise ValueError(f'Invalid channel count: {channels}')
+
+        self.sample_format = sample_format
+        self.channels = channels
+        self.byteorder = byteorder
+        self.sample_size, self.signed = self.SAMPLE_FORMATS[sample_format]
+        self.frame_size = self.sample_size * channels
+
+        order = '<' if byteorder == 'little' else '>'
+        if self.sample_size == 3:
+            # 24位采样拼成4字节后按32位整数读取，再算术右移8位完成符号扩展
+            self._dtype = np.dtype(f'{order}{"i" if self.signed else "u"}4')
+        else:
+            self._dtype = np.dtype(f'{order}{"i" if self.signed else "u"}{self.sample_size}')
+        self._scratch = None
+
+        self.scale = self._per_channel(scale, 'scale')
+        self.offset = self._per_channel(offset, 'offset')
+
+    def _per_channel(self, value, name):
+        """将标量或序列参数转换为可与 (采样点数, 通道数) 广播的数组"""
+        array = np.asarray(value, dtype=np.float64)
+        if array.ndim == 0:
+            return array
+        if array.shape != (self.channels,):
+            raise ValueError(f'{name} must be a scalar or have {self.channels} values')
+        return array
+
+    def sample_count(self, payload):
+        """数据块包含的采样点数（每个采样点含全部通道）"""
+        return self._nbytes(payload) // self.frame_size
+
+    def decode_codes(self, payload, out=None):
+        """解码原始码值
+
+        Args:
+            payload: 采样数据块（bytes、bytearray、memoryview 或 uint8 数组）
+            out: 可选的预分配输出数组，形状为 (采样点数, 通道数)，整数类型
+
+        Returns:
+            numpy.ndarray: 码值数组，形状为 (采样点数, 通道数)；未传入 out 时，
+                           16/32位格式返回的是 payload 的只读视图，不复制数据
+        """
+        codes = self._codes(payload)
+
+        if out is None:
+            # 24位格式的解码结果位于内部缓冲区，下次解码会被覆盖
+            return codes.copy() if self.sample_size == 3 else codes
+        self._check_out(out, codes.shape)
+        np.copyto(out, codes, casting='unsafe')
+        return out
+
+    def decode(self, payload, out=None):
+        """解码为物理量：码值 * scale + offset
+
+        Args:
+            payload: 采样数据块
+            out: 可选的预分配输出数组，形状为 (采样点数, 通道数)，浮点类型
+
+        Returns:
+            numpy.ndarray: 物理量数组，形状为 (采样点数, 通道数)
+        """
+        codes = self._codes(payload)
+        if out is None:
+            out = np.empty(codes.shape, dtype=np.float64)
+        else:
+            self._check_out(out, codes.shape)
+
+        np.multiply(codes, self.scale, out=out, casting='unsafe')
+        if self.offset.any():
+            np.add(out, self.offset, out=out)
+        return out
+
+    def decode_channel(self, payload, channel, out=None):
+        """只解码单个通道的物理量
+
+        Args:
+            payload: 采样数据块
+            channel: 通道序号
+            out: 可选的预分配输出数组，形状为 (采样点数,)，浮点类型
+
+        Returns:
+            numpy.ndarray: 该通道的物理量数组
+        """
+        if not 0 <= channel < self.channels:
+            raise ValueError(f'Invalid channel index: {channel}')
+
+        codes = self._codes(payload)[:, channel]
+        if out is None:
+            out = np.empty(codes.shape, dtype=np.float64)
+        else:
+            self._check_out(out, codes.shape)
+
+        scale = self.scale if self.scale.ndim == 0 else self.scale[channel]
+        offset = self.offset if self.offset.ndim == 0 else self.offset[channel]
+        np.multiply(codes, scale, out=out, casting='unsafe')
+        if offset:
+            np.add(out, offset, out=out)
+        return out
+
+    def _codes(self, payload):
+        """解码码值，返回 payload 的视图或内部缓冲区的视图"""
+        count = self._check_length(payload)
+        shape = (count, self.channels)
+        if self.sample_size == 3:
+            return self._decode_24bit(payload, count * self.channels).reshape(shape)
+        return np.frombuffer(payload, dtype=self._dtype, count=count * self.channels).reshape(shape)
+
+    def _decode_24bit(self, payload, total):
+        """解码3字节紧凑存放的24位采样，结果写入可复用的内部缓冲区"""
+        raw = np.frombuffer(payload, dtype=np.uint8, count=total * 3).reshape(total, 3)
+
+        if self._scratch is None or len(self._scratch) < total:
+            self._scratch = np.empty((total, 4), dtype=np.uint8)
+        scratch = self._scratch[:total]
+
+        # 将3个字节放到32位整数的高24位，低字节清零
+        if self.byteorder == 'little':
+            scratch[:, 0] = 0
+            scratch[:, 1:] = raw
+        else:
+            scratch[:, 3] = 0
+            scratch[:, :3] = raw
+
+        words = scratch.view(self._dtype).reshape(total)
+        np.right_shift(words, 8, out=words)
+        return words
+
+    def _check_length(self, payload):
+        """检查数据长度，返回采样点数"""
+        length = self._nbytes(payload)
+        if length % self.frame_size:
+            logger.error(f'AD data length {length} is not a multiple of frame size {self.frame_size}')
+            raise ValueError(f'AD数据长度 {length} 不是采样帧长度 {self.frame_size} 的整数倍')
+        return length // self.frame_size
+
+    @staticmethod
+    def _nbytes(payload):
+        """数据块的字节数"""
+        return payload.nbytes if isinstance(payload, (np.ndarray, memoryview)) else len(payload)
+
+    @staticmethod
+    def _check_out(out, shape):
+        """检查预分配输出数组的形状"""
+        if out.shape != shape:
+            raise ValueError(f'Output array shape {out.shape} does not match {shape}')
@@ -0,0 +1,147 @@
+import math
+import numpy as np
+from backend.processor.fft_processor import rfft, get_window
+
+# 各窗函数主瓣的单侧宽度(频点数)，计算信号/谐波功率时对峰值两侧这么多频点求和
+WINDOW_LEAKAGE_BINS = {
+    'rect': 0,
+    'hann': 2,
+    'hamming': 2,
+    'blackman': 3,
+    'blackmanharris': 4,
+}
+
+# 功率下限，避免理想信号（无谐波或无噪声）时取对数得到 -inf
+_POWER_FLOOR = 1e-30
+
+
+def coherent_frequency(fs, n, target):
+    """相干采样的输入频率：记录长度内恰好包含与 n 互质的整数个周期，频谱没有泄漏
+
+    Args:
+        fs: 采样率(Hz)
+        n: 记录长度(采样点数)
+        target: 期望的输入频率(Hz)
+
+    Returns:
+        tuple: (相干频率, 周期数)
+    """
+    cycles = max(1, int(round(target * n / fs)))
+    # 在目标附近寻找与 n 互质的周期数，n 为2的幂时即为奇数
+    for delta in range(n):
+        for candidate in (cycles - delta, cycles + delta):
+            if 0 < candidate < n // 2 and math.gcd(candidate, n) == 1:
+                return candidate * fs / n, candidate
+    raise ValueError(f'No coherent frequency near {target} Hz for n={n}')
+
+
+def _band_sum(cumulative, center, half_width):
+    """用累加和计算 [center-half_width, center+half_width] 频段的功率和（超出范围的部分截断）"""
+    last = cumulative.shape[-1] - 2
+    low = np.clip(center - half_width, 0, last)
+    high = np.clip(center + half_width, 0, last)
+    return (np.take_along_axis(cumulative, high + 1, axis=-1)
+            - np.take_along_axis(cumulative, low, axis=-1))
+
+
+def compute_adc_metrics(signals, fs, full_scale=None, harmonics=5, window='blackmanharris',
+                        fundamental_bin=None, workers=None):
+    """计算ADC动态性能指标：SNR、SINAD、THD、SFDR、ENOB
+
+    输入的最后一维为采样点，前面的维度（多次采集、多通道）一次批量计算。
+    相干采样时使用 window='rect'，信号和谐波各占一个频点；非相干采样时使用加窗，
+    信号、谐波和直流按窗函数主瓣宽度对相邻频点求和。谐波频率超过奈奎斯特频率时
+    按混叠后的频点计算。
+
+    Args:
+        signals: 采样数组，形状为 (..., 采样点数)，单位为码值或电压
+        fs: 采样率(Hz)
+        full_scale: 满量程正弦波的峰值幅度（与 signals 同单位），给出时输出 dBFS 值并将 ENOB 折算到满量程
+        harmonics: 计入 THD 的最高谐波次数（含基波，5 表示2~5次谐波）
+        window: 窗函数名称，见 WINDOW_LEAKAGE_BINS
+        fundamental_bin: 基波频点，默认取除直流外功率最大的频点
+        workers: scipy.fft 使用的线程数
+
+    Returns:
+        dict: 各指标数组，形状为 signals 去掉最后一维：
+              fundamental_frequency(Hz)、amplitude(峰值幅度)、snr、sinad、thd、sfdr(dB/dBc)、enob(位)、
+              noise_floor(每频点噪声功率, dB)、harmonic_levels(各次谐波电平 dBc，最后一维为谐波次数2..harmonics)；
+              给出 full_scale 时另有 amplitude_dbfs
+    """
+    if window not in WINDOW_LEAKAGE_BINS:
+        raise ValueError(f'Unsupported window: {window}')
+
+    signals = np.asarray(signals, dtype=np.float64)
+    n = signals.shape[-1]
+    leak = WINDOW_LEAKAGE_BINS[window]
+    w = get_window(window, n)
+
+    # 单边功率谱，归一化后各频段之和等于该频段的信号功率（均方值）
+    spectra = rfft(signals - signals.mean(axis=-1, keepdims=True) if window == 'rect' else signals * w,
+                   axis=-1, workers=workers)
+    power = spectra.real ** 2 + spectra.imag ** 2
+    power *= 2.0 / (n * np.sum(w ** 2))
+    power[..., 0] /= 2
+    if n % 2 == 0:
+        power[..., -1] /= 2
+
+    nbins = power.shape[-1]
+    lead = power.shape[:-1]
+    cumulative = np.zeros(lead + (nbins + 1,))
+    np.cumsum(power, axis=-1, out=cumulative[..., 1:])
+    total = cumulative[..., -1]
+    bins = np.arange(nbins)
+
+    # 直流频段
+    dc_power = cumulative[..., leak + 1]
+
+    # 基波
+    if fundamental_bin is None:
+        fund = np.argmax(power[..., leak + 1:], axis=-1) + leak + 1
+    else:
+        fund = np.broadcast_to(np.asarray(fundamental_bin), lead).astype(np.intp)
+    fund = fund[..., np.newaxis]
+    fund_power = _band_sum(cumulative, fund, leak)[..., 0]
+
+    # 谐波（按混叠后的频点），与直流或基波频段重叠的谐波不计入
+    orders = np.arange(2, harmonics + 1)
+    harmonic_bins = (fund * orders) % n
+    harmonic_bins = np.where(harmonic_bins > n // 2, n - harmonic_bins, harmonic_bins)
+    harmonic_power = _band_sum(cumulative, harmonic_bins, leak)
+    overlap = (harmonic_bins <= 2 * leak) | (np.abs(harmonic_bins - fund) <= 2 * leak)
+    harmonic_power = np.where(overlap, 0.0, harmonic_power)
+    harmonic_total = harmonic_power.sum(axis=-1)
+
+    noise_power = np.maximum(total - dc_power - fund_power - harmonic_total, _POWER_FLOOR)
+    excluded = (leak + 1) + (2 * leak + 1) * (1 + np.count_nonzero(~overlap, axis=-1))
+    noise_bins = np.maximum(nbins - excluded, 1)
+
+    # 最大杂散：去掉直流和基波频段后功率最大的频段；杂散频段宽 ±leak，
+    # 中心须与直流、基波相距 2*leak 以上（与谐波的重叠判定一致），否则会计入基波主瓣
+    masked = np.where((bins <= 2 * leak) | (np.abs(bins - fund) <= 2 * leak), 0.0, power)
+    spur = np.argmax(masked, axis=-1)[..., np.newaxis]
+    spur_power = np.maximum(_band_sum(cumulative, spur, leak)[..., 0], _POWER_FLOOR)
+
+    sinad = 10 * np.log10(fund_power / (noise_power + harmonic_total))
+    amplitude = np.sqrt(2 * fund_power)
+    enob = (sinad - 1.76) / 6.02
+
+    result = {
+        'fundamental_frequency': fund[..., 0] * fs / n,
+        'amplitude': amplitude,
+        'snr': 10 * np.log10(fund_power / noise_power),
+        'sinad': sinad,
+        'thd': 10 * np.log10(np.maximum(harmonic_total, _POWER_FLOOR) / fund_power),
+        'sfdr': 10 * np.log10(fund_power / spur_power),
+        'enob': enob,
+        'noise_floor': 10 * np.log10(noise_power / noise_bins),
+        'harmonic_levels': 10 * np.log10(np.maximum(harmonic_power, _POWER_FLOOR) / fund_power[..., np.newaxis])
+    }
+
+    if full_scale is not None:
+        amplitude_dbfs = 20 * np.log10(amplitude / full_scale)
+        result['amplitude_dbfs'] = amplitude_dbfs
+        # 输入幅度低于满量程时，将 ENOB 折算到满量程输入
+        result['enob'] = (sinad - 1.76 - amplitude_dbfs) / 6.02
+
+    return result
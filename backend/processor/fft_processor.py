@@ -1,9 +1,285 @@
+import functools
 import numpy as np
 
+try:
+    import scipy.fft as _scipy_fft
+except ImportError:  # scipy 为可选依赖，不可用时使用 numpy.fft
+    _scipy_fft = None
+
+
+def rfft(x, n=None, axis=-1, workers=None):
+    """实数FFT，scipy 可用时使用 scipy.fft（支持多线程），否则使用 numpy.fft
+
+    Args:
+        x: 输入数组
+        n: 变换长度，不足时补零
+        axis: 变换的轴
+        workers: scipy.fft 使用的线程数，-1 表示使用全部CPU核心
+    """
+    if _scipy_fft is not None:
+        return _scipy_fft.rfft(x, n=n, axis=axis, workers=workers)
+    return np.fft.rfft(x, n=n, axis=axis)
+
+
+def next_fast_len(n):
+    """不小于 n 的最快FFT长度（因子只含2、3、5）"""
+    if _scipy_fft is not None:
+        return _scipy_fft.next_fast_len(n, real=True)
+
+    best = 1 << max(n - 1, 0).bit_length()
+    p5 = 1
+    while p5 < best:
+        p35 = p5
+        while p35 < best:
+            # p35 * 2^k >= n 的最小值
+            quotient = -(-n // p35)
+            candidate = p35 * (1 << max(quotient - 1, 0).bit_length())
+            best = min(best, candidate)
+            p35 *= 3
+        p5 *= 5
+    return best
+
+
+@functools.lru_cache(maxsize=64)
+def get_window(name, n):
+    """获取长度为 n 的周期窗函数（只读数组，按 (name, n) 缓存）
+
+    Args:
+        name: 窗函数名称：hann、hamming、blackman、blackmanharris、rect
+        n: 窗长度
+    """
+    k = 2 * np.pi * np.arange(n) / n
+    if name == 'hann':
+        window = 0.5 - 0.5 * np.cos(k)
+    elif name == 'hamming':
+        window = 0.54 - 0.46 * np.cos(k)
+    elif name == 'blackman':
+        window = 0.42 - 0.5 * np.cos(k) + 0.08 * np.cos(2 * k)
+    elif name == 'blackmanharris':
+        window = 0.35875 - 0.48829 * np.cos(k) + 0.14128 * np.cos(2 * k) - 0.01168 * np.cos(3 * k)
+    elif name == 'rect':
+        window = np.ones(n)
+    else:
+        raise ValueError(f'Unsupported window: {name}')
+    window.flags.writeable = False
+    return window
+
+
+@functools.lru_cache(maxsize=64)
+def rfft_frequencies(n, fs):
+    """长度为 n 的实数FFT对应的频率轴（只读数组，按 (n, fs) 缓存）"""
+    freqs = np.fft.rfftfreq(n, 1.0 / fs)
+    freqs.flags.writeable = False
+    return freqs
+
+
 def compute_fft(signal, fs):
     # simple FFT wrapper returning freq and magnitude
     N = len(signal)
-    yf = np.fft.rfft(signal)
-    xf = np.fft.rfftfreq(N, 1.0/fs)
+    yf = rfft(signal)
+    xf = rfft_frequencies(N, fs)
     mag = np.abs(yf) / N
     return xf, mag
+
+
+def compute_fft_batch(signals, fs, out=None, window=None, workers=None):
+    """批量计算多通道信号的幅度谱
+
+    所有通道沿采样轴一次完成变换，结果与逐通道调用 compute_fft 相同。
+
+    Args:
+        signals: 形状为 (通道数, 采样点数) 的数组
+        fs: 采样率(Hz)
+        out: 可选的预分配输出数组，形状为 (通道数, 采样点数 // 2 + 1)，float64 类型，可重复使用
+        window: 可选的窗函数名称，见 get_window；加窗时幅度按窗函数的相干增益归一化
+        workers: scipy.fft 使用的线程数
+
+    Returns:
+        tuple: (频率轴, 幅度谱数组)
+    """
+    signals = np.asarray(signals)
+    if signals.ndim != 2:
+        raise ValueError(f'signals must be a 2-D (channels, samples) array, got shape {signals.shape}')
+
+    channels, n = signals.shape
+    shape = (channels, n // 2 + 1)
+    if out is None:
+        out = np.empty(shape)
+    elif out.shape != shape:
+        raise ValueError(f'Output array shape {out.shape} does not match {shape}')
+
+    if window is None:
+        spectra = rfft(signals, axis=-1, workers=workers)
+        norm = n
+    else:
+        w = get_window(window, n)
+        spectra = rfft(signals * w, axis=-1, workers=workers)
+        norm = np.sum(w)
+
+    np.abs(spectra, out=out)
+    out /= norm
+    return rfft_frequencies(n, fs), out
+
+
+def extract_peaks(magnitudes, frequencies, count=1, skip_dc=True):
+    """提取每个通道幅度最大的若干频点
+
+    Args:
+        magnitudes: 形状为 (通道数, 频点数) 的幅度谱
+        frequencies: 频率轴
+        count: 每个通道提取的峰值数
+        skip_dc: 是否忽略直流分量(第0个频点)
+
+    Returns:
+        dict: bins、frequencies、magnitudes，形状均为 (通道数, count)，每行按幅度从大到小排列
+    """
+    magnitudes = np.asarray(magnitudes)
+    if magnitudes.ndim == 1:
+        magnitudes = magnitudes[np.newaxis]
+
+    start = 1 if skip_dc else 0
+    search = magnitudes[:, start:]
+    count = min(count, search.shape[1])
+
+    if count == 1:
+        bins = np.argmax(search, axis=1)[:, np.newaxis]
+    else:
+        bins = np.argpartition(search, -count, axis=1)[:, -count:]
+        order = np.argsort(np.take_along_axis(search, bins, axis=1), axis=1)[:, ::-1]
+        bins = np.take_along_axis(bins, order, axis=1)
+    bins = bins + start
+
+    return {
+        'bins': bins,
+        'frequencies': np.asarray(frequencies)[bins],
+        'magnitudes': np.take_along_axis(magnitudes, bins, axis=1)
+    }
+
+
+class StreamingSpectrum:
+    """流式频谱估计器（Welch 方法）
+
+    数据按任意长度的块送入，凑满一个分段即加窗做FFT并累加功率谱，相邻分段按 overlap
+    重叠。内部只保留不足一个分段的尾部数据，持续监测数据流时每个采样点只参与有限次FFT，
+    不需要对不断增长的缓冲区重复做全长FFT。窗函数和频率轴按参数缓存，FFT长度补零到最快长度。
+    """
+
+    def __init__(self, fs, segment_length=4096, overlap=0.5, window='hann', nfft=None,
+                 scaling='density', average='mean', alpha=0.1, workers=None):
+        """初始化
+
+        Args:
+            fs: 采样率(Hz)
+            segment_length: 分段长度(采样点数)
+            overlap: 相邻分段的重叠比例，0 <= overlap < 1
+            window: 窗函数名称，见 get_window
+            nfft: FFT长度，默认为不小于分段长度的最快FFT长度
+            scaling: density 输出功率谱密度(单位²/Hz)，spectrum 输出功率谱(单位²)
+            average: mean 对全部分段取平均，exponential 按 alpha 做指数加权平均
+            alpha: 指数加权平均中新分段的权重
+            workers: scipy.fft 使用的线程数
+        """
+        if not 0 <= overlap < 1:
+            raise ValueError(f'Invalid overlap: {overlap}')
+        if scaling not in ('density', 'spectrum'):
+            raise ValueError(f'Invalid scaling: {scaling}')
+        if average not in ('mean', 'exponential'):
+            raise ValueError(f'Invalid average: {average}')
+
+        self.fs = fs
+        self.segment_length = segment_length
+        self.hop = max(1, int(round(segment_length * (1 - overlap))))
+        self.window = get_window(window, segment_length)
+        self.nfft = nfft or next_fast_len(segment_length)
+        if self.nfft < segment_length:
+            raise ValueError(f'nfft {self.nfft} is shorter than segment length {segment_length}')
+        self.frequencies = rfft_frequencies(self.nfft, fs)
+        self.average = average
+        self.alpha = alpha
+        self.workers = workers
+
+        # 单边谱：除直流和奈奎斯特频点外功率乘2
+        if scaling == 'density':
+            scale = 1.0 / (fs * np.sum(self.window ** 2))
+        else:
+            scale = 1.0 / np.sum(self.window) ** 2
+        self._scale = np.full(len(self.frequencies), 2 * scale)
+        self._scale[0] = scale
+        if self.nfft % 2 == 0:
+            self._scale[-1] = scale
+
+        self._buffer = np.empty(segment_length)
+        self.reset()
+
+    def reset(self):
+        """清空缓存数据和已累加的功率谱"""
+        self._filled = 0
+        self._power = np.zeros(len(self.frequencies))
+        self.segments = 0
+
+    def feed(self, chunk):
+        """送入一块采样数据
+
+        Args:
+            chunk: 一维采样数组
+
+        Returns:
+            int: 本次新处理的分段数
+        """
+        chunk = np.asarray(chunk, dtype=np.float64).reshape(-1)
+
+        if self._filled + len(chunk) < self.segment_length:
+            self._buffer[self._filled:self._filled + len(chunk)] = chunk
+            self._filled += len(chunk)
+            return 0
+
+        # 缓冲区中只有不足一个分段的残留数据，与新数据拼接后批量处理所有完整分段
+        data = np.concatenate((self._buffer[:self._filled], chunk)) if self._filled else chunk
+        return self._process(data)
+
+    def _process(self, data):
+        """处理 data 中的全部完整分段，剩余数据保存到缓冲区"""
+        count = (len(data) - self.segment_length) // self.hop + 1
+        segments = np.lib.stride_tricks.sliding_window_view(data, self.segment_length)[::self.hop][:count]
+        spectra = rfft(segments * self.window, n=self.nfft, axis=-1, workers=self.workers)
+        power = spectra.real ** 2 + spectra.imag ** 2
+
+        if self.average == 'mean':
+            self._power += power.sum(axis=0)
+            self.segments += count
+        else:
+            for row in power:
+                if self.segments == 0:
+                    self._power[:] = row
+                else:
+                    self._power += self.alpha * (row - self._power)
+                self.segments += 1
+
+        rest = data[count * self.hop:]
+        self._buffer[:len(rest)] = rest
+        self._filled = len(rest)
+        return count
+
+    def spectrum(self):
+        """当前的平均频谱
+
+        Returns:
+            tuple: (频率轴, 功率谱密度或功率谱)；尚未处理任何分段时功率为全0
+        """
+        if self.segments == 0:
+            return self.frequencies, np.zeros(len(self.frequencies))
+        power = self._power / self.segments if self.average == 'mean' else self._power.copy()
+        power *= self._scale
+        return self.frequencies, power
+
+
+def welch(signal, fs, segment_length=4096, overlap=0.5, window='hann', nfft=None, scaling='density', workers=None):
+    """一次性计算信号的 Welch 平均频谱
+
+    Returns:
+        tuple: (频率轴, 功率谱密度或功率谱)
+    """
+    engine = StreamingSpectrum(fs, segment_length=min(segment_length, len(signal)), overlap=overlap,
+                               window=window, nfft=nfft, scaling=scaling, workers=workers)
+    engine.feed(signal)
+    return engine.spectrum()
@@ -0,0 +1,194 @@
+import numpy as np
+
+
+class RunningStats:
+    """多列数据的累计统计：最小值、最大值、平均值和均方根值
+
+    每批数据按列一次性归约，统计量只保存累计和，更新代价与历史数据量无关。
+    """
+
+    def __init__(self, columns):
+        """初始化
+
+        Args:
+            columns: 列数
+        """
+        self.columns = columns
+        self.reset()
+
+    def reset(self):
+        """清空统计"""
+        self.count = 0
+        self.minimum = np.full(self.columns, np.inf)
+        self.maximum = np.full(self.columns, -np.inf)
+        self._sum = np.zeros(self.columns)
+        self._sum_sq = np.zeros(self.columns)
+
+    def update(self, values):
+        """累加一批数据
+
+        Args:
+            values: 形状为 (采样数, 列数) 的数组
+        """
+        if len(values) == 0:
+            return
+        self.count += len(values)
+        np.minimum(self.minimum, values.min(axis=0), out=self.minimum)
+        np.maximum(self.maximum, values.max(axis=0), out=self.maximum)
+        self._sum += values.sum(axis=0)
+        self._sum_sq += np.einsum('ij,ij->j', values, values)
+
+    @property
+    def mean(self):
+        """平均值"""
+        return self._sum / self.count if self.count else np.full(self.columns, np.nan)
+
+    @property
+    def rms(self):
+        """均方根值"""
+        return np.sqrt(self._sum_sq / self.count) if self.count else np.full(self.columns, np.nan)
+
+    def summary(self):
+        """统计结果字典"""
+        return {'min': self.minimum.copy(), 'max': self.maximum.copy(), 'mean': self.mean, 'rms': self.rms}
+
+
+class PowerCalculator:
+    """多路供电功率计算器
+
+    输入每路的电压和电流采样（可为一批多个采样点），按每路的校准系数修正后计算每路功率和总功率，
+    并累计每路电压、电流、功率及总功率的最小/最大/平均/均方根值和能量（对功率按时间梯形积分）。
+    全部计算对 (采样数, 路数) 数组向量化完成，没有按路或按采样点的 Python 循环。
+    """
+
+    def __init__(self, rails=16, sample_interval=None, voltage_gain=1.0, voltage_offset=0.0,
+                 current_gain=1.0, current_offset=0.0, rail_names=None):
+        """初始化
+
+        Args:
+            rails: 供电路数
+            sample_interval: 采样间隔(秒)，update() 未给出时间戳时用于能量积分
+            voltage_gain: 电压校准增益，标量或每路一个值，校准后电压 = 原始值 * gain + offset
+            voltage_offset: 电压校准偏移(V)，标量或每路一个值
+            current_gain: 电流校准增益，标量或每路一个值
+            current_offset: 电流校准偏移(A)，标量或每路一个值
+            rail_names: 每路名称列表，默认为 rail1 ~ railN
+        """
+        self.rails = rails
+        self.sample_interval = sample_interval
+        self.rail_names = list(rail_names) if rail_names else [f'rail{i + 1}' for i in range(rails)]
+        if len(self.rail_names) != rails:
+            raise ValueError(f'rail_names must have {rails} entries')
+        self.set_calibration(voltage_gain, voltage_offset, current_gain, current_offset)
+
+        self.voltage_stats = RunningStats(rails)
+        self.current_stats = RunningStats(rails)
+        self.power_stats = RunningStats(rails)
+        self.total_power_stats = RunningStats(1)
+        self.reset()
+
+    def set_calibration(self, voltage_gain=1.0, voltage_offset=0.0, current_gain=1.0, current_offset=0.0):
+        """设置每路的校准系数"""
+        self.voltage_gain = self._per_rail(voltage_gain, 'voltage_gain')
+        self.voltage_offset = self._per_rail(voltage_offset, 'voltage_offset')
+        self.current_gain = self._per_rail(current_gain, 'current_gain')
+        self.current_offset = self._per_rail(current_offset, 'current_offset')
+
+    def _per_rail(self, value, name):
+        """将标量或序列参数转换为每路一个值的数组"""
+        array = np.broadcast_to(np.asarray(value, dtype=np.float64), (self.rails,))
+        if array.shape != (self.rails,):
+            raise ValueError(f'{name} must be a scalar or have {self.rails} values')
+        return array.copy()
+
+    def reset(self):
+        """清空累计统计和能量"""
+        self.voltage_stats.reset()
+        self.current_stats.reset()
+        self.power_stats.reset()
+        self.total_power_stats.reset()
+        self.energy = np.zeros(self.rails)
+        self.duration = 0.0
+        self._last_time = None
+        self._last_power = None
+
+    def update(self, voltages, currents, timestamps=None):
+        """处理一批采样
+
+        Args:
+            voltages: 原始电压，形状为 (采样数, 路数) 或单个采样点的 (路数,)
+            currents: 原始电流，形状与 voltages 相同
+            timestamps: 每个采样点的时间戳(秒)，形状为 (采样数,)；未给出时按 sample_interval 等间隔
+
+        Returns:
+            dict: voltage、current、power 为校准后每路的数组 (采样数, 路数)，total_power 为 (采样数,)
+        """
+        voltages = np.asarray(voltages, dtype=np.float64)
+        currents = np.asarray(currents, dtype=np.float64)
+        if voltages.ndim == 1:
+            voltages = voltages[np.newaxis]
+            currents = currents[np.newaxis]
+        if voltages.shape != currents.shape or voltages.shape[1] != self.rails:
+            raise ValueError(f'Expected (samples, {self.rails}) arrays, got {voltages.shape} and {currents.shape}')
+
+        voltage = voltages * self.voltage_gain
+        voltage += self.voltage_offset
+        current = currents * self.current_gain
+        current += self.current_offset
+        power = voltage * current
+        total_power = power.sum(axis=1)
+
+        self.voltage_stats.update(voltage)
+        self.current_stats.update(current)
+        self.power_stats.update(power)
+        self.total_power_stats.update(total_power[:, np.newaxis])
+        self._integrate(power, timestamps)
+
+        return {'voltage': voltage, 'current': current, 'power': power, 'total_power': total_power}
+
+    def _integrate(self, power, timestamps):
+        """按梯形法对功率积分累计能量，与上一批的最后一个采样点相接"""
+        n = len(power)
+        if timestamps is None:
+            if self.sample_interval is None:
+                return
+            start = self._last_time + self.sample_interval if self._last_time is not None else 0.0
+            timestamps = start + self.sample_interval * np.arange(n)
+        else:
+            timestamps = np.asarray(timestamps, dtype=np.float64)
+            if timestamps.shape != (n,):
+                raise ValueError(f'Expected {n} timestamps, got shape {timestamps.shape}')
+
+        if self._last_time is not None:
+            times = np.concatenate(([self._last_time], timestamps))
+            powers = np.concatenate((self._last_power[np.newaxis], power))
+        else:
+            times, powers = timestamps, power
+
+        if len(times) > 1:
+            dt = np.diff(times)
+            self.energy += dt @ ((powers[1:] + powers[:-1]) * 0.5)
+            self.duration += times[-1] - times[0]
+
+        self._last_time = times[-1]
+        self._last_power = powers[-1].copy()
+
+    def get_stats(self):
+        """获取累计统计
+
+        Returns:
+            dict: voltage、current、power 为每路的 min/max/mean/rms 数组，total_power 为总功率的
+                  min/max/mean/rms，energy 为每路能量(J)，total_energy 为总能量(J)，duration 为积分时长(秒)
+        """
+        total = {key: float(value[0]) for key, value in self.total_power_stats.summary().items()}
+        return {
+            'rail_names': list(self.rail_names),
+            'samples': self.power_stats.count,
+            'voltage': self.voltage_stats.summary(),
+            'current': self.current_stats.summary(),
+            'power': self.power_stats.summary(),
+            'total_power': total,
+            'energy': self.energy.copy(),
+            'total_energy': float(self.energy.sum()),
+            'duration': self.duration
+        }
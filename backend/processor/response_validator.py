@@ -0,0 +1,138 @@
+from backend.communication.packet_parser import PacketParser
+
+
+class ExpectedResponse:
+    """一条期望响应（黄金响应）
+
+    比较时响应长度须与期望帧相同；mask 为 None 时整帧逐字节相等，否则只比较 mask 中置位的比特；
+    ranges 中的字段按整数取值检查范围，这些字段不参与逐字节比较。
+    """
+
+    __slots__ = ('description', 'data', 'mask', 'ranges', '_value', '_mask')
+
+    def __init__(self, description, data, mask=None, ranges=()):
+        """初始化
+
+        Args:
+            description: 描述
+            data: 期望的响应帧（bytes），不关心的字节可为任意值
+            mask: 与 data 等长的比较掩码（bytes），None 表示整帧比较
+            ranges: 取值范围检查列表，每项为 (偏移, 字节数, 最小值, 最大值, 字节序, 是否有符号)
+        """
+        self.description = description
+        self.data = bytes(data)
+        self.ranges = tuple(ranges)
+        if mask is not None and len(mask) != len(self.data):
+            raise ValueError(f'{description}: mask length {len(mask)} != frame length {len(self.data)}')
+
+        if self.ranges:
+            # 范围检查的字段不参与逐字节比较
+            mask = bytearray(mask if mask is not None else b'\xFF' * len(self.data))
+            for offset, size, _, _, _, _ in self.ranges:
+                if offset + size > len(self.data):
+                    raise ValueError(f'{description}: range field at {offset}+{size} exceeds frame length')
+                mask[offset:offset + size] = bytes(size)
+        self.mask = bytes(mask) if mask is not None else None
+
+        # 带掩码的比较用整数按位与一次完成，不逐字节循环
+        self._mask = int.from_bytes(self.mask, 'big') if self.mask is not None else None
+        self._value = int.from_bytes(self.data, 'big') & self._mask if self.mask is not None else None
+
+    def check(self, response):
+        """检查响应
+
+        Returns:
+            str: 不匹配的原因，匹配时为None
+        """
+        if len(response) != len(self.data):
+            return f'长度 {len(response)} 与期望 {len(self.data)} 不符'
+
+        if self._mask is None:
+            if response != self.data:
+                return '响应内容与期望不符'
+        elif int.from_bytes(response, 'big') & self._mask != self._value:
+            return '响应内容与期望不符'
+
+        for offset, size, minimum, maximum, byteorder, signed in self.ranges:
+            value = int.from_bytes(response[offset:offset + size], byteorder, signed=signed)
+            if not minimum <= value <= maximum:
+                return f'偏移 {offset} 处的字段值 {value} 超出范围 [{minimum}, {maximum}]'
+        return None
+
+
+class ResponseValidator:
+    """响应校验器：按帧ID和命令码索引期望响应，每条响应以一次字典查找和一次字节比较完成校验
+
+    期望帧的帧ID字节全部为"不关心"时，该期望响应只按命令码索引，匹配任意帧ID的响应；
+    查找时先按 (帧ID, 命令码) 精确匹配，再按命令码匹配，与期望响应的条数无关。
+    """
+
+    # 匹配键字段在帧中的位置，与 PacketParser.response_key 一致
+    FRAME_ID = slice(8, 12)
+    COMMAND_CODE = slice(14, 16)
+
+    def __init__(self, expected=()):
+        """初始化
+
+        Args:
+            expected: ExpectedResponse 列表
+        """
+        self._by_key = {}
+        self._by_code = {}
+        for entry in expected:
+            self.add(entry)
+
+    @classmethod
+    def from_frames(cls, frames):
+        """由 TestCommandManager.get_response_frames() 的响应帧列表创建
+
+        Args:
+            frames: 响应帧字典列表，包含description、data，可选mask和ranges
+        """
+        return cls(ExpectedResponse(frame['description'], frame['data'], frame.get('mask'), frame.get('ranges', ()))
+                   for frame in frames)
+
+    def add(self, entry):
+        """登记一条期望响应，同一匹配键的后登记者覆盖先登记者
+
+        Raises:
+            ValueError: 命令码字段不完整或含有不关心的比特，无法索引
+        """
+        mask = entry.mask
+        if len(entry.data) < self.COMMAND_CODE.stop or (mask is not None and mask[self.COMMAND_CODE] != b'\xFF\xFF'):
+            raise ValueError(f'{entry.description}: command code must be fully specified')
+
+        frame_id, command_code = PacketParser.response_key(entry.data)
+        if mask is not None and not any(mask[self.FRAME_ID]):
+            self._by_code[command_code] = entry
+        elif mask is None or mask[self.FRAME_ID] == b'\xFF' * 4:
+            self._by_key[frame_id, command_code] = entry
+        else:
+            raise ValueError(f'{entry.description}: frame ID must be fully specified or fully masked')
+
+    def __len__(self):
+        return len(self._by_key) + len(self._by_code)
+
+    def lookup(self, response):
+        """查找响应对应的期望响应，未登记时返回None"""
+        key = PacketParser.response_key(response)
+        entry = self._by_key.get(key)
+        if entry is None:
+            entry = self._by_code.get(key[1])
+        return entry
+
+    def validate(self, response):
+        """校验一条响应
+
+        Args:
+            response: 响应帧（bytes）
+
+        Returns:
+            dict: passed 为是否通过，expected 为匹配到的期望响应描述，error 为不通过的原因；
+                  没有对应的期望响应时返回None
+        """
+        entry = self.lookup(response)
+        if entry is None:
+            return None
+        error = entry.check(response)
+        return {'passed': error is None, 'expected': entry.description, 'error': error}
@@ -0,0 +1,203 @@
+import os
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from loguru import logger
+
+
+class SharedArray:
+    """共享内存中的 NumPy 数组
+
+    主进程创建并持有共享内存段，向工作进程只传递 handle（段名、形状、数据类型），
+    工作进程按 handle 映射同一段内存，不复制也不序列化数组数据。
+    """
+
+    def __init__(self, shape, dtype=np.float64, name=None):
+        """初始化
+
+        Args:
+            shape: 数组形状
+            dtype: 数据类型
+            name: 已存在的共享内存段名称，为None时新建共享内存段
+        """
+        self.shape = tuple(int(n) for n in np.atleast_1d(shape))
+        self.dtype = np.dtype(dtype)
+        size = max(1, int(np.prod(self.shape)) * self.dtype.itemsize)
+        self._owner = name is None
+        self._shm = shared_memory.SharedMemory(name=name, create=self._owner, size=size if self._owner else 0)
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=self._shm.buf)
+
+    @classmethod
+    def from_array(cls, array):
+        """创建共享数组并复制 array 的数据"""
+        array = np.asarray(array)
+        shared = cls(array.shape, array.dtype)
+        shared.array[...] = array
+        return shared
+
+    @property
+    def handle(self):
+        """可序列化的句柄：(段名, 形状, 数据类型)，结构化类型以字段描述传递"""
+        return self._shm.name, self.shape, self.dtype.descr if self.dtype.fields else self.dtype.str
+
+    def close(self):
+        """关闭映射；创建者同时删除共享内存段"""
+        self.array = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# 工作进程中已映射的共享内存段（段名 -> SharedMemory），重复使用的缓冲区不必每次重新映射
+_attached = OrderedDict()
+_ATTACH_CACHE_SIZE = 64
+
+
+def _attach(handle, cache):
+    """在工作进程中按句柄映射共享数组
+
+    Returns:
+        tuple: (数组, 不缓存时需要在任务结束后关闭的 SharedMemory，否则为None)
+    """
+    name, shape, dtype = handle
+    shm = _attached.get(name)
+    if shm is not None:
+        _attached.move_to_end(name)
+        return np.ndarray(shape, dtype=dtype, buffer=shm.buf), None
+
+    shm = shared_memory.SharedMemory(name=name)
+    array = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    if not cache:
+        return array, shm
+
+    _attached[name] = shm
+    while len(_attached) > _ATTACH_CACHE_SIZE:
+        _close(_attached.popitem(last=False)[1])
+    return array, None
+
+
+def _close(shm):
+    """关闭共享内存映射；仍有数组引用时交给垃圾回收"""
+    try:
+        shm.close()
+    except BufferError:
+        pass
+
+
+def _run_task(func, handles, kwargs):
+    """工作进程中执行分析函数：func(*输入数组, *输出数组, **kwargs)
+
+    Args:
+        handles: [(句柄, 是否缓存映射)]，调用方持有的缓冲区会被重复使用，映射保留在缓存中；
+                 临时缓冲区在任务结束后立即解除映射
+    """
+    arrays = []
+    temporary = []
+    for handle, cache in handles:
+        array, shm = _attach(handle, cache)
+        arrays.append(array)
+        if shm is not None:
+            temporary.append(shm)
+
+    try:
+        return func(*arrays, **kwargs)
+    finally:
+        del arrays
+        for shm in temporary:
+            _close(shm)
+
+
+class SharedMemoryPool:
+    """基于共享内存的进程池：大块采样数据通过共享内存在进程间传递
+
+    submit() 的输入数组若为普通 ndarray，会复制到临时共享内存段中，任务完成后自动释放；
+    传入 SharedArray 则直接传递句柄，不复制。分析结果中的大数组应由调用方预先分配 SharedArray
+    作为输出参数，工作进程直接写入，只有函数的返回值（标量、小字典等）经过序列化。
+    分析函数须为模块级函数，以便在工作进程中调用。
+    """
+
+    def __init__(self, max_workers=None):
+        """初始化
+
+        Args:
+            max_workers: 工作进程数，默认为CPU核心数
+        """
+        self.max_workers = max_workers or os.cpu_count()
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        logger.info(f'Shared memory process pool started with {self.max_workers} workers')
+
+    def allocate(self, shape, dtype=np.float64):
+        """分配一个共享数组，可作为输入缓冲区或输出参数重复使用（用完后调用 close()）"""
+        return SharedArray(shape, dtype)
+
+    def submit(self, func, *arrays, out=None, **kwargs):
+        """提交分析任务
+
+        Args:
+            func: 模块级分析函数，调用方式为 func(*arrays, *out, **kwargs)
+            arrays: 输入数组，ndarray 或 SharedArray
+            out: 输出数组，SharedArray 或其元组，工作进程直接写入
+            kwargs: 传给 func 的关键字参数
+
+        Returns:
+            Future: 结果为 func 的返回值
+        """
+        temporary = []
+        handles = []
+        for array in arrays:
+            if isinstance(array, SharedArray):
+                handles.append((array.handle, True))
+            else:
+                array = SharedArray.from_array(array)
+                temporary.append(array)
+                handles.append((array.handle, False))
+
+        if out is None:
+            out = ()
+        elif isinstance(out, SharedArray):
+            out = (out,)
+        handles.extend((array.handle, True) for array in out)
+
+        try:
+            inner = self._executor.submit(_run_task, func, handles, kwargs)
+        except Exception:
+            for array in temporary:
+                array.close()
+            raise
+
+        if not temporary:
+            return inner
+
+        # 任务结束后释放临时共享内存段
+        future = Future()
+
+        def done(f):
+            for array in temporary:
+                array.close()
+            if f.cancelled():
+                future.set_exception(CancelledError())
+            elif f.exception() is not None:
+                future.set_exception(f.exception())
+            else:
+                future.set_result(f.result())
+
+        future.set_running_or_notify_cancel()
+        inner.add_done_callback(done)
+        return future
+
+    def map(self, func, blocks, **kwargs):
+        """对多个数据块并行执行同一分析函数，按顺序返回结果列表"""
+        futures = [self.submit(func, block, **kwargs) for block in blocks]
+        return [future.result() for future in futures]
+
+    def shutdown(self, wait=True):
+        """关闭进程池"""
+        self._executor.shutdown(wait=wait)
+        logger.info('Shared memory process pool stopped')
@@ -2,5 +2,6 @@ from .test_command_manager import TestCommandManager
 from .test_manager import TestManager
 from .command_sender import CommandSender
 from .data_processor import DataProcessor
+from .multi_site_manager import MultiSiteManager
 
-__all__ = ['TestCommandManager', 'TestManager', 'CommandSender', 'DataProcessor']
+__all__ = ['TestCommandManager', 'TestManager', 'CommandSender', 'DataProcessor', 'MultiSiteManager']
@@ -0,0 +1,232 @@
+import queue
+import threading
+import time
+from collections import deque
+from backend.logger.logger import logger
+from backend.tasks.test_step_base import TestStep
+
+
+class AutoTestRunner:
+    """测试步骤调度器：按步骤声明的依赖关系（有向无环图）执行测试步骤
+
+    依赖全部通过的步骤进入就绪队列，按声明顺序启动，同时运行的步骤数不超过 max_workers，
+    互不依赖的步骤（如遥测检查、ADC采集分析、功率读取）并行执行。每个步骤在独立线程中运行，
+    调度线程阻塞等待步骤完成的通知或最近的超时时刻，不轮询。
+    步骤失败或超时后，直接或间接依赖它的步骤记为跳过；超时的步骤被取消（见 TestStep.cancel），不再阻塞调度，
+    但 run() 返回前会等待其线程结束，返回后不会再有步骤访问调用方随即清理的资源。
+    失败即停模式下第一个步骤失败后，除必需步骤外未开始的步骤全部跳过；
+    给出 priority 时就绪的步骤按优先级从高到低启动（见 TestHistory），否则按声明顺序。
+    """
+
+    def __init__(self, steps, max_workers=4, on_step_started=None, on_step_finished=None,
+                 fail_fast=False, mandatory=(), priority=None):
+        """初始化
+
+        Args:
+            steps: TestStep 列表
+            max_workers: 同时运行的最大步骤数
+            on_step_started: 步骤开始回调，参数为步骤
+            on_step_finished: 步骤结束回调，参数为步骤和结果字典
+            fail_fast: 是否失败即停
+            mandatory: 必需步骤名列表，失败即停时仍然执行（其依赖步骤须通过）
+            priority: 由步骤名取优先级的函数，None 表示按声明顺序启动
+
+        Raises:
+            ValueError: 步骤名重复、依赖的步骤不存在或依赖关系有环
+        """
+        self.steps = {}
+        for step in steps:
+            if step.name in self.steps:
+                raise ValueError(f'Duplicate test step: {step.name}')
+            self.steps[step.name] = step
+        self.max_workers = max(1, int(max_workers))
+        self.on_step_started = on_step_started
+        self.on_step_finished = on_step_finished
+        self.fail_fast = fail_fast
+        self.mandatory = set(mandatory)
+        self.priority = priority
+
+        # 步骤名 -> 直接依赖它的步骤名
+        self._dependents = {name: [] for name in self.steps}
+        for step in self.steps.values():
+            for dependency in step.depends_on:
+                if dependency not in self.steps:
+                    raise ValueError(f'{step.name}: unknown dependency {dependency}')
+                self._dependents[dependency].append(step.name)
+        self.order = self._topological_order()
+
+        self.results = {}
+        self._failed = False
+        self._done = queue.Queue()
+        self._stopped = threading.Event()
+        self._threads = {}  # 步骤名 -> 步骤线程
+
+    def _topological_order(self):
+        """按依赖关系排序（同层保持声明顺序），有环时抛出 ValueError"""
+        remaining = {name: len(step.depends_on) for name, step in self.steps.items()}
+        ready = deque(name for name, count in remaining.items() if count == 0)
+        order = []
+        while ready:
+            name = ready.popleft()
+            order.append(name)
+            for dependent in self._dependents[name]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+        if len(order) != len(self.steps):
+            cycle = sorted(name for name in self.steps if name not in order)
+            raise ValueError(f'Dependency cycle among test steps: {", ".join(cycle)}')
+        return order
+
+    def run(self, context=None):
+        """执行全部步骤，所有步骤结束（通过、失败、超时或跳过）后返回
+
+        Args:
+            context: 步骤共享的上下文字典，其中 results 项为已结束步骤的结果
+
+        Returns:
+            dict: 步骤名 -> 结果字典（name、status、result、error、start_time、end_time、duration），按拓扑顺序
+        """
+        context = {} if context is None else context
+        self.results = {name: self._result(name, TestStep.STATUS_PENDING) for name in self.order}
+        context['results'] = self.results
+        self._failed = False
+        self._threads = {}
+
+        remaining = {name: len(step.depends_on) for name, step in self.steps.items()}
+        ready = deque(name for name in self.order if remaining[name] == 0)
+        running = {}  # 步骤名 -> 超时时刻（None 为不限）
+
+        while ready or running:
+            while ready and len(running) < self.max_workers and not self._stopped.is_set():
+                name = self._next_ready(ready)
+                running[name] = self._start(name, context)
+            if self._stopped.is_set():
+                for name in ready:
+                    self._skip(name, '测试已停止')
+                ready.clear()
+                if not running:
+                    break
+
+            deadlines = [deadline for deadline in running.values() if deadline is not None]
+            timeout = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            try:
+                message = self._done.get(timeout=timeout)
+            except queue.Empty:
+                message = None
+
+            if message is not None and message[0] in running:
+                name, result = message
+                del running[name]
+                self._finish(name, result, remaining, ready)
+
+            now = time.monotonic()
+            for name, deadline in list(running.items()):
+                if deadline is not None and now >= deadline:
+                    del running[name]
+                    step = self.steps[name]
+                    self._cancel(name)
+                    result = dict(self.results[name], status=TestStep.STATUS_TIMEOUT,
+                                  error=f'超过 {step.timeout} 秒未完成', end_time=time.time(),
+                                  duration=step.timeout)
+                    self._finish(name, result, remaining, ready)
+
+        # 等待超时被取消的步骤线程结束
+        for name, thread in self._threads.items():
+            if thread.is_alive():
+                logger.info(f"等待已取消的测试步骤结束：{name}")
+                thread.join()
+        return self.results
+
+    def _next_ready(self, ready):
+        """取出下一个要启动的就绪步骤"""
+        if self.priority is None:
+            return ready.popleft()
+        name = max(ready, key=self.priority)
+        ready.remove(name)
+        return name
+
+    def stop(self):
+        """停止调度：未开始的步骤记为跳过，正在运行的步骤被取消，run() 在它们结束后返回"""
+        self._stopped.set()
+        for name, result in list(self.results.items()):
+            if result['status'] == TestStep.STATUS_RUNNING:
+                self._cancel(name)
+        self._done.put(None)
+
+    def _cancel(self, name):
+        """取消正在运行的步骤"""
+        try:
+            self.steps[name].cancel()
+        except Exception as e:
+            logger.error(f"取消测试步骤失败：{name}（{e}）")
+
+    def _start(self, name, context):
+        """在独立线程中启动步骤，返回超时时刻"""
+        step = self.steps[name]
+        step.cancelled.clear()
+        self.results[name] = dict(self.results[name], status=TestStep.STATUS_RUNNING, start_time=time.time())
+        logger.info(f"测试步骤开始：{name}")
+        if self.on_step_started:
+            self.on_step_started(step)
+
+        def target():
+            result = step.execute(context)
+            self._done.put((name, result))
+
+        thread = threading.Thread(target=target, name=f'step-{name}', daemon=True)
+        self._threads[name] = thread
+        thread.start()
+        return time.monotonic() + step.timeout if step.timeout is not None else None
+
+    def _finish(self, name, result, remaining, ready):
+        """记录步骤结果，释放依赖它的步骤；未通过时依赖它的步骤全部跳过"""
+        self.results[name] = result
+        if result['status'] == TestStep.STATUS_PASSED:
+            logger.info(f"测试步骤通过：{name}（{result['duration']:.3f} 秒）")
+        else:
+            logger.error(f"测试步骤{'超时' if result['status'] == TestStep.STATUS_TIMEOUT else '失败'}："
+                         f"{name}（{result['error']}）")
+        if self.on_step_finished:
+            self.on_step_finished(self.steps[name], result)
+
+        if result['status'] != TestStep.STATUS_PASSED and self.fail_fast and not self._failed:
+            self._failed = True
+            self._fail_fast(name, ready)
+
+        for dependent in self._dependents[name]:
+            if result['status'] != TestStep.STATUS_PASSED:
+                self._skip(dependent, f'依赖步骤 {name} 未通过')
+                continue
+            remaining[dependent] -= 1
+            if remaining[dependent] == 0 and self.results[dependent]['status'] == TestStep.STATUS_PENDING:
+                ready.append(dependent)
+
+    def _fail_fast(self, failed, ready):
+        """失败即停：跳过除必需步骤以外未开始的步骤，正在运行的非必需步骤被取消"""
+        reason = f'步骤 {failed} 未通过，失败即停'
+        for name in [name for name in ready if name not in self.mandatory]:
+            ready.remove(name)
+        for name, result in list(self.results.items()):
+            if name in self.mandatory:
+                continue
+            if result['status'] == TestStep.STATUS_PENDING:
+                self._skip(name, reason)
+            elif result['status'] == TestStep.STATUS_RUNNING:
+                self._cancel(name)
+
+    def _skip(self, name, reason):
+        """将未开始的步骤及其全部下游步骤记为跳过"""
+        if self.results[name]['status'] != TestStep.STATUS_PENDING:
+            return
+        self.results[name] = self._result(name, TestStep.STATUS_SKIPPED, reason)
+        logger.info(f"测试步骤跳过：{name}（{reason}）")
+        if self.on_step_finished:
+            self.on_step_finished(self.steps[name], self.results[name])
+        for dependent in self._dependents[name]:
+            self._skip(dependent, f'依赖步骤 {name} 未通过')
+
+    @staticmethod
+    def _result(name, status, error=None):
+        return {'name': name, 'status': status, 'result': None, 'error': error,
+                'start_time': None, 'end_time': None, 'duration': None}
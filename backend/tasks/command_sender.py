@@ -1,95 +1,212 @@
 from backend.logger.logger import logger
+from backend.communication.link_arbiter import LinkArbiter
+from backend.tasks.pipeline_queue import PipelineQueue, QueueClosed, command_key
 import threading
 import time
-from queue import Queue
+from collections import deque
+from queue import Empty
 
 class CommandSender:
-    """指令发送器，负责按顺序发送指令并等待响应"""
-    
-    def __init__(self, communication_interface):
-        self.comm_interface = communication_interface
-        self.command_queue = Queue()
-        self.response_queue = Queue()
+    """指令发送器，负责发送指令并等待响应
+
+    window_size 为 1 时为停等模式：上一条指令收到响应（或超时）后才发送下一条；
+    window_size 大于 1 时为流水线模式：最多同时有 window_size 条指令在途，
+    响应由链路仲裁器按帧ID和命令码匹配到在途指令，完成结果仍按发送顺序上报。
+    发送线程阻塞在条件变量上，由新指令入队、响应Future完成和停止请求唤醒，不做定时轮询。
+    """
+
+    def __init__(self, link_arbiter, window_size=1, response_timeout=2.0,
+                 command_interval=0.5, on_command_failed=None, queues=None, skip_command=None):
+        """初始化
+
+        Args:
+            link_arbiter: 链路仲裁器，负责发送指令和分发响应
+            window_size: 同时在途（已发送未响应）的最大指令数
+            response_timeout: 单条指令的响应超时时间(秒)
+            command_interval: 停等模式下相邻指令的发送间隔(秒)，流水线模式下不生效
+            on_command_failed: 指令失败（超时或发送失败）回调函数，参数为指令字典
+            queues: 队列配置，command 为指令队列、response 为响应队列，
+                    每项包含 capacity(容量，0为不限)和 policy(队列满时的处理策略)
+            skip_command: 指令跳过判定函数，参数为指令字典，在指令出队发送前调用，
+                          返回 True 的指令不发送（失败即停时跳过已入队的非必需指令）
+        """
+        self.link_arbiter = link_arbiter
+        self.window_size = max(1, int(window_size))
+        self.response_timeout = response_timeout
+        self.command_interval = command_interval
+        self.on_command_failed = on_command_failed
+        self.skip_command = skip_command
+        queues = queues or {}
+        self.command_queue = PipelineQueue.from_config(queues.get('command'), key=command_key)
+        self.response_queue = PipelineQueue.from_config(queues.get('response'), key=command_key)
         self.running = False
         self.thread = None
         self.current_command = None
-        
+
+        # 在途指令 (指令, 响应Future)，按发送顺序排列
+        self._outstanding = deque()
+        self._last_send_time = 0.0
+        # 发送线程的唤醒条件：新指令入队、在途指令完成、停止
+        self._wakeup = threading.Condition()
+
     def start(self):
         """启动指令发送线程"""
         if not self.running:
             self.running = True
             self.thread = threading.Thread(target=self._run, daemon=True)
             self.thread.start()
-            logger.info("指令发送线程已启动")
-    
-    def stop(self):
-        """停止指令发送线程"""
+            logger.info(f"指令发送线程已启动（窗口大小：{self.window_size}）")
+
+    def close(self):
+        """关闭指令队列并唤醒发送线程和 wait_idle() 的等待方，不等待线程退出（可在任意线程调用）"""
         self.running = False
+        self.command_queue.close()
+        with self._wakeup:
+            self._wakeup.notify_all()
+
+    def stop(self):
+        """停止指令发送线程，并关闭响应队列（响应处理线程取完剩余响应后退出）
+
+        响应队列先于等待线程退出关闭，发送线程阻塞在已满的响应队列上时也能立即退出
+        """
+        self.close()
+        self.response_queue.close()
         if self.thread:
             self.thread.join()
+            self.thread = None
             logger.info("指令发送线程已停止")
-    
+
     def send_command(self, command):
         """发送指令（线程安全）
-        
+
         Args:
             command: 指令字典，包含description、data等字段
+
+        Raises:
+            QueueClosed: 发送器已停止
         """
         self.command_queue.put(command)
+        self._notify()
         logger.info(f"指令已加入队列：{command['description']}")
-    
+
+    def wait_idle(self):
+        """等待队列中所有指令完成（收到响应或失败），发送线程停止时立即返回"""
+        self.command_queue.wait_drained()
+
+    def _notify(self, *args):
+        """唤醒发送线程（也作为响应Future的完成回调）"""
+        with self._wakeup:
+            self._wakeup.notify()
+
+    def _ready(self):
+        """发送线程是否有事可做：最早的在途指令已完成，或窗口未满且有待发送的指令"""
+        if self._outstanding and self._outstanding[0][1].done():
+            return True
+        return len(self._outstanding) < self.window_size and self.command_queue.qsize() > 0
+
     def _run(self):
         """指令发送线程主循环"""
         while self.running:
             try:
-                # 从队列获取指令
-                command = self.command_queue.get(timeout=0.1)
-                
-                # 记录当前发送的指令
-                self.current_command = command
-                command['status'] = 'sending'
-                
-                logger.info(f"开始发送指令：{command['description']}")
-                
-                # 发送指令
-                self.comm_interface.send(command['data'])
-                
-                command['status'] = 'sent'
-                command['send_time'] = time.time()
-                
-                # 等待响应（可以设置超时）
-                response = self.comm_interface.receive(timeout=2.0)
-                
-                if response:
-                    command['status'] = 'success'
-                    command['response_time'] = time.time()
-                    command['response_data'] = response
-                    logger.info(f"指令发送成功并收到响应：{command['description']}")
-                    
-                    # 将响应放入队列供处理线程使用
+                self._fill_window()
+
+                # 完成结果按发送顺序上报
+                self._report_completed()
+
+                with self._wakeup:
+                    while self.running and not self._ready():
+                        self._wakeup.wait()
+
+            except Exception as e:
+                logger.error(f"指令发送线程错误：{str(e)}")
+                with self._wakeup:
+                    self._wakeup.wait_for(lambda: not self.running, 0.1)
+
+    def _fill_window(self):
+        """在窗口未满时从队列取出已就绪的指令并发送"""
+        while len(self._outstanding) < self.window_size and self.running:
+            try:
+                command = self.command_queue.get_nowait()
+            except (Empty, QueueClosed):
+                return
+
+            if self.skip_command and self.skip_command(command):
+                self.command_queue.task_done()
+                continue
+
+            # 停等模式保持指令间隔，停止时立即返回
+            if self.window_size == 1 and self.command_interval > 0:
+                delay = self._last_send_time + self.command_interval - time.monotonic()
+                if delay > 0:
+                    with self._wakeup:
+                        if self._wakeup.wait_for(lambda: not self.running, delay):
+                            return
+
+            self._send(command)
+
+    def _send(self, command):
+        """发送单条指令并登记为在途指令"""
+        # 记录当前发送的指令
+        self.current_command = command
+        command['status'] = 'sending'
+
+        logger.info(f"开始发送指令：{command['description']}")
+
+        future = self.link_arbiter.request(
+            command['data'],
+            LinkArbiter.response_key(command['data']),
+            timeout=self.response_timeout
+        )
+        self._outstanding.append((command, future))
+        self._last_send_time = time.monotonic()
+        future.add_done_callback(self._notify)
+
+        if not future.done():
+            command['status'] = 'sent'
+            command['send_time'] = time.time()
+
+    def _report_completed(self):
+        """按发送顺序上报已完成的指令"""
+        while self._outstanding and self._outstanding[0][1].done():
+            command, future = self._outstanding.popleft()
+            error = future.exception()
+
+            if error is None:
+                response = future.result()['raw']
+                command['status'] = 'success'
+                command['response_time'] = time.time()
+                command['response_data'] = response
+                logger.info(f"指令发送成功并收到响应：{command['description']}")
+
+                # 将响应放入队列供处理线程使用，队列已满时按队列策略阻塞或丢弃
+                try:
                     self.response_queue.put({
                         'command': command,
                         'response': response
                     })
-                else:
-                    command['status'] = 'failed'
-                    command['error'] = '未收到响应'
-                    logger.warning(f"指令发送后未收到响应：{command['description']}")
-                
-                # 任务完成
-                self.command_queue.task_done()
-                
-                # 指令间隔
-                time.sleep(0.5)
-                
-            except Exception as e:
-                logger.error(f"指令发送线程错误：{str(e)}")
-                time.sleep(0.1)
-    
+                except QueueClosed:
+                    logger.warning(f"发送器已停止，丢弃响应：{command['description']}")
+            else:
+                command['status'] = 'failed'
+                command['error'] = '未收到响应' if isinstance(error, TimeoutError) else f'发送失败：{error}'
+                logger.warning(f"指令执行失败：{command['description']}（{command['error']}）")
+                if self.on_command_failed:
+                    self.on_command_failed(command)
+
+            # 任务完成
+            self.command_queue.task_done()
+
+    def get_queue_stats(self):
+        """获取指令队列和响应队列的统计（深度、最高水位、丢弃数等）"""
+        return {
+            'command': self.command_queue.get_stats(),
+            'response': self.response_queue.get_stats()
+        }
+
     def get_current_command(self):
         """获取当前正在处理的指令"""
         return self.current_command
-    
+
     def get_response_queue(self):
         """获取响应队列"""
         return self.response_queue
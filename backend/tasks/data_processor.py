@@ -1,18 +1,52 @@
 from backend.logger.logger import logger
+from backend.communication.response_frame import ResponseFrame
+from backend.processor.shm_pool import SharedMemoryPool, SharedArray
+from backend.tasks.pipeline_queue import PipelineQueue, QueueClosed, command_key
 import threading
-from queue import Queue
 import time
 from concurrent.futures import ThreadPoolExecutor
 
 class DataProcessor:
-    """数据处理器，负责处理接收到的响应数据"""
+    """数据处理器，负责处理接收到的响应数据
+
+    处理线程只在线程池有空闲线程时才从数据队列取数据，线程池内部不积压任务，
+    处理慢时数据积压在有界的数据队列中，由队列的容量和溢出策略限制内存占用。
+    """
+    
+    BACKEND_THREAD = 'thread'
+    BACKEND_PROCESS = 'process'
     
-    def __init__(self):
-        self.data_queue = Queue()
-        self.result_queue = Queue()
+    def __init__(self, backend=BACKEND_THREAD, max_workers=4, queues=None, validator=None):
+        """初始化
+        
+        Args:
+            backend: 采样数据分析任务（submit_analysis）的执行方式，thread 为线程池，
+                     process 为共享内存进程池（CPU密集的分析可利用全部CPU核心）
+            max_workers: 线程池线程数；process 模式下进程池的进程数为None时使用全部CPU核心
+            queues: 队列配置，data 为数据队列、result 为结果队列，
+                    每项包含 capacity(容量，0为不限)和 policy(队列满时的处理策略)
+            validator: 响应校验器（ResponseValidator），为None时不与期望响应比较
+        """
+        if backend not in (self.BACKEND_THREAD, self.BACKEND_PROCESS):
+            raise ValueError(f"不支持的数据处理方式：{backend}")
+        
+        queues = queues or {}
+        self.data_queue = PipelineQueue.from_config(queues.get('data'), key=command_key)
+        self.result_queue = PipelineQueue.from_config(queues.get('result'), key=command_key)
         self.running = False
-        self.executor = ThreadPoolExecutor(max_workers=4)
+        self.max_workers = max_workers or 4
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        # 线程池中正在处理的数据条数，达到线程数时处理线程不再从数据队列取数据
+        self._busy = 0
+        self._idle = threading.Condition()
         self.thread = None
+        self.backend = backend
+        self.validator = validator
+        # process 模式的进程池在第一次提交分析任务时才启动，不做采样分析的测试不启动工作进程
+        self.process_pool = None
+        self._process_workers = max_workers
+        self._pool_lock = threading.Lock()
+        self._pool_closed = False
         
     def start(self):
         """启动数据处理线程"""
@@ -22,12 +56,30 @@ class DataProcessor:
             self.thread.start()
             logger.info("数据处理线程已启动")
     
-    def stop(self):
-        """停止数据处理线程"""
+    def close(self):
+        """关闭数据队列，处理线程取完剩余数据后退出，不等待线程退出（可在任意线程调用）"""
         self.running = False
+        self.data_queue.close()
+        with self._idle:
+            self._idle.notify_all()
+    
+    def stop(self):
+        """停止数据处理线程并关闭结果队列
+        
+        结果队列先于线程池关闭，线程池中阻塞在已满的结果队列上的任务可立即结束，
+        停止后才处理完成的结果被丢弃，已在结果队列中的结果仍可被取走
+        """
+        self.close()
         if self.thread:
             self.thread.join()
+            self.thread = None
+        self.result_queue.close()
         self.executor.shutdown()
+        with self._pool_lock:
+            self._pool_closed = True
+            if self.process_pool:
+                self.process_pool.shutdown()
+                self.process_pool = None
         logger.info("数据处理线程已停止")
     
     def add_data(self, data):
@@ -35,86 +87,152 @@ class DataProcessor:
         
         Args:
             data: 待处理的数据，包含command和response字段
+            
+        Raises:
+            QueueClosed: 数据处理器已停止
         """
         self.data_queue.put(data)
         logger.info(f"数据已加入处理队列：{data['command']['description']}")
     
+    def submit_analysis(self, func, *arrays, out=None, **kwargs):
+        """提交采样数据分析任务（FFT、ADC指标、线性度等CPU密集的计算）
+        
+        process 模式下大块数据通过共享内存传给工作进程，只传递句柄，不序列化数组；
+        thread 模式下在线程池中直接调用。
+        
+        Args:
+            func: 模块级分析函数，调用方式为 func(*arrays, *out, **kwargs)
+            arrays: 输入数组，ndarray 或 SharedArray
+            out: 输出数组（SharedArray 或其元组），由 func 直接写入
+            kwargs: 传给 func 的关键字参数
+            
+        Returns:
+            Future: 结果为 func 的返回值
+            
+        Raises:
+            RuntimeError: 数据处理器已停止
+        """
+        if self.backend == self.BACKEND_PROCESS:
+            return self._get_process_pool().submit(func, *arrays, out=out, **kwargs)
+        
+        if out is None:
+            out = ()
+        elif isinstance(out, SharedArray):
+            out = (out,)
+        args = [a.array if isinstance(a, SharedArray) else a for a in arrays + tuple(out)]
+        return self.executor.submit(func, *args, **kwargs)
+    
+    def _get_process_pool(self):
+        """获取进程池，第一次调用时启动"""
+        with self._pool_lock:
+            if self._pool_closed:
+                raise RuntimeError('数据处理器已停止')
+            if self.process_pool is None:
+                self.process_pool = SharedMemoryPool(self._process_workers)
+            return self.process_pool
+    
     def _run(self):
-        """数据处理线程主循环"""
-        while self.running:
+        """数据处理线程主循环，等待线程池有空闲线程后再阻塞等待数据，队列关闭且取空后退出
+        
+        停止时不再等待空闲线程，队列中剩余的数据（数量受队列容量限制）直接提交
+        """
+        while True:
+            with self._idle:
+                self._idle.wait_for(lambda: self._busy < self.max_workers or not self.running)
+                self._busy += 1
+            
             try:
-                # 从队列获取数据
-                data = self.data_queue.get(timeout=0.1)
-                
-                # 提交到线程池处理
+                data = self.data_queue.get()
+            except QueueClosed:
+                self._release_worker()
+                break
+            
+            try:
+                # 提交到线程池处理，处理完成后标记任务完成
                 self.executor.submit(self._process_data, data)
-                
-                # 任务完成
-                self.data_queue.task_done()
-                
             except Exception as e:
                 logger.error(f"数据处理线程错误：{str(e)}")
-                time.sleep(0.1)
+                self._release_worker()
+                self.data_queue.task_done()
+    
+    def _release_worker(self):
+        """归还一个线程池名额，唤醒等待空闲线程的处理线程"""
+        with self._idle:
+            self._busy -= 1
+            self._idle.notify()
     
     def _process_data(self, data):
-        """处理数据的实际逻辑
+        """线程池中处理数据，结果放入结果队列
         
         Args:
             data: 待处理的数据，包含command和response字段
         """
         try:
-            command = data['command']
-            response = data['response']
-            
-            logger.info(f"开始处理数据：{command['description']}")
-            
-            # 解析响应数据
-            parsed_data = self._parse_response(response)
-            
-            # 处理数据（这里可以根据实际需求扩展）
-            result = self._process_parsed_data(parsed_data, command)
-            
-            # 将处理结果放入结果队列
-            self.result_queue.put({
-                'command': command,
-                'response': response,
-                'parsed_data': parsed_data,
-                'result': result,
-                'process_time': time.time()
-            })
-            
-            logger.info(f"数据处理完成：{command['description']}")
+            # 将处理结果放入结果队列，队列已满时按队列策略阻塞或丢弃
+            self.result_queue.put(self.process(data))
             
+        except QueueClosed:
+            logger.warning(f"数据处理器已停止，丢弃处理结果：{data['command']['description']}")
         except Exception as e:
             logger.error(f"处理数据失败：{str(e)}")
+        finally:
+            # 任务完成
+            self._release_worker()
+            self.data_queue.task_done()
+    
+    def process(self, data):
+        """同步处理一条数据（线程池和抓包回放共用的处理逻辑）
+        
+        Args:
+            data: 待处理的数据，包含command和response字段
+            
+        Returns:
+            dict: 处理结果，包含command、response、parsed_data、result、process_time字段
+        """
+        command = data['command']
+        response = data['response']
+        
+        logger.info(f"开始处理数据：{command['description']}")
+        
+        # 解析响应数据
+        parsed_data = self._parse_response(response)
+        
+        # 处理数据（这里可以根据实际需求扩展）
+        result = self._process_parsed_data(parsed_data, command)
+        
+        # 与期望响应比较
+        if self.validator is not None and parsed_data is not None:
+            validation = self.validator.validate(response)
+            result['validation'] = validation
+            if validation is not None and not validation['passed']:
+                result['status'] = 'mismatch'
+                logger.warning(f"响应与期望不符：{command['description']}（{validation['error']}）")
+        
+        logger.info(f"数据处理完成：{command['description']}")
+        
+        return {
+            'command': command,
+            'response': response,
+            'parsed_data': parsed_data,
+            'result': result,
+            'process_time': time.time()
+        }
     
     def _parse_response(self, response):
         """解析响应数据
         
+        帧头字段由预编译的 struct 一次解出为整数，数据部分以 memoryview 引用原始帧，
+        十六进制字符串只在显示或导出时通过 ResponseFrame.to_dict() 生成。
+        
         Args:
             response: 原始响应数据（bytes）
             
         Returns:
-            dict: 解析后的数据
+            ResponseFrame: 解析后的响应帧；帧长度不足或帧头错误时返回None
         """
-        parsed = {}
-        
-        # 解析帧头
-        if len(response) >= 4:
-            parsed['header'] = response[:4].hex()
-            
-        # 解析帧长度
-        if len(response) >= 8:
-            parsed['length'] = int.from_bytes(response[6:8], byteorder='big')
-            
-        # 解析帧ID
-        if len(response) >= 12:
-            parsed['frame_id'] = response[8:12].hex()
-            
-        # 解析数据部分
-        if len(response) >= 12:
-            parsed['data'] = response[12:].hex()
-            
+        parsed = ResponseFrame.decode(response)
+        if parsed is None:
+            logger.warning(f"无法解析的响应帧，长度 {len(response)}")
         return parsed
     
     def _process_parsed_data(self, parsed_data, command):
@@ -128,7 +246,7 @@ class DataProcessor:
             dict: 处理结果
         """
         result = {
-            'status': 'success',
+            'status': 'success' if parsed_data is not None else 'invalid',
             'command_id': command.get('command_id', 'unknown'),
             'data': parsed_data
         }
@@ -137,6 +255,13 @@ class DataProcessor:
         
         return result
     
+    def get_queue_stats(self):
+        """获取数据队列和结果队列的统计（深度、最高水位、丢弃数等）"""
+        return {
+            'data': self.data_queue.get_stats(),
+            'result': self.result_queue.get_stats()
+        }
+    
     def get_result_queue(self):
         """获取处理结果队列"""
         return self.result_queue
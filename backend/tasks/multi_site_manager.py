@@ -0,0 +1,126 @@
+from backend.logger.logger import logger
+from backend.config.config_loader import config_loader
+from backend.tasks.test_manager import TestManager
+import threading
+import time
+
+class MultiSiteManager:
+    """多工位测试管理器，为每个工位创建独立的测试流水线并发执行
+
+    每个工位对应一个独立的 TestManager（连接、指令发送器、数据处理器和测试结果互相隔离），
+    所有工位同时开始测试，全部完成后汇总各工位的通过/失败结果和整体吞吐量（DUT/小时）。
+    接口与 TestManager 保持一致，可直接替换使用。
+    """
+
+    def __init__(self, sites=None):
+        """初始化
+
+        Args:
+            sites: 工位配置列表，默认读取settings.yaml中的sites配置，
+                   每个工位格式见 TestManager 的 site 参数
+        """
+        if sites is None:
+            sites = config_loader.get('sites', [])
+
+        self.site_managers = {}
+        for i, site in enumerate(sites):
+            site = dict(site)
+            site.setdefault('name', f'site{i + 1}')
+            self.site_managers[site['name']] = TestManager(site=site)
+
+        self.test_running = False
+        self._lock = threading.Lock()
+        self._site_results = {}
+        self._start_time = None
+
+        # 累计统计（跨多次测试）
+        self.total_duts = 0
+        self.total_passed = 0
+        self.total_test_time = 0.0
+
+        logger.info(f"多工位测试管理器已创建，工位数：{len(self.site_managers)}")
+
+    def start_test(self, on_status_update, on_error, on_test_complete, on_command_updated=None,
+                   on_data_processed=None, on_site_complete=None):
+        """所有工位同时开始测试
+
+        Args:
+            on_status_update: 状态更新回调函数，状态文本带工位名前缀
+            on_error: 错误回调函数，错误文本带工位名前缀
+            on_test_complete: 全部工位测试完成回调函数，参数为汇总结果
+            on_command_updated: 指令更新回调函数
+            on_data_processed: 数据处理完成回调函数
+            on_site_complete: 单个工位测试完成回调函数，参数为(工位名, 测试结果)
+        """
+        if self.test_running or not self.site_managers:
+            return
+
+        self.test_running = True
+        self._site_results = {}
+        self._start_time = time.time()
+
+        for name, manager in self.site_managers.items():
+            manager.start_test(
+                on_status_update=lambda status, name=name: on_status_update(f"[{name}] {status}"),
+                on_error=lambda error, name=name: on_error(f"[{name}] {error}"),
+                on_test_complete=lambda results, name=name: self._on_site_complete(
+                    name, results, on_test_complete, on_site_complete),
+                on_command_updated=on_command_updated,
+                on_data_processed=on_data_processed
+            )
+
+        logger.info(f"{len(self.site_managers)} 个工位已开始测试")
+
+    def stop_test(self):
+        """停止所有工位的测试"""
+        for manager in self.site_managers.values():
+            manager.stop_test()
+
+    def _on_site_complete(self, name, results, on_test_complete, on_site_complete):
+        """单个工位测试完成（由工位测试线程调用）"""
+        logger.info(f"工位 {name} 测试完成：{'通过' if results.get('passed') else '失败'}")
+
+        if on_site_complete:
+            on_site_complete(name, results)
+
+        with self._lock:
+            self._site_results[name] = results
+            if len(self._site_results) < len(self.site_managers):
+                return
+            summary = self._summarize()
+            self.test_running = False
+
+        on_test_complete(summary)
+
+    def _summarize(self):
+        """汇总所有工位的测试结果"""
+        end_time = time.time()
+        elapsed = end_time - self._start_time
+        passed = sum(1 for r in self._site_results.values() if r.get('passed'))
+        duts = len(self._site_results)
+
+        self.total_duts += duts
+        self.total_passed += passed
+        self.total_test_time += elapsed
+
+        summary = {
+            'start_time': self._start_time,
+            'end_time': end_time,
+            'elapsed': elapsed,
+            'duts': duts,
+            'passed': passed,
+            'failed': duts - passed,
+            'throughput': duts / elapsed * 3600 if elapsed > 0 else 0.0,
+            'total_duts': self.total_duts,
+            'total_passed': self.total_passed,
+            'total_throughput': self.total_duts / self.total_test_time * 3600 if self.total_test_time > 0 else 0.0,
+            'sites': dict(self._site_results)
+        }
+
+        logger.info(f"多工位测试完成：{passed}/{duts} 通过，耗时 {elapsed:.2f} 秒，"
+                    f"吞吐量 {summary['throughput']:.1f} DUT/小时")
+        return summary
+
+    def get_test_results(self):
+        """获取各工位的测试结果"""
+        return {name: manager.get_test_results() for name, manager in self.site_managers.items()}
@@ -0,0 +1,219 @@
+import time
+from queue import Queue, Empty, Full
+
+
+class QueueClosed(Exception):
+    """队列已关闭：put() 不再接受新条目，get() 在取空剩余条目后抛出"""
+
+
+def command_key(item):
+    """流水线条目的合并键：指令序号（条目为指令字典，或包含 command 字段的响应、处理结果）"""
+    command = item.get('command', item)
+    return command.get('index', command.get('description'))
+
+
+class PipelineQueue(Queue):
+    """可关闭的阻塞队列，用于测试流水线各级线程之间传递数据
+
+    消费线程直接阻塞在 get() 上，有数据时立即被唤醒，不需要带超时的轮询；
+    close() 唤醒所有阻塞的生产者、消费者和 wait_drained() 的等待方，
+    消费线程取空剩余条目后收到 QueueClosed 异常并退出，停止时无需等待轮询超时。
+
+    有容量限制时，队列满后的行为由 policy 决定：
+    - block：生产者阻塞等待，反压传递到上一级
+    - drop_oldest：丢弃队首最早的条目后放入
+    - drop_newest：丢弃新放入的条目
+    - coalesce：队列中已有相同 key 的条目时原位替换为新条目（只保留最新值），
+      否则按 drop_oldest 处理
+    被丢弃或替换的条目不计入未完成任务，wait_drained() 不会等待它们。
+    """
+
+    POLICY_BLOCK = 'block'
+    POLICY_DROP_OLDEST = 'drop_oldest'
+    POLICY_DROP_NEWEST = 'drop_newest'
+    POLICY_COALESCE = 'coalesce'
+    POLICIES = (POLICY_BLOCK, POLICY_DROP_OLDEST, POLICY_DROP_NEWEST, POLICY_COALESCE)
+
+    def __init__(self, maxsize=0, policy=POLICY_BLOCK, key=None):
+        """初始化
+
+        Args:
+            maxsize: 队列容量，0 为不限
+            policy: 队列满时的处理策略，见 POLICIES
+            key: coalesce 策略下计算条目合并键的函数
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f"不支持的队列策略：{policy}")
+        if policy == self.POLICY_COALESCE and key is None:
+            raise ValueError("coalesce 策略需要指定 key")
+        self.policy = policy
+        self.key = key
+        super().__init__(maxsize)
+        self._closed = False
+        self.reset_stats()
+
+    @classmethod
+    def from_config(cls, config, key=None):
+        """由配置创建队列
+
+        Args:
+            config: 配置字典，capacity 为容量（0 或缺省为不限），policy 为队列满时的处理策略
+            key: coalesce 策略下计算条目合并键的函数
+        """
+        config = config or {}
+        return cls(int(config.get('capacity') or 0), config.get('policy', cls.POLICY_BLOCK), key=key)
+
+    def _init(self, maxsize):
+        super()._init(maxsize)
+        # coalesce 策略下队列中存放 [条目, 合并键] 单元，合并键 -> 单元，用于原位替换
+        self._cells = {}
+
+    def _put(self, item):
+        if self.policy == self.POLICY_COALESCE:
+            cell = [item, self.key(item)]
+            self._cells[cell[1]] = cell
+            item = cell
+        self.queue.append(item)
+
+    def _get(self):
+        item = self.queue.popleft()
+        if self.policy == self.POLICY_COALESCE:
+            if self._cells.get(item[1]) is item:
+                del self._cells[item[1]]
+            item = item[0]
+        return item
+
+    def _drop_oldest(self):
+        """丢弃队首条目（调用方持有锁）"""
+        self._get()
+        self._dropped += 1
+        self.unfinished_tasks -= 1
+        if not self.unfinished_tasks:
+            self.all_tasks_done.notify_all()
+
+    def get_stats(self):
+        """获取队列统计
+
+        Returns:
+            dict: capacity 容量（0 为不限），policy 策略，depth 当前深度，high_water 深度最高水位，
+                  put 放入次数，dropped 丢弃条目数，coalesced 被新值替换的条目数，blocked 生产者阻塞次数
+        """
+        with self.mutex:
+            return {
+                'capacity': self.maxsize,
+                'policy': self.policy,
+                'depth': self._qsize(),
+                'high_water': self._high_water,
+                'put': self._puts,
+                'dropped': self._dropped,
+                'coalesced': self._coalesced,
+                'blocked': self._blocked
+            }
+
+    def reset_stats(self):
+        """清空统计计数，最高水位从当前深度重新开始"""
+        with self.mutex:
+            self._high_water = self._qsize()
+            self._puts = 0
+            self._dropped = 0
+            self._coalesced = 0
+            self._blocked = 0
+
+    @property
+    def closed(self):
+        """队列是否已关闭"""
+        return self._closed
+
+    def close(self):
+        """关闭队列并唤醒所有等待方（可重复调用）"""
+        with self.mutex:
+            self._closed = True
+            self.not_empty.notify_all()
+            self.not_full.notify_all()
+            self.all_tasks_done.notify_all()
+
+    def put(self, item, block=True, timeout=None):
+        """放入一个条目
+
+        block 和 timeout 只在 block 策略下队列满时生效，其他策略不会阻塞。
+
+        Raises:
+            QueueClosed: 队列已关闭
+            Full: block 策略下非阻塞或超时时队列仍满
+        """
+        with self.not_full:
+            if self._closed:
+                raise QueueClosed
+            self._puts += 1
+
+            if self.policy == self.POLICY_COALESCE:
+                cell = self._cells.get(self.key(item))
+                if cell is not None:
+                    cell[0] = item
+                    self._coalesced += 1
+                    return
+
+            if 0 < self.maxsize <= self._qsize():
+                if self.policy == self.POLICY_DROP_NEWEST:
+                    self._dropped += 1
+                    return
+                if self.policy != self.POLICY_BLOCK:
+                    self._drop_oldest()
+                else:
+                    self._wait_not_full(block, timeout)
+
+            self._put(item)
+            self.unfinished_tasks += 1
+            self._high_water = max(self._high_water, self._qsize())
+            self.not_empty.notify()
+
+    def _wait_not_full(self, block, timeout):
+        """block 策略下等待队列有空位（调用方持有锁）"""
+        if not block:
+            raise Full
+        self._blocked += 1
+        endtime = None if timeout is None else time.monotonic() + timeout
+        while self._qsize() >= self.maxsize:
+            if endtime is None:
+                self.not_full.wait()
+            else:
+                remaining = endtime - time.monotonic()
+                if remaining <= 0:
+                    raise Full
+                self.not_full.wait(remaining)
+            if self._closed:
+                raise QueueClosed
+
+    def get(self, block=True, timeout=None):
+        """取出一个条目，队列关闭后仍先取完剩余条目
+
+        Raises:
+            QueueClosed: 队列已关闭且已取空
+            Empty: 非阻塞或超时时队列仍空
+        """
+        with self.not_empty:
+            endtime = None if timeout is None else time.monotonic() + timeout
+            while not self._qsize():
+                if self._closed:
+                    raise QueueClosed
+                if not block:
+                    raise Empty
+                if endtime is None:
+                    self.not_empty.wait()
+                else:
+                    remaining = endtime - time.monotonic()
+                    if remaining <= 0:
+                        raise Empty
+                    self.not_empty.wait(remaining)
+            item = self._get()
+            self.not_full.notify()
+            return item
+
+    def wait_drained(self, timeout=None):
+        """等待所有已放入的条目处理完毕（消费方调用 task_done），队列关闭时立即返回
+
+        Returns:
+            bool: 条目全部处理完毕或队列已关闭时为True，超时为False
+        """
+        with self.all_tasks_done:
+            return self.all_tasks_done.wait_for(lambda: not self.unfinished_tasks or self._closed, timeout)
@@ -0,0 +1,207 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+from collections.abc import Sequence
+import numpy as np
+from backend.logger.logger import logger
+
+
+class PlanTable(Sequence):
+    """编译后测试计划中的指令表或响应帧表
+
+    条目以 (偏移, 长度) 表的形式存放在内存映射的缓存文件中，按索引访问时才生成字典，
+    生成后的字典被保留，调用方对字典的修改（状态、序号等）在再次访问时可见，与普通列表一致。
+    """
+
+    def __init__(self, buffer, entries, responses=False):
+        """初始化
+
+        Args:
+            buffer: 缓存文件的内存映射
+            entries: 条目表（PlanCache.ENTRY 结构化数组）
+            responses: 是否为响应帧表（响应帧包含比较掩码和取值范围）
+        """
+        self._buffer = buffer
+        self._entries = entries
+        self._responses = responses
+        self._items = [None] * len(entries)
+        self._rows = None
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._items)))]
+        item = self._items[index]
+        if item is None:
+            item = self._items[index] = self._build(index % len(self._items))
+        return item
+
+    def __iter__(self):
+        for index in range(len(self._items)):
+            yield self[index]
+
+    def _build(self, index):
+        """由条目表生成指令字典或响应帧字典"""
+        if self._rows is None:
+            # 第一次访问时将条目表整体转换为元组列表，之后逐条取用不再经过 NumPy 标量
+            self._rows = self._entries.tolist()
+        (data_offset, description_offset, ranges_offset,
+         data_length, mask_length, description_length, hex_length, ranges_length) = self._rows[index]
+        buffer = self._buffer
+        data = buffer[data_offset:data_offset + data_length]
+        text_offset = description_offset + description_length
+        description = buffer[description_offset:text_offset].decode('utf-8')
+        hex_str = buffer[text_offset:text_offset + hex_length].decode('ascii')
+
+        if not self._responses:
+            return {'description': description, 'data': data, 'hex_str': hex_str, 'status': 'pending'}
+
+        mask = buffer[data_offset + data_length:data_offset + data_length + mask_length] or None
+        ranges = []
+        if ranges_length:
+            ranges = [tuple(r) for r in json.loads(buffer[ranges_offset:ranges_offset + ranges_length])]
+        return {'description': description, 'data': data, 'hex_str': hex_str, 'mask': mask, 'ranges': ranges}
+
+
+class PlanCache:
+    """测试计划编译缓存
+
+    将指令文件解析后的指令和响应帧编译为二进制文件：文件头 + 两张定长条目表（偏移和长度）+ 数据区，
+    参数扫描的配置（条数少，展开由 CommandSweep 惰性完成）以 JSON 存放在数据区末尾，
+    加载时内存映射缓存文件，只校验文件头，不解析 YAML 也不逐条转换十六进制。
+    缓存以源文件的修改时间、大小和内容哈希为键：修改时间和大小未变时直接使用缓存；
+    否则比较内容哈希，内容相同只更新文件头，内容变化时由调用方重新解析并编译。
+    """
+
+    MAGIC = b'SLTPLAN2'
+    # 魔数, 源文件修改时间(ns), 源文件大小, 源文件内容哈希, 指令数, 响应帧数, 扫描配置偏移, 扫描配置长度
+    HEADER = struct.Struct('<8sqQ32sIIQI')
+    # 条目表：数据区中依次存放 数据、掩码、描述、十六进制字符串、取值范围(JSON)
+    ENTRY = np.dtype([
+        ('data_offset', '<u8'),
+        ('description_offset', '<u8'),
+        ('ranges_offset', '<u8'),
+        ('data_length', '<u4'),
+        ('mask_length', '<u4'),
+        ('description_length', '<u4'),
+        ('hex_length', '<u4'),
+        ('ranges_length', '<u4'),
+    ])
+
+    def __init__(self, source_path, cache_path=None):
+        """初始化
+
+        Args:
+            source_path: 指令文件路径
+            cache_path: 缓存文件路径，默认为指令文件所在目录下 __plancache__/<文件名>.plan
+        """
+        self.source_path = source_path
+        if cache_path is None:
+            directory, name = os.path.split(os.path.abspath(source_path))
+            cache_path = os.path.join(directory, '__plancache__', name + '.plan')
+        self.cache_path = cache_path
+        self._stat = None
+        self._source = None
+        self._digest = None
+
+    def source_bytes(self):
+        """读取指令文件内容（只读取一次）"""
+        if self._source is None:
+            with open(self.source_path, 'rb') as f:
+                self._source = f.read()
+            self._digest = hashlib.blake2b(self._source, digest_size=32).digest()
+        return self._source
+
+    def load(self):
+        """加载缓存
+
+        Returns:
+            tuple: (指令表, 响应帧表, 参数扫描配置列表)，前两项为 PlanTable；
+                   缓存不存在、格式不符或已过期时返回None
+        """
+        self._stat = os.stat(self.source_path)
+        try:
+            with open(self.cache_path, 'rb') as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+        if len(buffer) < self.HEADER.size:
+            return None
+        (magic, mtime_ns, size, digest, command_count, response_count,
+         sweeps_offset, sweeps_length) = self.HEADER.unpack_from(buffer)
+        if magic != self.MAGIC:
+            return None
+
+        if (mtime_ns, size) != (self._stat.st_mtime_ns, self._stat.st_size):
+            # 修改时间变化但内容未变（复制、检出等），更新文件头后继续使用
+            self.source_bytes()
+            if digest != self._digest:
+                return None
+            self._write_header(command_count, response_count, sweeps_offset, sweeps_length)
+
+        entries = np.frombuffer(buffer, dtype=self.ENTRY, count=command_count + response_count,
+                                offset=self.HEADER.size)
+        sweeps = json.loads(buffer[sweeps_offset:sweeps_offset + sweeps_length]) if sweeps_length else []
+        return (PlanTable(buffer, entries[:command_count]),
+                PlanTable(buffer, entries[command_count:], responses=True),
+                sweeps)
+
+    def store(self, commands, response_frames, sweeps=()):
+        """编译并写入缓存（先写临时文件再替换，加载中的旧缓存不受影响）
+
+        Args:
+            commands: 指令字典列表，包含description、data、hex_str
+            response_frames: 响应帧字典列表，包含description、data、hex_str、mask、ranges
+            sweeps: 参数扫描配置（指令文件中 sweeps 节的原始字典）列表
+        """
+        self.source_bytes()
+        if self._stat is None:
+            self._stat = os.stat(self.source_path)
+
+        items = list(commands) + list(response_frames)
+        base = self.HEADER.size + len(items) * self.ENTRY.itemsize
+        blob = bytearray()
+        rows = []
+        for item in items:
+            data_offset = base + len(blob)
+            blob += item['data']
+            mask = item.get('mask') or b''
+            blob += mask
+            description = item['description'].encode('utf-8')
+            description_offset = base + len(blob)
+            blob += description
+            hex_str = item['hex_str'].encode('ascii')
+            blob += hex_str
+            ranges = json.dumps(item['ranges']).encode('utf-8') if item.get('ranges') else b''
+            ranges_offset = base + len(blob)
+            blob += ranges
+            rows.append((data_offset, description_offset, ranges_offset,
+                         len(item['data']), len(mask), len(description), len(hex_str), len(ranges)))
+        entries = np.array(rows, dtype=self.ENTRY)
+        sweeps = json.dumps(list(sweeps), ensure_ascii=False).encode('utf-8') if sweeps else b''
+        sweeps_offset = base + len(blob)
+        blob += sweeps
+
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        temp_path = f'{self.cache_path}.{os.getpid()}.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(self._header(len(commands), len(response_frames), sweeps_offset, len(sweeps)))
+            f.write(entries.tobytes())
+            f.write(blob)
+        os.replace(temp_path, self.cache_path)
+
+    def _header(self, *layout):
+        return self.HEADER.pack(self.MAGIC, self._stat.st_mtime_ns, self._stat.st_size, self._digest, *layout)
+
+    def _write_header(self, *layout):
+        """源文件内容未变时只更新缓存文件头中的修改时间和大小"""
+        try:
+            with open(self.cache_path, 'r+b') as f:
+                f.write(self._header(*layout))
+        except OSError as e:
+            logger.warning(f"更新测试计划缓存失败：{e}")
@@ -1,15 +1,23 @@
 from backend.logger.logger import logger
+from backend.tasks.plan_cache import PlanCache
+from backend.communication.command_builder import CommandSweep
+import itertools
 import os
+import time
 import yaml
 
+# 有 libyaml 时使用 C 实现的解析器
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 class TestCommandManager:
     """测试指令管理器，负责加载和管理测试指令"""
     
-    def __init__(self, config_file_path=None):
+    def __init__(self, config_file_path=None, use_cache=True):
         """初始化
         
         Args:
             config_file_path: 测试指令配置文件路径
+            use_cache: 是否使用编译缓存（见 PlanCache），指令文件未修改时不再解析 YAML
         """
         if config_file_path is None:
             # 默认配置文件路径
@@ -17,80 +25,161 @@ class TestCommandManager:
             config_file_path = os.path.join(current_dir, 'test_commands.yaml')
         
         self.config_file_path = config_file_path
+        self.use_cache = use_cache
         self.commands = []  # 存储指令列表
         self.response_frames = []  # 存储响应帧列表
+        self.sweeps = []  # 参数扫描（CommandSweep），发送时惰性展开
+        self._sweep_configs = []
         self.load_commands()
     
     def load_commands(self):
-        """从配置文件加载测试指令"""
+        """从配置文件加载测试指令
+        
+        优先加载编译缓存（指令和响应帧在访问时才生成字典）；缓存不存在或指令文件已修改时
+        解析 YAML，并重新编译缓存
+        """
         try:
-            with open(self.config_file_path, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
-            
-            self.commands.clear()
-            self.response_frames.clear()
+            start = time.perf_counter()
+            cache = PlanCache(self.config_file_path) if self.use_cache else None
+            plan = None
+            if cache:
+                try:
+                    plan = cache.load()
+                except (OSError, ValueError) as e:
+                    logger.warning(f"加载测试计划缓存失败，重新解析指令文件：{e}")
             
-            # 加载发送指令
-            if 'commands' in config:
-                for cmd in config['commands']:
+            if plan is not None:
+                self.commands, self.response_frames, self._sweep_configs = plan
+                source = '编译缓存'
+            else:
+                if cache:
+                    config = yaml.load(cache.source_bytes(), Loader=_YAML_LOADER)
+                else:
+                    with open(self.config_file_path, 'r', encoding='utf-8') as f:
+                        config = yaml.load(f, Loader=_YAML_LOADER)
+                self._parse_config(config or {})
+                source = '指令文件'
+                
+                if cache:
                     try:
-                        description = cmd['description']
-                        hex_data_str = cmd['hex_data'].replace(' ', '')
-                        
-                        # 转换为字节数据
-                        if len(hex_data_str) % 2 != 0:
-                            logger.warning(f"解析指令失败：{description}（十六进制数据长度为奇数）")
-                            continue
-                        
-                        # 将十六进制字符串转换为字节
-                        data = bytes.fromhex(hex_data_str)
-                        
-                        # 添加到指令列表
-                        self.commands.append({
-                            'description': description,
-                            'data': data,
-                            'hex_str': hex_data_str,
-                            'status': 'pending'  # pending, sent, success, failed
-                        })
-                        
-                        logger.info(f"加载指令成功：{description} - {hex_data_str}")
-                        
-                    except Exception as e:
-                        logger.error(f"解析指令失败：{cmd} - {str(e)}")
+                        cache.store(self.commands, self.response_frames, self._sweep_configs)
+                    except OSError as e:
+                        logger.warning(f"保存测试计划缓存失败：{e}")
             
-            # 加载响应帧
-            if 'response_frames' in config:
-                for frame in config['response_frames']:
-                    try:
-                        description = frame['description']
-                        hex_data_str = frame['hex_data'].replace(' ', '')
-                        
-                        # 转换为字节数据
-                        if len(hex_data_str) % 2 != 0:
-                            logger.warning(f"解析响应帧失败：{description}（十六进制数据长度为奇数）")
-                            continue
-                        
-                        # 将十六进制字符串转换为字节
-                        data = bytes.fromhex(hex_data_str)
-                        
-                        # 添加到响应帧列表
-                        self.response_frames.append({
-                            'description': description,
-                            'data': data,
-                            'hex_str': hex_data_str
-                        })
-                        
-                        logger.info(f"加载响应帧成功：{description} - {hex_data_str}")
-                        
-                    except Exception as e:
-                        logger.error(f"解析响应帧失败：{frame} - {str(e)}")
+            self.sweeps = []
+            for sweep in self._sweep_configs:
+                try:
+                    self.sweeps.append(CommandSweep.from_config(sweep))
+                except Exception as e:
+                    logger.error(f"解析参数扫描失败：{sweep.get('description')} - {str(e)}")
             
-            logger.info(f"成功加载 {len(self.commands)} 条测试指令和 {len(self.response_frames)} 条响应帧")
+            elapsed = (time.perf_counter() - start) * 1e3
+            logger.info(f"成功加载 {len(self.commands)} 条测试指令、{len(self.sweeps)} 组参数扫描"
+                        f"（共 {self.get_commands_count()} 条指令）和 {len(self.response_frames)} 条响应帧"
+                        f"（{source}，耗时 {elapsed:.1f} ms）")
             
         except Exception as e:
             logger.error(f"加载测试指令配置文件失败：{str(e)}")
             raise
     
+    def _parse_config(self, config):
+        """解析指令文件内容（只记录解析失败的条目，不逐条输出日志）
+        
+        Args:
+            config: 指令文件解析出的字典，包含commands和response_frames
+        """
+        self.commands = []
+        self.response_frames = []
+        
+        # 参数扫描：指令模板（hex_data、fields、length、checksum）加各字段的扫描轴（sweep），
+        # 只保存配置，发送时由 CommandSweep 惰性展开
+        self._sweep_configs = list(config.get('sweeps') or [])
+        
+        # 加载发送指令
+        if 'commands' in config:
+            for cmd in config['commands']:
+                try:
+                    description = cmd['description']
+                    hex_data_str = cmd['hex_data'].replace(' ', '')
+                    
+                    # 转换为字节数据
+                    if len(hex_data_str) % 2 != 0:
+                        logger.warning(f"解析指令失败：{description}（十六进制数据长度为奇数）")
+                        continue
+                    
+                    # 将十六进制字符串转换为字节
+                    data = bytes.fromhex(hex_data_str)
+                    
+                    # 添加到指令列表
+                    self.commands.append({
+                        'description': description,
+                        'data': data,
+                        'hex_str': hex_data_str,
+                        'status': 'pending'  # pending, sent, success, failed
+                    })
+                    
+                except Exception as e:
+                    logger.error(f"解析指令失败：{cmd} - {str(e)}")
+        
+        # 加载响应帧（期望响应），不关心的字节写作 XX，可选 mask（按比特的比较掩码）
+        # 和 ranges（按整数取值检查范围的字段）
+        if 'response_frames' in config:
+            for frame in config['response_frames']:
+                try:
+                    description = frame['description']
+                    hex_data_str = frame['hex_data'].replace(' ', '')
+                    
+                    # 转换为字节数据
+                    if len(hex_data_str) % 2 != 0:
+                        logger.warning(f"解析响应帧失败：{description}（十六进制数据长度为奇数）")
+                        continue
+                    
+                    # 将十六进制字符串转换为字节，XX 转换为 00 并在掩码中清零
+                    data, mask = self._parse_pattern(hex_data_str)
+                    if 'mask' in frame:
+                        explicit = bytes.fromhex(frame['mask'].replace(' ', ''))
+                        mask = bytes(a & b for a, b in zip(mask or b'\xFF' * len(data), explicit))
+                    
+                    # 添加到响应帧列表
+                    self.response_frames.append({
+                        'description': description,
+                        'data': data,
+                        'hex_str': hex_data_str,
+                        'mask': mask,
+                        'ranges': [self._parse_range(r) for r in frame.get('ranges', [])]
+                    })
+                    
+                except Exception as e:
+                    logger.error(f"解析响应帧失败：{frame} - {str(e)}")
+    
+    @staticmethod
+    def _parse_pattern(hex_str):
+        """解析可含 XX（不关心的字节）的十六进制字符串
+        
+        Returns:
+            tuple: (字节数据, 比较掩码)，不含 XX 时掩码为None
+        """
+        pairs = [hex_str[i:i + 2] for i in range(0, len(hex_str), 2)]
+        if not any(pair.upper() == 'XX' for pair in pairs):
+            return bytes.fromhex(hex_str), None
+        data = bytes(0 if pair.upper() == 'XX' else int(pair, 16) for pair in pairs)
+        mask = bytes(0 if pair.upper() == 'XX' else 0xFF for pair in pairs)
+        return data, mask
+    
+    @staticmethod
+    def _parse_range(field):
+        """解析取值范围检查项
+        
+        Args:
+            field: 包含offset(字节偏移)、min、max，可选size(字节数，默认1)、
+                   byteorder(big或little，默认big)、signed(默认false)的字典
+            
+        Returns:
+            tuple: (偏移, 字节数, 最小值, 最大值, 字节序, 是否有符号)
+        """
+        return (int(field['offset']), int(field.get('size', 1)), field['min'], field['max'],
+                field.get('byteorder', 'big'), bool(field.get('signed', False)))
+    
     def get_commands(self):
         """获取所有测试指令
         
@@ -99,6 +188,14 @@ class TestCommandManager:
         """
         return self.commands
     
+    def iter_commands(self):
+        """依次产出全部指令：先是逐条定义的指令，然后是参数扫描展开的指令（取用时才生成）
+        
+        Returns:
+            iterator: 指令字典迭代器
+        """
+        return itertools.chain(self.commands, *self.sweeps)
+    
     def get_command_by_index(self, index):
         """根据索引获取测试指令
         
@@ -123,12 +220,12 @@ class TestCommandManager:
             self.commands[index]['status'] = status
     
     def get_commands_count(self):
-        """获取指令总数
+        """获取指令总数（包括参数扫描展开的指令）
         
         Returns:
             int: 指令总数
         """
-        return len(self.commands)
+        return len(self.commands) + sum(len(sweep) for sweep in self.sweeps)
     
     def reload_commands(self):
         """重新加载测试指令
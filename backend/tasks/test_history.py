@@ -0,0 +1,131 @@
+import json
+import os
+import threading
+from backend.logger.logger import logger
+
+
+class TestHistory:
+    """测试历史统计：按测试项（测试步骤或指令）累计执行次数、失败次数和耗时，保存为 JSON 文件
+
+    自适应排序按"每秒失败概率"（失败率 / 平均耗时）从高到低安排测试项，最可能失败的测试项最先执行，
+    配合失败即停，失败的被测件能尽早结束测试。失败率按 (失败次数 + 1) / (执行次数 + 2) 估计，
+    没有历史的测试项失败率为 0.5，会被优先执行以积累统计。
+    同一进程中的多个测试管理器（多工位测试）通过 shared() 共用同一个实例，各工位的统计累计到一起。
+    """
+
+    STEPS = 'steps'
+    COMMANDS = 'commands'
+
+    # 历史文件的绝对路径 -> 共用的实例
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, path):
+        """获取历史文件对应的共用实例（同一文件在进程中只读取一次）"""
+        key = os.path.abspath(path)
+        with cls._instances_lock:
+            history = cls._instances.get(key)
+            if history is None:
+                history = cls._instances[key] = cls(path)
+            return history
+
+    def __init__(self, path=None):
+        """初始化
+
+        Args:
+            path: 历史文件路径，为空时只在内存中统计，不读写文件
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._stats = {self.STEPS: {}, self.COMMANDS: {}}
+        self.load()
+
+    def load(self):
+        """读取历史文件，文件不存在或格式错误时从空统计开始"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                stats = json.load(f)
+            for kind in (self.STEPS, self.COMMANDS):
+                self._stats[kind] = dict(stats.get(kind) or {})
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"读取测试历史失败：{e}")
+
+    def save(self):
+        """写入历史文件（先写临时文件再替换，多个工位同时保存时依次写入）"""
+        if not self.path:
+            return
+        with self._save_lock:
+            with self._lock:
+                content = json.dumps(self._stats, ensure_ascii=False, indent=1)
+            try:
+                directory = os.path.dirname(os.path.abspath(self.path))
+                os.makedirs(directory, exist_ok=True)
+                temp_path = f'{self.path}.{os.getpid()}.{threading.get_ident()}.tmp'
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    f.write(content)
+                os.replace(temp_path, self.path)
+            except OSError as e:
+                logger.warning(f"保存测试历史失败：{e}")
+
+    def record(self, kind, name, passed, duration):
+        """记录一次执行
+
+        Args:
+            kind: STEPS 或 COMMANDS
+            name: 步骤名或指令描述
+            passed: 是否通过
+            duration: 耗时(秒)，None 表示未知（不计入平均耗时）
+        """
+        with self._lock:
+            entry = self._stats[kind].setdefault(name, {'runs': 0, 'failures': 0, 'timed_runs': 0, 'duration': 0.0})
+            entry['runs'] += 1
+            entry['failures'] += 0 if passed else 1
+            if duration is not None:
+                entry['timed_runs'] += 1
+                entry['duration'] += max(0.0, duration)
+
+    def failure_rate(self, kind, name):
+        """估计的失败概率"""
+        entry = self._stats[kind].get(name)
+        if entry is None:
+            return 0.5
+        return (entry['failures'] + 1) / (entry['runs'] + 2)
+
+    def mean_duration(self, kind, name, default=1.0):
+        """平均耗时(秒)，没有计时记录时返回 default"""
+        entry = self._stats[kind].get(name)
+        if entry is None or not entry['timed_runs']:
+            return default
+        return entry['duration'] / entry['timed_runs']
+
+    def priority(self, kind, name, default_duration=1.0):
+        """排序优先级：每秒失败概率"""
+        return self.failure_rate(kind, name) / max(self.mean_duration(kind, name, default_duration), 1e-3)
+
+    def order(self, kind, items, key, pinned=None, default_duration=1.0):
+        """按优先级从高到低重排测试项，固定的测试项保持原位置
+
+        Args:
+            kind: STEPS 或 COMMANDS
+            items: 测试项列表
+            key: 由测试项取名字的函数
+            pinned: 判断测试项是否固定位置的函数（如激活/退出测试模式等必需指令），None 表示都不固定
+            default_duration: 没有计时记录的测试项的估计耗时(秒)
+
+        Returns:
+            list: 重排后的测试项，优先级相同时保持原顺序
+        """
+        pinned = pinned or (lambda item: False)
+        movable = [item for item in items if not pinned(item)]
+        movable.sort(key=lambda item: -self.priority(kind, key(item), default_duration))
+        movable = iter(movable)
+        return [item if pinned(item) else next(movable) for item in items]
+
+    def get_stats(self, kind):
+        """获取统计：名字 -> {runs, failures, timed_runs, duration(累计耗时)}"""
+        with self._lock:
+            return {name: dict(entry) for name, entry in self._stats[kind].items()}
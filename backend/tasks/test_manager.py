@@ -1,12 +1,22 @@
 from backend.communication.data_acquisition import DataAcquisitionWorker
+from backend.communication.telemetry_scheduler import TelemetryScheduler
 from backend.communication.serial_port import SerialPort
 from backend.communication.network_port import NetworkPort
-from backend.communication.packet_parser import PacketParser
+from backend.communication.async_network_port import AsyncNetworkPort
+from backend.communication.wire_capture import CaptureWriter, CapturingPort
 from backend.logger.logger import logger
 from backend.config.config_loader import config_loader
 from backend.tasks.test_command_manager import TestCommandManager
 from backend.tasks.command_sender import CommandSender
 from backend.tasks.data_processor import DataProcessor
+from backend.tasks.pipeline_queue import QueueClosed
+from backend.tasks.auto_test_runner import AutoTestRunner
+from backend.tasks.test_step_base import TestStep, FunctionStep
+from backend.tasks.test_history import TestHistory
+from backend.processor.response_validator import ResponseValidator
+import functools
+import itertools
+import os
 import subprocess
 import threading
 import time
@@ -14,14 +24,38 @@ import time
 class TestManager:
     """测试管理器，负责处理测试逻辑"""
     
-    def __init__(self):
+    def __init__(self, site=None):
+        """初始化
+        
+        Args:
+            site: 工位配置字典（多工位测试时使用），包含name及通信设置
+                  （type、serial、network，格式同settings.yaml的communication节），
+                  未配置的项使用全局communication配置
+        """
+        self.site = site or {}
+        self.site_name = self.site.get('name')
         self.data_worker = None
         self.test_running = False
         self.test_thread = None
         
+        # 测试步骤调度器，add_test_step 添加的步骤与内置步骤一起调度
+        self.test_runner = None
+        self.extra_steps = []
+        
+        # 失败即停和自适应排序（测试开始时按配置设置），历史统计为 None 时不记录
+        self.fail_fast = False
+        self.adaptive_order = False
+        self.mandatory = set()
+        self.test_history = None
+        self._fail_fast_triggered = threading.Event()
+        self._skip_lock = threading.Lock()
+        
         # 测试指令管理器
         self.command_manager = TestCommandManager()
         
+        # 响应校验器，按 response_frames 中的期望响应校验每条响应（测试开始时建立）
+        self.response_validator = None
+        
         # 指令发送器和数据处理器
         self.command_sender = None
         self.data_processor = None
@@ -35,17 +69,19 @@ class TestManager:
         
         # 测试结果数据
         self.test_results = {
+            'site': self.site_name,
             'start_time': None,
             'end_time': None,
             'ping_result': None,
             'commands_sent': 0,
             'data_received': 0,
             'errors': [],
-            'command_results': []
+            'command_results': [],
+            'queue_stats': {},
+            'steps': {},
+            'commands_skipped': 0,
+            'passed': None
         }
-        
-        # 当前等待响应的指令信息
-        self.current_expected_response = None
     
     def start_test(self, on_status_update, on_error, on_test_complete, on_command_updated=None, on_data_processed=None):
         """开始测试
@@ -68,12 +104,18 @@ class TestManager:
         self.on_data_processed = on_data_processed
         
         self.test_results = {
+            'site': self.site_name,
             'start_time': time.time(),
             'end_time': None,
             'ping_result': None,
             'commands_sent': 0,
             'data_received': 0,
-            'errors': []
+            'errors': [],
+            'command_results': [],
+            'queue_stats': {},
+            'steps': {},
+            'commands_skipped': 0,
+            'passed': None
         }
         
         # 启动测试线程
@@ -88,58 +130,55 @@ class TestManager:
         """停止测试"""
         self.test_running = False
         
+        # 未开始的测试步骤不再执行
+        test_runner = self.test_runner
+        if test_runner:
+            test_runner.stop()
+        
+        # 关闭指令队列，立即唤醒等待流水线空闲的测试线程
+        command_sender = self.command_sender
+        if command_sender:
+            command_sender.close()
+        
         if self.data_worker:
             self.data_worker.stop()
             self.data_worker = None
     
     def _run_test(self, on_status_update, on_error, on_test_complete):
-        """运行测试流程"""
+        """运行测试流程：按依赖关系执行测试步骤，互不依赖的步骤并行执行"""
         try:
-            # 第一步：建立通信连接
-            on_status_update("正在建立通信连接...")
-            self._establish_connection()
-            
-            # 第二步：网口通信时进行ping测试
-            comm_type = config_loader.get('communication.type')
-            if comm_type == 'network':
-                on_status_update("正在进行网络连接测试...")
-                ip = config_loader.get('communication.network.ip')
-                ping_count = config_loader.get('test.ping_count', 4)
-                
-                if self._ping_device(ip, ping_count):
-                    self.test_results['ping_result'] = True
-                    on_status_update("网络连接测试成功")
-                else:
-                    self.test_results['ping_result'] = False
-                    on_status_update("网络连接测试失败")
-                    raise Exception(f"Ping {ip} 失败，无法建立连接")
-            
-            # 第三步：初始化指令发送器和数据处理器
-            on_status_update("初始化指令发送器和数据处理器...")
-            
-            # 获取通信接口
-            comm_interface = self.data_worker._data_acquisition._communication
-            
-            # 初始化指令发送器
-            self.command_sender = CommandSender(comm_interface)
-            self.command_sender.start()
-            
-            # 初始化数据处理器
-            self.data_processor = DataProcessor()
-            self.data_processor.start()
-            
-            # 启动响应处理线程
-            threading.Thread(target=self._process_responses, daemon=True).start()
-            
-            # 启动结果处理线程
-            threading.Thread(target=self._process_results, daemon=True).start()
-            
-            # 第四步：发送测试指令
-            on_status_update("开始发送测试指令...")
-            self._send_test_commands()
-            
-            # 第四步：结束测试
-            on_status_update("测试完成")
+            self.fail_fast = bool(config_loader.get('test.fail_fast', False))
+            self.adaptive_order = config_loader.get('test.ordering', 'file') == 'adaptive'
+            self.mandatory = set(config_loader.get('test.mandatory', []) or [])
+            self._fail_fast_triggered.clear()
+            history_file = config_loader.get('test.history_file', '')
+            # 多工位测试时各工位共用同一个历史统计实例，统计累计到一起，保存时不互相覆盖
+            self.test_history = TestHistory.shared(history_file) if history_file else None
+            
+            priority = None
+            if self.adaptive_order and self.test_history:
+                priority = functools.partial(self.test_history.priority, TestHistory.STEPS)
+            self.test_runner = AutoTestRunner(
+                self._build_test_steps(on_status_update),
+                max_workers=config_loader.get('test.max_parallel_steps', 4),
+                fail_fast=self.fail_fast,
+                mandatory=self.mandatory,
+                priority=priority
+            )
+            if not self.test_running:
+                self.test_runner.stop()
+            steps = self.test_runner.run({'manager': self})
+            self.test_results['steps'] = steps
+            
+            failed = [r for r in steps.values() if r['status'] in (TestStep.STATUS_FAILED, TestStep.STATUS_TIMEOUT)]
+            for result in failed:
+                self.test_results['errors'].append(f"{result['name']}: {result['error']}")
+            if failed:
+                on_error(f"测试失败: {failed[0]['error']}")
+            elif any(r['status'] == TestStep.STATUS_SKIPPED for r in steps.values()):
+                on_status_update("测试已停止")
+            else:
+                on_status_update("测试完成")
             
         except Exception as e:
             logger.error(f"测试过程中发生错误: {e}")
@@ -149,22 +188,139 @@ class TestManager:
             # 清理资源
             self._cleanup()
             
-            # 记录结束时间
+            # 记录各步骤的通过情况和耗时，供之后的测试自适应排序
+            if self.test_history:
+                for result in self.test_results['steps'].values():
+                    if result['status'] in (TestStep.STATUS_PASSED, TestStep.STATUS_FAILED, TestStep.STATUS_TIMEOUT):
+                        self.test_history.record(TestHistory.STEPS, result['name'],
+                                                 result['status'] == TestStep.STATUS_PASSED, result['duration'])
+                self.test_history.save()
+            
+            # 记录结束时间和测试结论
             self.test_results['end_time'] = time.time()
+            self.test_results['passed'] = (
+                not self.test_results['errors']
+                and self.test_results['data_received'] == self.command_manager.get_commands_count()
+            )
             
             # 通知测试完成
             on_test_complete(self.test_results)
     
+    def add_test_step(self, step):
+        """添加测试步骤，与内置步骤一起按依赖关系调度（对之后开始的测试生效）
+        
+        内置步骤：connect（建立连接）、ping（网口连接测试）、pipeline（初始化指令发送器和数据处理器）、
+        commands（发送测试指令并等待处理完毕）。遥测检查、ADC采集分析、功率读取等步骤声明
+        depends_on=['connect'] 即可与指令测试并行执行；步骤可通过上下文的 manager 项访问本测试管理器。
+        
+        Args:
+            step: TestStep
+        """
+        self.extra_steps.append(step)
+    
+    def _build_test_steps(self, on_status_update):
+        """生成本次测试的步骤列表（内置步骤 + add_test_step 添加的步骤）"""
+        steps = [
+            FunctionStep('connect', lambda context: self._step_connect(on_status_update)),
+            FunctionStep('ping', lambda context: self._step_ping(on_status_update)),
+            FunctionStep('pipeline', lambda context: self._step_pipeline(on_status_update), depends_on=['connect']),
+            FunctionStep('commands', lambda context: self._step_commands(on_status_update),
+                         depends_on=['ping', 'pipeline'], on_cancel=self._cancel_commands),
+        ] + self.extra_steps
+        
+        # 配置的超时时间覆盖步骤自身的设置
+        timeouts = config_loader.get('test.step_timeouts', {}) or {}
+        for step in steps:
+            if step.name in timeouts:
+                step.timeout = timeouts[step.name]
+        return steps
+    
+    def _step_connect(self, on_status_update):
+        """测试步骤：建立通信连接，等待链路仲裁器启动"""
+        on_status_update("正在建立通信连接...")
+        self._establish_connection()
+        
+        # 指令发送与遥测采集通过链路仲裁器共享同一链路
+        link_arbiter = self.data_worker.get_link_arbiter()
+        if not link_arbiter.wait_started(timeout=config_loader.get('test.connect_timeout', 5.0)):
+            raise ConnectionError("通信链路未建立")
+    
+    def _step_ping(self, on_status_update):
+        """测试步骤：网口通信时进行ping测试（与建立连接并行）"""
+        if self._comm_setting('type') != 'network':
+            return None
+        
+        on_status_update("正在进行网络连接测试...")
+        ip = self._comm_setting('network.ip')
+        ping_count = config_loader.get('test.ping_count', 4)
+        
+        if self._ping_device(ip, ping_count):
+            self.test_results['ping_result'] = True
+            on_status_update("网络连接测试成功")
+            return True
+        
+        self.test_results['ping_result'] = False
+        on_status_update("网络连接测试失败")
+        raise Exception(f"Ping {ip} 失败，无法建立连接")
+    
+    def _step_pipeline(self, on_status_update):
+        """测试步骤：初始化指令发送器和数据处理器，启动响应和结果处理线程"""
+        on_status_update("初始化指令发送器和数据处理器...")
+        
+        # 初始化指令发送器
+        self.command_sender = CommandSender(
+            self.data_worker.get_link_arbiter(),
+            window_size=config_loader.get('test.command_window', 1),
+            response_timeout=config_loader.get('test.response_timeout', 2.0),
+            command_interval=config_loader.get('test.command_interval', 0.5),
+            on_command_failed=self._on_command_failed,
+            queues=config_loader.get('pipeline.queues', {}),
+            skip_command=self._skip_command
+        )
+        self.command_sender.start()
+        
+        # 初始化数据处理器
+        self.response_validator = ResponseValidator.from_frames(self.command_manager.get_response_frames())
+        self.data_processor = DataProcessor(
+            backend=config_loader.get('processing.backend', DataProcessor.BACKEND_THREAD),
+            max_workers=config_loader.get('processing.max_workers', 4),
+            queues=config_loader.get('pipeline.queues', {}),
+            validator=self.response_validator
+        )
+        self.data_processor.start()
+        
+        # 启动响应处理线程
+        threading.Thread(target=self._process_responses, daemon=True).start()
+        
+        # 启动结果处理线程
+        threading.Thread(target=self._process_results, daemon=True).start()
+    
+    def _step_commands(self, on_status_update):
+        """测试步骤：发送测试指令，等待所有指令完成并处理完毕"""
+        on_status_update("开始发送测试指令...")
+        self._send_test_commands()
+        self._wait_pipeline_idle()
+        
+        # 失败即停时指令测试不通过即为步骤失败，未开始的非必需步骤随之跳过
+        if self._fail_fast_triggered.is_set():
+            raise Exception(f"指令测试未通过，失败即停，跳过 {self.test_results['commands_skipped']} 条指令")
+    
+    def _cancel_commands(self):
+        """指令测试步骤超时或被取消：关闭指令队列，中断指令发送并唤醒等待流水线空闲的步骤线程"""
+        command_sender = self.command_sender
+        if command_sender:
+            command_sender.close()
+    
     def _establish_connection(self):
         """建立通信连接"""
         # 从配置文件获取通信设置
-        comm_type = config_loader.get('communication.type')
+        comm_type = self._comm_setting('type')
         
         try:
             if comm_type == 'serial':
                 # 使用RS422串口
-                serial_port = config_loader.get('communication.serial.port')
-                baud_rate = config_loader.get('communication.serial.baud_rate')
+                serial_port = self._comm_setting('serial.port')
+                baud_rate = self._comm_setting('serial.baud_rate')
                 
                 # 验证必要的配置参数
                 if not serial_port:
@@ -176,8 +332,8 @@ class TestManager:
                 logger.info(f"准备连接RS422串口: {serial_port}@{baud_rate}")
             else:
                 # 使用网口
-                ip = config_loader.get('communication.network.ip')
-                port = config_loader.get('communication.network.port')
+                ip = self._comm_setting('network.ip')
+                port = self._comm_setting('network.port')
                 
                 # 验证必要的配置参数
                 if not ip:
@@ -185,11 +341,34 @@ class TestManager:
                 if not port:
                     raise ValueError("未配置网络端口")
                 
-                comm_interface = NetworkPort(ip, port)
-                logger.info(f"准备连接网口: {ip}:{port}")
+                transport = self._comm_setting('network.transport', 'blocking')
+                if transport == 'asyncio':
+                    comm_interface = AsyncNetworkPort(
+                        ip, port,
+                        tcp_nodelay=self._comm_setting('network.tcp_nodelay', True),
+                        rcvbuf=self._comm_setting('network.rcvbuf')
+                    )
+                else:
+                    comm_interface = NetworkPort(ip, port)
+                logger.info(f"准备连接网口: {ip}:{port}（{transport}）")
+            
+            # 按配置记录链路收发数据，用于故障复现和离线回放
+            capture_dir = config_loader.get('communication.capture_dir')
+            if capture_dir:
+                os.makedirs(capture_dir, exist_ok=True)
+                capture_name = f"{self.site_name or 'board'}_{time.strftime('%Y%m%d_%H%M%S')}.slcap"
+                comm_interface = CapturingPort(comm_interface, CaptureWriter(os.path.join(capture_dir, capture_name)))
             
             # 创建并启动数据采集线程
-            self.data_worker = DataAcquisitionWorker(comm_interface)
+            channels = config_loader.get('acquisition.channels') or []
+            self.data_worker = DataAcquisitionWorker(
+                comm_interface,
+                batched=config_loader.get('acquisition.batched', True),
+                interval=config_loader.get('acquisition.interval', 1000),
+                channels=TelemetryScheduler.channels_from_config(channels),
+                ring_capacity=config_loader.get('acquisition.ring_capacity', 0),
+                ring_drain_interval=config_loader.get('acquisition.ring_drain_interval', 100)
+            )
             # 可以在这里连接数据更新信号
             # self.data_worker.temperature_updated.connect(...)
             self.data_worker.start()
@@ -216,6 +395,24 @@ class TestManager:
                 self.data_worker = None
             raise
     
+    def _comm_setting(self, key_path, default=None):
+        """获取通信配置，工位配置优先于全局communication配置
+        
+        Args:
+            key_path: 配置键路径，如 'network.ip'
+            default: 默认值
+            
+        Returns:
+            配置值
+        """
+        value = self.site
+        try:
+            for key in key_path.split('.'):
+                value = value[key]
+            return value
+        except (KeyError, TypeError):
+            return config_loader.get(f'communication.{key_path}', default)
+    
     def _ping_device(self, ip, count=4):
         """ping设备
         
@@ -254,9 +451,9 @@ class TestManager:
     def _send_test_commands(self):
         """发送测试指令"""
         try:
-            # 获取所有测试指令
-            commands = self.command_manager.get_commands()
-            command_count = len(commands)
+            # 获取所有测试指令（按排序模式排列），参数扫描的指令在发送时才生成
+            commands = self._ordered_commands()
+            command_count = self.command_manager.get_commands_count()
             
             if command_count == 0:
                 logger.warning("没有加载到测试指令")
@@ -265,13 +462,22 @@ class TestManager:
             logger.info(f"开始发送 {command_count} 条测试指令")
             
             # 将所有指令加入发送队列
-            for i, command in enumerate(commands):
+            for position, (i, command) in enumerate(commands):
                 if not self.test_running:
                     logger.info("测试已停止，中断指令发送")
                     break
+                
+                command['index'] = i
+                command['mandatory'] = command['description'] in self.mandatory
+                if self._skip_command(command):
+                    continue
                     
                 # 添加到指令发送队列
-                self.command_sender.send_command(command)
+                try:
+                    self.command_sender.send_command(command)
+                except QueueClosed:
+                    logger.info("测试已停止，中断指令发送")
+                    break
                 
                 # 更新指令状态
                 self.command_manager.update_command_status(i, 'sending')
@@ -280,7 +486,7 @@ class TestManager:
                 if self.on_command_updated:
                     self.on_command_updated(command, 'sending')
                 
-                logger.info(f"指令已加入队列 {i+1}/{command_count}: {command['description']}")
+                logger.info(f"指令已加入队列 {position+1}/{command_count}: {command['description']}")
             
             logger.info("所有测试指令已加入发送队列")
             
@@ -288,112 +494,83 @@ class TestManager:
             logger.error(f"发送测试指令失败: {e}")
             raise
     
-    def _receive_response(self, timeout=2.0):
-        """接收响应数据
+    def _ordered_commands(self):
+        """按排序模式依次产出 (指令序号, 指令)，指令序号为指令在指令文件中的位置
+        
+        自适应排序按历史统计的每秒失败概率重排 commands 节的指令，必需指令保持原位置；
+        参数扫描的指令按扫描顺序排在其后，取用时才生成
+        """
+        if not (self.adaptive_order and self.test_history):
+            return enumerate(self.command_manager.iter_commands())
+        
+        commands = list(enumerate(self.command_manager.get_commands()))
+        ordered = self.test_history.order(
+            TestHistory.COMMANDS, commands,
+            key=lambda item: item[1]['description'],
+            pinned=lambda item: item[1]['description'] in self.mandatory,
+            default_duration=config_loader.get('test.response_timeout', 2.0)
+        )
+        sweeps = enumerate(itertools.chain.from_iterable(self.command_manager.sweeps), len(commands))
+        return itertools.chain(ordered, sweeps)
+    
+    def _skip_command(self, command):
+        """失败即停：已有指令未通过时跳过非必需指令（由测试线程和指令发送线程调用）
         
-        Args:
-            timeout: 超时时间(秒)
-            
         Returns:
-            bytes: 响应数据，如果超时或出错则返回None
+            bool: 指令是否被跳过
         """
-        try:
-            if not hasattr(self.data_worker, '_data_acquisition') or not hasattr(self.data_worker._data_acquisition, '_communication'):
-                logger.error("无法接收响应: 通信接口不可用")
-                return None
-            
-            comm_interface = self.data_worker._data_acquisition._communication
-            
-            # 检查通信接口是否已打开
-            if not comm_interface.is_open():
-                logger.error("无法接收响应: 通信接口未打开")
-                return None
-            
-            # 尝试接收响应
-            response = comm_interface.receive(timeout=timeout)
-            
-            if response is None or len(response) == 0:
-                logger.warning(f"接收响应超时 ({timeout}秒)")
-                return None
-            
-            return response
-        except ConnectionError as e:
-            logger.error(f"接收响应失败: 连接错误 - {e}")
-            # 连接错误可能导致通信中断，需要重新建立连接
-            if self.data_worker:
-                self.data_worker.stop()
-                self.data_worker = None
-            return None
-        except Exception as e:
-            logger.error(f"接收响应失败: 未知错误 - {e}")
-            return None
+        if not self._fail_fast_triggered.is_set() or command.get('mandatory'):
+            return False
+        
+        command['status'] = 'skipped'
+        self.command_manager.update_command_status(command.get('index', -1), 'skipped')
+        with self._skip_lock:
+            self.test_results['commands_skipped'] += 1
+        
+        # 通知UI更新
+        if self.on_command_updated:
+            self.on_command_updated(command, 'skipped')
+        return True
+    
+    def _command_failed(self, command, error, duration=None):
+        """记录一条未通过的指令，失败即停时触发跳过后续的非必需指令"""
+        self.test_results['errors'].append(f"{command['description']}: {error}")
+        if self.test_history:
+            self.test_history.record(TestHistory.COMMANDS, command['description'], False, duration)
+        if self.fail_fast and not self._fail_fast_triggered.is_set():
+            self._fail_fast_triggered.set()
+            logger.warning(f"指令未通过，失败即停：{command['description']}")
     
-    def _process_response(self, response):
-        """处理响应数据
+    def _on_command_failed(self, command):
+        """指令失败回调（由指令发送线程调用）
         
         Args:
-            response: 响应数据
-            
-        Returns:
-            bool: 响应是否与当前期望的指令匹配
+            command: 失败的指令
         """
-        try:
-            # 这里可以根据实际需求处理响应数据
-            logger.info(f"收到响应数据: {response.hex()}")
-            
-            # 解析用户特定格式的测试指令响应
-            # 格式参考：AA 55 55 AA 88 88 00 10 00 00 00 00 CF 10 00 01 00 00 0D EE
-            if len(response) >= 12:
-                # 检查响应头
-                if response[:4] == b'\xAA\x55\x55\xAA':
-                    logger.info("收到有效响应帧")
-                    
-                    # 解析帧结构
-                    header = response[4:6]          # 帧头 88 88
-                    length = int.from_bytes(response[6:8], byteorder='big')  # 数据长度
-                    frame_id = response[8:12]       # 帧ID
-                    
-                    logger.info(f"帧头: {header.hex()}, 数据长度: {length}, 帧ID: {frame_id.hex()}")
-                    
-                    # 解析数据部分
-                    if len(response) >= 12 + length:
-                        data = response[12:12+length]
-                        logger.info(f"响应数据: {data.hex()}")
-                        
-                        # 解析状态码
-                        response_command_id = None
-                        if len(data) >= 4:
-                            # 假设命令ID在数据部分的2-3字节位置
-                            response_command_id = data[2:4]
-                            logger.info(f"命令码: {response_command_id.hex()}")
-                            
-                            # 解析状态码
-                            status_code = data[:2] if len(data) >= 2 else b'0000'
-                            logger.info(f"状态码: {status_code.hex()}")
-                            
-                            # 检查状态
-                            if status_code == b'0000':
-                                logger.info("命令执行成功")
-                            else:
-                                logger.warning(f"命令执行状态: {status_code.hex()} (可能失败)")
-                    
-                    # 验证响应是否与当前期望的指令匹配
-                    if self.current_expected_response and response_command_id:
-                        if self.current_expected_response['command_id'] == response_command_id:
-                            logger.info(f"响应验证成功：指令 {self.current_expected_response['description']} 与响应匹配")
-                            return True
-                        else:
-                            logger.warning(f"响应验证失败：指令 {self.current_expected_response['description']} 的命令ID {self.current_expected_response['command_id'].hex()} 与响应命令ID {response_command_id.hex()} 不匹配")
-                            return False
-        except Exception as e:
-            logger.error(f"处理响应数据失败: {e}")
+        self.command_manager.update_command_status(command.get('index', -1), 'failed')
+        self._command_failed(command, command.get('error'), config_loader.get('test.response_timeout', 2.0))
+        
+        # 通知UI更新
+        if self.on_command_updated:
+            self.on_command_updated(command, 'failed')
+    
+    def _wait_pipeline_idle(self):
+        """等待已发送的指令全部完成，且响应和处理结果全部被消费
         
-        return False
+        测试停止时指令队列被关闭，wait_idle() 立即返回，其后各级队列中剩余的条目很快处理完毕
+        """
+        self.command_sender.wait_idle()
+        self.command_sender.get_response_queue().wait_drained()
+        self.data_processor.data_queue.wait_drained()
+        self.data_processor.get_result_queue().wait_drained()
     
     def _cleanup(self):
         """清理资源"""
         self.test_running = False
         
+        # 记录流水线各队列的统计，随测试结果导出
+        self.test_results['queue_stats'] = self.get_queue_stats()
+        
         # 停止指令发送器
         if self.command_sender:
             self.command_sender.stop()
@@ -409,70 +586,100 @@ class TestManager:
             self.data_worker = None
     
     def _process_responses(self):
-        """处理响应数据"""
-        while self.test_running:
+        """处理响应数据，阻塞等待响应，响应队列关闭（指令发送器停止）且取空后退出"""
+        response_queue = self.command_sender.get_response_queue()
+        data_processor = self.data_processor
+        while True:
             try:
-                if self.command_sender and self.data_processor:
-                    # 从响应队列获取响应
-                    response_queue = self.command_sender.get_response_queue()
-                    response_data = response_queue.get(timeout=0.1)
-                    
-                    # 将响应数据加入数据处理器
-                    self.data_processor.add_data(response_data)
-                    
-                    # 更新指令状态
-                    command = response_data['command']
-                    command['status'] = 'received'
-                    
-                    # 通知UI更新
-                    if self.on_command_updated:
-                        self.on_command_updated(command, 'received')
-                    
-                    response_queue.task_done()
+                response_data = response_queue.get()
+            except QueueClosed:
+                break
+            
+            try:
+                # 将响应数据加入数据处理器
+                data_processor.add_data(response_data)
+                
+                # 更新指令状态
+                command = response_data['command']
+                command['status'] = 'received'
+                
+                # 通知UI更新
+                if self.on_command_updated:
+                    self.on_command_updated(command, 'received')
                     
             except Exception as e:
                 logger.error(f"处理响应失败：{str(e)}")
-                time.sleep(0.1)
+            finally:
+                response_queue.task_done()
     
     def _process_results(self):
-        """处理数据处理结果"""
-        while self.test_running:
+        """处理数据处理结果，阻塞等待结果，结果队列关闭（数据处理器停止）且取空后退出"""
+        result_queue = self.data_processor.get_result_queue()
+        while True:
             try:
-                if self.data_processor:
-                    # 从结果队列获取处理结果
-                    result_queue = self.data_processor.get_result_queue()
-                    result = result_queue.get(timeout=0.1)
-                    
-                    # 更新指令状态
-                    command = result['command']
-                    command['status'] = 'processed'
-                    
-                    # 记录测试结果
-                    command_result = {
-                        'index': command.get('index', 0),
-                        'description': command['description'],
-                        'status': 'success',
-                        'send_time': command.get('send_time', time.time()),
-                        'response_time': command.get('response_time', time.time()),
-                        'response': result['response'].hex(),
-                        'parsed_data': result['parsed_data'],
-                        'result': result['result']
-                    }
-                    self.test_results['command_results'].append(command_result)
-                    
-                    # 更新统计信息
-                    self.test_results['commands_sent'] += 1
-                    self.test_results['data_received'] += 1
-                    
-                    # 通知UI更新
-                    if self.on_data_processed:
-                        self.on_data_processed(result)
-                    
-                    result_queue.task_done()
-                    
+                result = result_queue.get()
+            except QueueClosed:
+                break
+            
+            try:
+                self.record_result(result)
             except Exception as e:
                 logger.error(f"处理结果失败：{str(e)}")
-                time.sleep(0.1)
+            finally:
+                result_queue.task_done()
+    
+    def record_result(self, result):
+        """记录一条数据处理结果并通知UI（结果处理线程和抓包回放共用）
+        
+        Args:
+            result: DataProcessor 输出的处理结果
+        """
+        # 更新指令状态
+        command = result['command']
+        command['status'] = 'processed'
+        
+        # 记录测试结果
+        command_result = {
+            'index': command.get('index', 0),
+            'description': command['description'],
+            'status': result['result']['status'],
+            'send_time': command.get('send_time', time.time()),
+            'response_time': command.get('response_time', time.time()),
+            'response': result['response'],  # 原始字节，显示或导出时再转换为十六进制
+            'parsed_data': result['parsed_data'],
+            'result': result['result']
+        }
+        self.test_results['command_results'].append(command_result)
+        duration = None
+        if 'send_time' in command and 'response_time' in command:
+            duration = command['response_time'] - command['send_time']
+        if command_result['status'] == 'mismatch':
+            self._command_failed(command, result['result']['validation']['error'], duration)
+        elif self.test_history:
+            self.test_history.record(TestHistory.COMMANDS, command['description'], True, duration)
+        
+        # 更新统计信息
+        self.test_results['commands_sent'] += 1
+        self.test_results['data_received'] += 1
+        
+        # 通知UI更新
+        if self.on_data_processed:
+            self.on_data_processed(result)
+    
+    def get_queue_stats(self):
+        """获取测试流水线各队列的统计
+        
+        Returns:
+            dict: 队列名(command、response、data、result) -> 统计字典
+                  （capacity、policy、depth、high_water、put、dropped、coalesced、blocked），
+                  未运行的组件不包含在内
+        """
+        stats = {}
+        if self.command_sender:
+            stats.update(self.command_sender.get_queue_stats())
+        if self.data_processor:
+            stats.update(self.data_processor.get_queue_stats())
+        return stats
     
     def get_test_results(self):
         """获取测试结果"""
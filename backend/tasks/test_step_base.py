@@ -0,0 +1,109 @@
+import threading
+import time
+
+
+class TestStep:
+    """测试步骤基类
+
+    子类实现 run()，需要准备和清理资源时覆盖 setup() 和 teardown()。步骤通过 depends_on 声明依赖的步骤名，
+    由 AutoTestRunner 按依赖关系调度，互不依赖的步骤并行执行。
+    run() 返回的值记为步骤结果，抛出异常即为步骤失败；超时或停止时 cancelled 被置位并调用 on_cancel()，
+    长时间运行的步骤应定期检查 cancelled，阻塞等待的步骤应在 on_cancel() 中唤醒等待，调度器等步骤结束后才返回。
+    """
+
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_PASSED = 'passed'
+    STATUS_FAILED = 'failed'
+    STATUS_TIMEOUT = 'timeout'
+    STATUS_SKIPPED = 'skipped'
+
+    def __init__(self, name=None, depends_on=(), timeout=None):
+        """初始化
+
+        Args:
+            name: 步骤名，默认为类名
+            depends_on: 依赖的步骤名列表，全部通过后才执行本步骤
+            timeout: 超时时间(秒)，包括 setup、run 和 teardown，None 表示不限
+        """
+        self.name = name or type(self).__name__
+        self.depends_on = tuple(depends_on)
+        self.timeout = timeout
+        self.cancelled = threading.Event()
+
+    def setup(self, context):
+        """准备步骤所需的资源
+
+        Args:
+            context: 全部步骤共享的上下文字典，results 项为已完成步骤的结果（步骤名 -> 结果字典）
+        """
+
+    def run(self, context):
+        """执行步骤
+
+        Returns:
+            步骤结果（记录在结果字典的 result 项中）
+        """
+        raise NotImplementedError
+
+    def teardown(self, context):
+        """清理步骤的资源，run() 失败时也会调用"""
+
+    def on_cancel(self):
+        """步骤被取消时调用（在调度线程中），用于唤醒阻塞的 run()，如关闭其等待的队列"""
+
+    def cancel(self):
+        """取消步骤：置位 cancelled 并调用 on_cancel()"""
+        self.cancelled.set()
+        self.on_cancel()
+
+    def execute(self, context):
+        """依次执行 setup、run、teardown（在 AutoTestRunner 的步骤线程中调用）
+
+        Returns:
+            dict: 步骤结果，包含name、status、result、error、start_time、end_time、duration
+        """
+        result = {'name': self.name, 'status': self.STATUS_RUNNING, 'result': None, 'error': None,
+                  'start_time': time.time(), 'end_time': None, 'duration': None}
+        start = time.perf_counter()
+        try:
+            self.setup(context)
+            try:
+                result['result'] = self.run(context)
+            finally:
+                self.teardown(context)
+            result['status'] = self.STATUS_PASSED
+        except Exception as e:
+            result['status'] = self.STATUS_FAILED
+            result['error'] = str(e) or type(e).__name__
+        result['end_time'] = time.time()
+        result['duration'] = time.perf_counter() - start
+        return result
+
+    def __repr__(self):
+        return f'{type(self).__name__}(name={self.name!r}, depends_on={list(self.depends_on)})'
+
+
+class FunctionStep(TestStep):
+    """由函数构成的测试步骤：run(context) 调用 func(context)"""
+
+    def __init__(self, name, func, depends_on=(), timeout=None, on_cancel=None):
+        """初始化
+
+        Args:
+            name: 步骤名
+            func: 步骤函数，参数为上下文字典，返回值为步骤结果
+            depends_on: 依赖的步骤名列表
+            timeout: 超时时间(秒)
+            on_cancel: 取消时调用的函数（无参数），None 表示不处理
+        """
+        super().__init__(name, depends_on, timeout)
+        self.func = func
+        self._on_cancel = on_cancel
+
+    def run(self, context):
+        return self.func(context)
+
+    def on_cancel(self):
+        if self._on_cancel:
+            self._on_cancel()
@@ -2,6 +2,8 @@ from PyQt5 import QtWidgets, QtCore
 from gui.ui.widgets.power_monitor_panel import PowerMonitorPanel
 from gui.ui.widgets.test_control_widget import TestControlWidget
 from backend.tasks.test_manager import TestManager
+from backend.tasks.multi_site_manager import MultiSiteManager
+from backend.config.config_loader import config_loader
 from backend.logger.logger import logger
 
 
@@ -40,7 +42,11 @@ class AutoTestWindow(QtWidgets.QWidget):
 
     def _init_test_manager(self):
         """初始化测试管理器"""
-        self.test_manager = TestManager()
+        # 配置了多个工位时并行测试所有工位
+        if config_loader.get('sites'):
+            self.test_manager = MultiSiteManager()
+        else:
+            self.test_manager = TestManager()
         
         # 连接信号
         self.test_control_widget.sig_start_test.connect(self._on_start_test)
@@ -0,0 +1,40 @@
+import threading
+import time
+
+from backend.tasks.auto_test_runner import AutoTestRunner
+from backend.tasks import test_step_base
+from backend.tasks.test_step_base import FunctionStep
+
+
+def test_timed_out_step_is_cancelled_and_joined():
+    """超时的步骤被取消，run() 等其线程结束后才返回"""
+    wake = threading.Event()
+    finished = []
+
+    def blocking(context):
+        wake.wait()
+        time.sleep(0.1)
+        finished.append(True)
+
+    runner = AutoTestRunner([
+        FunctionStep('blocking', blocking, timeout=0.1, on_cancel=wake.set),
+        FunctionStep('after', lambda context: None, depends_on=['blocking']),
+    ])
+    results = runner.run()
+
+    assert results['blocking']['status'] == test_step_base.TestStep.STATUS_TIMEOUT
+    assert results['after']['status'] == test_step_base.TestStep.STATUS_SKIPPED
+    assert finished == [True]
+    assert runner.steps['blocking'].cancelled.is_set()
+
+
+def test_independent_steps_run_in_parallel():
+    barrier = threading.Barrier(2, timeout=1.0)
+    runner = AutoTestRunner([
+        FunctionStep('a', lambda context: barrier.wait()),
+        FunctionStep('b', lambda context: barrier.wait()),
+    ])
+
+    results = runner.run()
+
+    assert all(result['status'] == test_step_base.TestStep.STATUS_PASSED for result in results.values())
@@ -0,0 +1,41 @@
+import numpy as np
+
+from backend.communication.command_builder import ChecksumField, CommandTemplate, Field, LengthField
+
+TEMPLATE = bytes.fromhex('AA55 0000 01 0000 FFFF EE')
+
+
+def make_template(data=TEMPLATE, algorithm='sum16'):
+    """帧格式：帧头(2) 长度(2) 命令(1) 数值(2) 校验和(2) 帧尾(1)"""
+    return CommandTemplate(
+        data,
+        fields=[Field('value', offset=5, width=2)],
+        length=LengthField(offset=2, width=2, start=4),
+        checksum=ChecksumField(offset=7, width=2, algorithm=algorithm),
+    )
+
+
+def test_checksum_of_known_frame():
+    frame = make_template().build(value=0x1234)
+
+    # 校验和区间默认到校验和字段之前：AA+55+00+06+01+12+34 = 0x014C
+    assert frame == bytes.fromhex('AA55 0006 01 1234 014C EE')
+
+
+def test_checksum_ignores_placeholder_value():
+    for algorithm in ChecksumField.ALGORITHMS:
+        ff = make_template(TEMPLATE, algorithm).build_batch(value=np.arange(16))
+        zero = make_template(TEMPLATE.replace(b'\xFF\xFF', b'\x00\x00'), algorithm).build_batch(value=np.arange(16))
+        np.testing.assert_array_equal(ff, zero)
+
+
+def test_checksum_region_covering_field():
+    """计算区间包含校验和字段时，字段按 0 参与计算"""
+    template = CommandTemplate(TEMPLATE, checksum=ChecksumField(offset=7, width=2, algorithm='sum16', end=9))
+    assert template.build()[7:9] == sum(TEMPLATE[:7]).to_bytes(2, 'big')
+
+
+def test_crc16_check_value():
+    field = ChecksumField(offset=9, width=2, algorithm='crc16')
+    frames = np.frombuffer(b'123456789\x00\x00', dtype=np.uint8)[np.newaxis]
+    assert field.compute(frames)[0] == 0x29B1
@@ -0,0 +1,36 @@
+from backend.communication.packet_parser import PacketParser
+from backend.communication.frame_reassembler import FrameReassembler
+
+
+def telemetry_frames(parser):
+    return (parser.create_command_packet(PacketParser.CMD_GET_TEMPERATURE, (365).to_bytes(2, 'little'))
+            + parser.create_command_packet(PacketParser.CMD_GET_CURRENT, (7147).to_bytes(4, 'little')))
+
+
+def test_stray_start_byte_with_large_length_resyncs_immediately():
+    """杂散的起始字节后跟很大的长度字段时，其后的有效帧立即解出"""
+    parser = PacketParser()
+    reassembler = FrameReassembler(telemetry_lengths=PacketParser.TELEMETRY_DATA_LENGTHS)
+
+    frames = reassembler.feed(b'\xAA\x01\x00\x0F' + telemetry_frames(parser))
+
+    assert [frame['command_id'] for frame in frames] == [PacketParser.CMD_GET_TEMPERATURE, PacketParser.CMD_GET_CURRENT]
+    assert len(reassembler) == 0
+
+
+def test_unknown_telemetry_command_resyncs_immediately():
+    parser = PacketParser()
+    reassembler = FrameReassembler(telemetry_lengths=PacketParser.TELEMETRY_DATA_LENGTHS)
+
+    frames = reassembler.feed(b'\xAA\x7E' + telemetry_frames(parser))
+
+    assert len(frames) == 2
+
+
+def test_telemetry_length_limited_without_command_table():
+    parser = PacketParser()
+    reassembler = FrameReassembler()
+
+    frames = reassembler.feed(b'\xAA\x01\x00\x01' + telemetry_frames(parser))
+
+    assert len(frames) == 2
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+指令流水线性能测试脚本
+在本机启动板卡模拟器，通过 LinkArbiter + CommandSender 发送测试指令，
+统计不同窗口大小下的指令吞吐量和响应延迟
+"""
+
+import sys
+import time
+import argparse
+import statistics
+from pathlib import Path
+from loguru import logger
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from board_emulator import BoardEmulator, start_tcp_server
+from backend.communication.network_port import NetworkPort
+from backend.communication.link_arbiter import LinkArbiter
+from backend.tasks.command_sender import CommandSender
+from backend.tasks.test_command_manager import TestCommandManager
+
+
+def parse_arguments():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description='指令流水线性能测试脚本')
+    parser.add_argument('-n', '--count', type=int, default=1000, help='每轮发送的指令数')
+    parser.add_argument('-w', '--windows', type=int, nargs='+', default=[1, 4, 16, 64], help='测试的窗口大小')
+    parser.add_argument('--latency', type=float, default=0.002, help='模拟板卡响应延迟(秒)')
+    parser.add_argument('--jitter', type=float, default=0.0005, help='模拟板卡响应延迟抖动(秒)')
+    parser.add_argument('--fragment', type=int, default=0, help='模拟响应分片最大字节数')
+    parser.add_argument('--seed', type=int, default=1, help='随机数种子')
+    return parser.parse_args()
+
+
+def make_commands(count):
+    """由测试指令文件生成 count 条指令，帧ID依次递增以区分每条指令"""
+    templates = TestCommandManager().get_commands()
+    commands = []
+    for i in range(count):
+        data = bytearray(templates[i % len(templates)]['data'])
+        data[8:12] = i.to_bytes(4, 'big')
+        commands.append({'description': f'cmd{i}', 'data': bytes(data)})
+    return commands
+
+
+def run(port, window, commands):
+    """以指定窗口大小发送全部指令，返回(耗时, 响应延迟列表, 失败数)"""
+    link = NetworkPort('127.0.0.1', port)
+    link.open()
+    arbiter = LinkArbiter(link)
+    arbiter.start()
+    failed = []
+    sender = CommandSender(arbiter, window_size=window, command_interval=0, on_command_failed=failed.append)
+    sender.start()
+
+    start = time.perf_counter()
+    for command in commands:
+        sender.send_command(dict(command))
+    sender.wait_idle()
+    elapsed = time.perf_counter() - start
+
+    latencies = []
+    queue = sender.get_response_queue()
+    while not queue.empty():
+        command = queue.get()['command']
+        latencies.append((command['response_time'] - command['send_time']) * 1e3)
+
+    sender.stop()
+    arbiter.stop()
+    link.close()
+    return elapsed, latencies, len(failed)
+
+
+def main():
+    args = parse_arguments()
+    # 屏蔽逐条指令的日志，避免日志输出干扰测量
+    logger.remove()
+    logger.add(sys.stderr, level='ERROR')
+
+    emulator = BoardEmulator(latency=args.latency, jitter=args.jitter, fragment=args.fragment, seed=args.seed)
+    port = start_tcp_server(emulator)
+    commands = make_commands(args.count)
+
+    print(f"{'窗口':>6}{'耗时(s)':>10}{'指令/s':>10}{'P50(ms)':>10}{'P99(ms)':>10}{'失败':>6}")
+    for window in args.windows:
+        elapsed, latencies, failed = run(port, window, commands)
+        latencies.sort()
+        p50 = statistics.median(latencies) if latencies else 0.0
+        p99 = latencies[int(len(latencies) * 0.99)] if latencies else 0.0
+        print(f"{window:>6}{elapsed:>10.3f}{args.count / elapsed:>10.0f}{p50:>10.2f}{p99:>10.2f}{failed:>6}")
+
+
+if __name__ == '__main__':
+    main()
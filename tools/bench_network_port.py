@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+网口通信性能对比脚本
+在本机回环地址启动一个回显服务器模拟板卡，对比阻塞式 NetworkPort 与
+asyncio 实现 AsyncNetworkPort 的往返延迟和流水线吞吐量
+"""
+
+import sys
+import time
+import socket
+import argparse
+import threading
+import statistics
+from pathlib import Path
+from loguru import logger
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.communication.network_port import NetworkPort
+from backend.communication.async_network_port import AsyncNetworkPort
+
+# 示例指令帧
+FRAME = bytes.fromhex('AA 55 55 AA 88 88 00 10 00 00 00 00 CF 10 00 01 00 00 0D EE')
+
+
+def parse_arguments():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description='网口通信性能对比脚本')
+    parser.add_argument('-n', '--count', type=int, default=2000, help='往返测试的帧数')
+    parser.add_argument('-b', '--burst', type=int, default=20000, help='吞吐测试的帧数')
+    return parser.parse_args()
+
+
+def start_echo_server():
+    """启动回显服务器，返回监听端口"""
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    server.bind(('127.0.0.1', 0))
+    server.listen()
+
+    def serve():
+        while True:
+            conn, _ = server.accept()
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            threading.Thread(target=echo, args=(conn,), daemon=True).start()
+
+    def echo(conn):
+        with conn:
+            while True:
+                data = conn.recv(65536)
+                if not data:
+                    return
+                conn.sendall(data)
+
+    threading.Thread(target=serve, daemon=True).start()
+    return server.getsockname()[1]
+
+
+def receive_exactly(port, n):
+    """接收 n 字节数据"""
+    received = 0
+    while received < n:
+        received += len(port.receive(timeout=2.0))
+    return received
+
+
+def bench_round_trip(port, count):
+    """逐帧发送并等待回显，统计往返延迟(微秒)"""
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        port.send(FRAME)
+        receive_exactly(port, len(FRAME))
+        latencies.append((time.perf_counter() - start) * 1e6)
+    latencies.sort()
+    return {
+        'mean': statistics.mean(latencies),
+        'p50': latencies[len(latencies) // 2],
+        'p99': latencies[int(len(latencies) * 0.99)]
+    }
+
+
+def bench_throughput(port, count):
+    """连续发送 count 帧并同时接收回显，统计帧吞吐量(帧/秒)"""
+    def sender():
+        for _ in range(count):
+            port.send(FRAME)
+
+    start = time.perf_counter()
+    thread = threading.Thread(target=sender)
+    thread.start()
+    receive_exactly(port, count * len(FRAME))
+    thread.join()
+    return count / (time.perf_counter() - start)
+
+
+async def bench_round_trip_async(port, count):
+    """在事件循环内使用异步接口逐帧往返，统计往返延迟(微秒)"""
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        await port.send_async(FRAME)
+        received = 0
+        while received < len(FRAME):
+            received += len(await port.receive_async(timeout=2.0))
+        latencies.append((time.perf_counter() - start) * 1e6)
+    latencies.sort()
+    return {
+        'mean': statistics.mean(latencies),
+        'p50': latencies[len(latencies) // 2],
+        'p99': latencies[int(len(latencies) * 0.99)]
+    }
+
+
+async def bench_throughput_async(port, count):
+    """在事件循环内连续发送 count 帧并接收回显，统计帧吞吐量(帧/秒)"""
+    start = time.perf_counter()
+    for _ in range(count):
+        await port.send_async(FRAME)
+    received = 0
+    while received < count * len(FRAME):
+        received += len(await port.receive_async(timeout=2.0))
+    return count / (time.perf_counter() - start)
+
+
+def print_row(name, rtt, rate):
+    """输出一行测试结果"""
+    print(f"{name:<24}{rtt['mean']:>12.1f}{rtt['p50']:>12.1f}{rtt['p99']:>12.1f}{rate:>16.0f}")
+
+
+def main():
+    args = parse_arguments()
+    # 屏蔽逐帧的调试日志，避免日志输出干扰测量
+    logger.remove()
+    logger.add(sys.stderr, level='WARNING')
+
+    server_port = start_echo_server()
+
+    print(f"{'实现':<24}{'平均(us)':>12}{'P50(us)':>12}{'P99(us)':>12}{'吞吐(帧/s)':>16}")
+
+    for name, port in [
+        ('NetworkPort', NetworkPort('127.0.0.1', server_port)),
+        ('AsyncNetworkPort(同步)', AsyncNetworkPort('127.0.0.1', server_port, rcvbuf=262144)),
+    ]:
+        port.open()
+        try:
+            rtt = bench_round_trip(port, args.count)
+            rate = bench_throughput(port, args.burst)
+        finally:
+            port.close()
+        print_row(name, rtt, rate)
+
+    port = AsyncNetworkPort('127.0.0.1', server_port, rcvbuf=262144)
+    port.open()
+    try:
+        run = port.run_coroutine
+        rtt = run(bench_round_trip_async(port, args.count))
+        rate = run(bench_throughput_async(port, args.burst))
+    finally:
+        port.close()
+    print_row('AsyncNetworkPort(异步)', rtt, rate)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试流水线延迟测试脚本
+用回环仲裁器代替通信链路，按固定间隔逐条完成指令的响应，测量从响应到达到
+UI 回调（on_data_processed）的端到端延迟：
+CommandSender -> 响应队列 -> 响应处理线程 -> DataProcessor -> 结果队列 -> 结果处理线程 -> UI 回调，
+同时统计流水线空闲时的CPU占用和停止流水线的耗时
+"""
+
+import sys
+import time
+import argparse
+import statistics
+import threading
+from pathlib import Path
+from queue import Queue
+from concurrent.futures import Future
+from loguru import logger
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.tasks.test_manager import TestManager
+from backend.tasks.command_sender import CommandSender
+from backend.tasks.data_processor import DataProcessor
+from backend.tasks.test_command_manager import TestCommandManager
+
+
+def parse_arguments():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description='测试流水线延迟测试脚本')
+    parser.add_argument('-n', '--count', type=int, default=500, help='发送的指令数')
+    parser.add_argument('-w', '--window', type=int, default=4, help='指令发送窗口大小')
+    parser.add_argument('--interval', type=float, default=0.002, help='相邻响应到达的间隔(秒)')
+    parser.add_argument('--idle', type=float, default=1.0, help='统计空闲CPU占用的时长(秒)')
+    return parser.parse_args()
+
+
+class LoopbackArbiter:
+    """回环仲裁器：登记请求，由应答线程按固定间隔逐条以指令帧本身作为响应完成 Future"""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.arrival = {}
+        self._pending = Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def request(self, data, key, timeout=None):
+        future = Future()
+        self._pending.put((data, future))
+        return future
+
+    def stop(self):
+        self._pending.put((None, None))
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            data, future = self._pending.get()
+            if future is None:
+                return
+            time.sleep(self.interval)
+            self.arrival[data] = time.perf_counter()
+            future.set_result({'raw': data})
+
+
+def make_commands(count):
+    """由测试指令文件生成 count 条指令，帧ID依次递增以区分每条指令"""
+    templates = TestCommandManager().get_commands()
+    commands = []
+    for i in range(count):
+        data = bytearray(templates[i % len(templates)]['data'])
+        data[8:12] = i.to_bytes(4, 'big')
+        commands.append({'description': f'cmd{i}', 'data': bytes(data)})
+    return commands
+
+
+def main():
+    args = parse_arguments()
+    # 屏蔽逐条指令的日志，避免日志输出干扰测量
+    logger.remove()
+    logger.add(sys.stderr, level='ERROR')
+
+    arbiter = LoopbackArbiter(args.interval)
+    commands = make_commands(args.count)
+    latencies = []
+    done = threading.Event()
+
+    def on_data_processed(result):
+        latencies.append((time.perf_counter() - arbiter.arrival[result['response']]) * 1e6)
+        if len(latencies) == len(commands):
+            done.set()
+
+    # 按 TestManager._step_pipeline 的方式搭建流水线
+    manager = TestManager()
+    manager.on_data_processed = on_data_processed
+    manager.test_running = True
+    manager.command_sender = CommandSender(arbiter, window_size=args.window, command_interval=0)
+    manager.command_sender.start()
+    manager.data_processor = DataProcessor()
+    manager.data_processor.start()
+    threads = [threading.Thread(target=manager._process_responses, daemon=True),
+               threading.Thread(target=manager._process_results, daemon=True)]
+    for thread in threads:
+        thread.start()
+
+    for command in commands:
+        manager.command_sender.send_command(dict(command))
+    done.wait()
+
+    # 流水线空闲时的CPU占用
+    cpu = time.process_time()
+    time.sleep(args.idle)
+    idle_cpu = (time.process_time() - cpu) / args.idle * 1e3
+
+    # 停止流水线（含响应和结果处理线程退出）的耗时
+    start = time.perf_counter()
+    manager._cleanup()
+    for thread in threads:
+        thread.join()
+    shutdown = (time.perf_counter() - start) * 1e3
+    arbiter.stop()
+
+    latencies.sort()
+    print(f"指令数 {len(latencies)}，窗口 {args.window}，响应间隔 {args.interval * 1e3:.1f} ms")
+    print(f"响应 -> UI回调延迟(us)：P50 {statistics.median(latencies):.0f}  "
+          f"P99 {latencies[int(len(latencies) * 0.99)]:.0f}  最大 {latencies[-1]:.0f}")
+    print(f"空闲CPU占用：{idle_cpu:.2f} ms/s")
+    print(f"停止耗时：{shutdown:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
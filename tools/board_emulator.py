@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+板卡模拟器
+在本机模拟被测板卡，用于无硬件时的离线开发和性能测试：
+- 网口模式：TCP服务器，替代 192.168.1.100:5000 上的板卡
+- 串口模式：基于伪终端(pty)的串口替身，SerialPort 直接打开输出的设备路径
+指令响应取自 test_commands.yaml 的 response_frames，温度/电流/功率查询返回遥测帧，
+并可注入延迟、抖动、分片、突发帧和校验和错误
+"""
+
+import os
+import sys
+import time
+import heapq
+import random
+import socket
+import argparse
+import threading
+from pathlib import Path
+from loguru import logger
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.communication.packet_parser import PacketParser
+from backend.communication.frame_reassembler import FrameReassembler
+from backend.tasks.test_command_manager import TestCommandManager
+
+
+class BoardEmulator:
+    """板卡行为模型：根据收到的帧生成响应帧，并按配置注入故障"""
+
+    def __init__(self, commands_file=None, latency=0.0, jitter=0.0, fragment=0, burst_prob=0.0,
+                 burst_size=8, corrupt_prob=0.0, echo_unknown=True, seed=None):
+        """初始化
+
+        Args:
+            commands_file: 测试指令配置文件路径，默认使用 backend/tasks/test_commands.yaml
+            latency: 响应延迟(秒)
+            jitter: 响应延迟抖动(秒)，实际延迟在 latency±jitter 内均匀分布
+            fragment: 分片最大字节数，大于0时响应被拆成随机长度的多段发送
+            burst_prob: 每次响应后追加一串主动上报遥测帧的概率
+            burst_size: 突发遥测帧的数量
+            corrupt_prob: 响应帧被破坏（校验和或数据错误）的概率
+            echo_unknown: 未在响应表中的指令帧是否原样回显
+            seed: 随机数种子，用于复现测试
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.fragment = fragment
+        self.burst_prob = burst_prob
+        self.burst_size = burst_size
+        self.corrupt_prob = corrupt_prob
+        self.echo_unknown = echo_unknown
+        self.random = random.Random(seed)
+
+        self._parser = PacketParser()
+        self._responses = {}
+        manager = TestCommandManager(commands_file)
+        for frame in manager.get_response_frames():
+            self._responses[PacketParser.response_key(frame['data'])] = frame['data']
+
+        # 遥测量的标称值，与自动测试界面的演示数据一致
+        self.temperature = 36.5
+        self.current = 7.147
+        self.power = 8.382
+
+        # 统计信息
+        self.requests = 0
+        self.responses = 0
+        self.corrupted = 0
+        self.bursts = 0
+
+    def respond(self, frame):
+        """生成对一个请求帧的响应
+
+        Args:
+            frame: FrameReassembler 解析出的请求帧
+
+        Returns:
+            list: 需要发送的响应帧（bytes）列表
+        """
+        self.requests += 1
+
+        if frame['format'] == PacketParser.FRAME_TELEMETRY:
+            response = self._telemetry_frame(frame['command_id'])
+        else:
+            response = self._responses.get(PacketParser.response_key(frame['raw']))
+            if response is None and self.echo_unknown:
+                response = frame['raw']
+
+        if response is None:
+            return []
+
+        if self.corrupt_prob and self.random.random() < self.corrupt_prob:
+            response = self._corrupt(response)
+
+        frames = [response]
+        if self.burst_prob and self.random.random() < self.burst_prob:
+            self.bursts += 1
+            frames.extend(self._telemetry_frame(self.random.choice((
+                PacketParser.CMD_GET_TEMPERATURE,
+                PacketParser.CMD_GET_CURRENT,
+                PacketParser.CMD_GET_POWER
+            ))) for _ in range(self.burst_size))
+
+        self.responses += len(frames)
+        return frames
+
+    def delay(self):
+        """本次响应的延迟(秒)"""
+        if self.jitter:
+            return max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+        return self.latency
+
+    def split(self, data):
+        """按分片配置将数据拆分为多段"""
+        if self.fragment <= 0:
+            return [data]
+        chunks = []
+        pos = 0
+        while pos < len(data):
+            n = self.random.randint(1, self.fragment)
+            chunks.append(data[pos:pos + n])
+            pos += n
+        return chunks
+
+    def _telemetry_frame(self, command_id):
+        """生成遥测响应帧，数值在标称值附近随机波动"""
+        noise = self.random.uniform(-0.01, 0.01)
+        if command_id == PacketParser.CMD_GET_TEMPERATURE:
+            data = int(round(self.temperature * (1 + noise) * 10)).to_bytes(2, 'little')
+        elif command_id == PacketParser.CMD_GET_CURRENT:
+            data = int(round(self.current * (1 + noise) * 1000)).to_bytes(4, 'little')
+        elif command_id == PacketParser.CMD_GET_POWER:
+            data = int(round(self.power * (1 + noise) * 1000)).to_bytes(4, 'little')
+        else:
+            data = b''
+        return self._parser.create_command_packet(command_id, data)
+
+    def _corrupt(self, frame):
+        """破坏响应帧：遥测帧翻转校验和，指令响应帧翻转最后一个数据字节"""
+        self.corrupted += 1
+        corrupted = bytearray(frame)
+        index = -2 if frame[1] != PacketParser.END_BYTE else -1
+        corrupted[index] ^= 0xFF
+        return bytes(corrupted)
+
+
+class EmulatedLink:
+    """一条模拟链路：读线程解析请求，写线程按计划时间发送响应
+
+    响应按"收到时间+延迟"排入计划队列，多条在途指令的延迟可以互相重叠，
+    与真实板卡处理流水线指令的行为一致。
+    """
+
+    def __init__(self, emulator, read, write, name):
+        self.emulator = emulator
+        self._read = read
+        self._write = write
+        self.name = name
+        self._reassembler = FrameReassembler(telemetry_lengths=PacketParser.TELEMETRY_DATA_LENGTHS)
+        self._schedule = []
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._running = True
+
+    def serve(self):
+        """服务链路直到对端关闭"""
+        writer = threading.Thread(target=self._write_loop, daemon=True)
+        writer.start()
+        try:
+            while self._running:
+                data = self._read()
+                if not data:
+                    break
+                now = time.monotonic()
+                for frame in self._reassembler.feed(data):
+                    for response in self.emulator.respond(frame):
+                        self._enqueue(now + self.emulator.delay(), response)
+        except OSError as e:
+            logger.warning(f'{self.name} closed: {e}')
+        finally:
+            with self._cond:
+                self._running = False
+                self._cond.notify()
+            writer.join()
+
+    def _enqueue(self, due, data):
+        with self._cond:
+            heapq.heappush(self._schedule, (due, self._seq, data))
+            self._seq += 1
+            self._cond.notify()
+
+    def _write_loop(self):
+        while True:
+            with self._cond:
+                while self._running and (not self._schedule or self._schedule[0][0] > time.monotonic()):
+                    timeout = self._schedule[0][0] - time.monotonic() if self._schedule else None
+                    self._cond.wait(timeout)
+                if not self._running:
+                    return
+                _, _, data = heapq.heappop(self._schedule)
+
+            try:
+                for chunk in self.emulator.split(data):
+                    self._write(chunk)
+            except OSError:
+                return
+
+
+def serve_tcp(emulator, host, port, ready=None):
+    """以TCP服务器方式运行模拟器，每个连接一条独立链路
+
+    Args:
+        emulator: BoardEmulator 实例
+        host: 监听地址
+        port: 监听端口，0表示自动分配
+        ready: 可选的回调函数，参数为实际监听端口
+    """
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    server.bind((host, port))
+    server.listen()
+    port = server.getsockname()[1]
+    logger.info(f'Board emulator listening on {host}:{port}')
+    if ready:
+        ready(port)
+
+    while True:
+        conn, addr = server.accept()
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        link = EmulatedLink(emulator, lambda c=conn: c.recv(65536), conn.sendall, f'tcp {addr[0]}:{addr[1]}')
+        threading.Thread(target=link.serve, daemon=True).start()
+
+
+def start_tcp_server(emulator, host='127.0.0.1', port=0):
+    """在后台线程中启动TCP模拟器，返回实际监听端口"""
+    started = threading.Event()
+    result = {}
+
+    def ready(actual_port):
+        result['port'] = actual_port
+        started.set()
+
+    threading.Thread(target=serve_tcp, args=(emulator, host, port, ready), daemon=True).start()
+    started.wait()
+    return result['port']
+
+
+def open_pty_link(emulator):
+    """创建伪终端串口替身并在后台服务，返回供 SerialPort 打开的设备路径"""
+    import tty
+
+    master, slave = os.openpty()
+    tty.setraw(slave)
+    path = os.ttyname(slave)
+
+    link = EmulatedLink(emulator, lambda: os.read(master, 65536), lambda data: os.write(master, data), f'pty {path}')
+    threading.Thread(target=link.serve, daemon=True).start()
+    logger.info(f'Board emulator serial device: {path}')
+    return path
+
+
+def parse_arguments():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description='板卡模拟器')
+    parser.add_argument('mode', choices=['tcp', 'pty'], help='tcp(网口模拟) 或 pty(串口模拟)')
+    parser.add_argument('--host', default='127.0.0.1', help='TCP监听地址')
+    parser.add_argument('--port', type=int, default=5000, help='TCP监听端口')
+    parser.add_argument('-c', '--commands', help='测试指令配置文件路径')
+    parser.add_argument('--latency', type=float, default=0.0, help='响应延迟(秒)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='响应延迟抖动(秒)')
+    parser.add_argument('--fragment', type=int, default=0, help='响应分片最大字节数，0表示不分片')
+    parser.add_argument('--burst-prob', type=float, default=0.0, help='追加突发遥测帧的概率')
+    parser.add_argument('--burst-size', type=int, default=8, help='突发遥测帧数量')
+    parser.add_argument('--corrupt-prob', type=float, default=0.0, help='响应帧被破坏的概率')
+    parser.add_argument('--seed', type=int, help='随机数种子')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    emulator = BoardEmulator(
+        commands_file=args.commands,
+        latency=args.latency,
+        jitter=args.jitter,
+        fragment=args.fragment,
+        burst_prob=args.burst_prob,
+        burst_size=args.burst_size,
+        corrupt_prob=args.corrupt_prob,
+        seed=args.seed
+    )
+
+    if args.mode == 'tcp':
+        serve_tcp(emulator, args.host, args.port)
+    else:
+        path = open_pty_link(emulator)
+        print(f'串口设备：{path}（Ctrl+C 退出）')
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()